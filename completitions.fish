@@ -6,7 +6,7 @@ complete -c python -n $main_py_cond -l db -r -f -d 'Database to benchmark' \
 
 # --operation
 complete -c python -n $main_py_cond -l operation -r -f -d 'Operation type to run' \
-    -a "nonindexed\t'Non-indexed queries' indexed\t'Indexed queries' explain\t'EXPLAIN ANALYZE (SQL only)' json\t'JSON queries (SQL only)' all\t'All operations'"
+    -a "nonindexed\t'Non-indexed queries' indexed\t'Indexed queries' explain\t'EXPLAIN ANALYZE (SQL only)' json\t'JSON queries (SQL only)' load\t'Driver load vs native bulk tools' ingest\t'Sustained append ingest' all\t'All operations'"
 
 # --size
 complete -c python -n $main_py_cond -l size -r -f -d 'Size of test data' \
@@ -16,6 +16,76 @@ complete -c python -n $main_py_cond -l size -r -f -d 'Size of test data' \
 complete -c python -n $main_py_cond -l trials -r -f -d 'Number of trials to run' \
     -a "1\t'1 trial (default)' 2\t'2 trials' 3\t'3 trials'"
 
+# --generator
+complete -c python -n $main_py_cond -l generator -r -f -d 'Starting data generator' \
+    -a "rows\t'Per-record dicts (default)' columnar\t'Vectorized NumPy columns'"
+
+# --load-strategy
+complete -c python -n $main_py_cond -l load-strategy -r -f -d 'Postgres starting data loader' \
+    -a "copy\t'COPY FROM STDIN (default)' copy_binary\t'Binary COPY FROM STDIN' values\t'execute_values INSERTs'"
+
+# --statement-mode
+complete -c python -n $main_py_cond -l statement-mode -r -f -d 'SQL suite statement execution' \
+    -a "adhoc\t'Parse and plan per call (default)' prepared\t'PREPARE/EXECUTE, cached statements'"
+
+# --fetch-mode
+complete -c python -n $main_py_cond -l fetch-mode -r -f -d 'Postgres SELECT result reading' \
+    -a "fetchall\t'Materialize the whole result (default)' stream\t'Named server-side cursor'"
+
+# --itersize
+complete -c python -n $main_py_cond -l itersize -r -f -d 'Rows per round trip when streaming'
+
+# --load-connections
+complete -c python -n $main_py_cond -l load-connections -r -f -d 'Parallel Postgres load connections'
+
+# --defer-constraints
+complete -c python -n $main_py_cond -l defer-constraints -f -d 'Add Postgres keys and indexes after loading'
+
+# --unlogged
+complete -c python -n $main_py_cond -l unlogged -f -d 'Load Postgres tables UNLOGGED, then SET LOGGED'
+
+# --maintenance-workers
+complete -c python -n $main_py_cond -l maintenance-workers -r -f -d 'Parallel workers for deferred index builds'
+
+# --workers
+complete -c python -n $main_py_cond -l workers -r -f -d 'Data generation worker processes'
+
+# --seed
+complete -c python -n $main_py_cond -l seed -r -f -d 'Seed for reproducible starting data'
+
+# --distribution
+complete -c python -n $main_py_cond -l distribution -r -f -d 'Foreign key / created_at distribution' \
+    -a "uniform\t'Uniform keys (default)' zipf\t'Zipf keys' hotspot\t'Hot key subset' clustered\t'Bursty created_at'"
+
+# --probe-hit-ratio
+complete -c python -n $main_py_cond -l probe-hit-ratio -r -f -d 'Share of point lookups that hit planted keys' \
+    -a "1.0\t'Always hit (default)' 0.5\t'Half hits' 0.0\t'Always miss'"
+
+# --consistent
+complete -c python -n $main_py_cond -l consistent -f -d 'Order totals, payments and reviews consistent with order items'
+
+# --row-width
+complete -c python -n $main_py_cond -l row-width -r -f -d 'Payload width per table' \
+    -a "reviews.comment=4k\t'4 KB comments' reviews.comment=256k\t'256 KB comments' products.tags=100\t'100 tags per product' products.attributes=50\t'50 extra attributes'"
+
+# --shape
+complete -c python -n $main_py_cond -l shape -r -F -d 'Table mix profile or JSON weight file' \
+    -a "default\t'STARTING_DATA_WEIGHTS' order-heavy\t'Mostly orders and order_items' catalog-heavy\t'Mostly products and inventory' review-heavy\t'Mostly reviews'"
+
+# --ingest-batches
+complete -c python -n $main_py_cond -l ingest-batches -r -f -d 'Batches appended per ingest phase' \
+    -a "100\t'Default' 500\t'Long run'"
+
+# --ingest-batch-orders
+complete -c python -n $main_py_cond -l ingest-batch-orders -r -f -d 'Orders per ingest batch' \
+    -a "1000\t'Default' 10000\t'Large batches'"
+
+# --no-dataset-cache
+complete -c python -n $main_py_cond -l no-dataset-cache -f -d 'Regenerate columnar data instead of using results/datasets'
+
+# --bench-generator
+complete -c python -n $main_py_cond -l bench-generator -f -d 'Benchmark the data generator instead of databases'
+
 # --draw
 complete -c python -n $main_py_cond -l draw -f -d 'Draw diagrams from benchmark summary'
 
@@ -1,17 +1,27 @@
 #!/usr/bin/env python3
 from datetime import datetime
 
+from src.config.files import RESULTS_CSV_FILE, SUMMARY_CSV_FILE
 from src.config.sizes import SIZES_MAP, get_sizes
 from src.nosql.mongo import run_mongo_benchmark
 from src.nosql.unqlite import run_unqlite_benchmark
 from src.sql.postgres import run_postgres_benchmark
 from src.sql.sqlite import run_sqlite_benchmark
-from src.utils.arguments import OPERATIONS, parse_args
+from src.utils.arguments import (
+    OPERATIONS,
+    get_dataset_options,
+    parse_args,
+    supports_operation,
+)
+from src.utils.dataset import average_row_bytes, prepare_dataset
+from src.utils.generator import dataset_fingerprint
+from src.utils.generator_bench import run_generator_benchmark
 from src.utils.results import (
     build_extended_analysis,
     build_summary_csv,
     draw_summary_diagrams,
     init_results_csv,
+    set_result_context,
 )
 
 DATABASE_FUNCTIONS = {
@@ -22,6 +32,31 @@ DATABASE_FUNCTIONS = {
 }
 
 
+def set_dataset_context(size, dataset):
+    set_result_context(
+        dataset=dataset_fingerprint(size, dataset),
+        distribution=dataset["distribution"],
+        probe_hit_ratio=dataset["probe_hit_ratio"],
+        row_width=dataset["row_width"] or "default",
+        shape=dataset["shape"],
+        statement_mode=dataset["statement_mode"],
+        avg_row_bytes=average_row_bytes(size, dataset),
+    )
+
+
+def run_generator_benchmarks(sizes, trials, dataset):
+    for size in sizes:
+        print(f"\n--- Generator size: {size:,} ({dataset['generator']}) ---")
+        set_dataset_context(size, dataset)
+        for trial in range(1, trials + 1):
+            print(f"Trial {trial}/{trials}")
+            run_generator_benchmark(size, trial=trial, dataset=dataset)
+
+    build_summary_csv()
+    print(f"\nGenerator results saved to: {RESULTS_CSV_FILE}")
+    print(f"Summary saved to: {SUMMARY_CSV_FILE}")
+
+
 def main():
     args = parse_args()
 
@@ -53,8 +88,19 @@ def main():
             f"Invalid size: {args.size}. Must be one of: {', '.join(SIZES_MAP.keys())}"
         )
 
+    dataset = get_dataset_options(args)
+    print(f"Dataset seed: {dataset['seed']}")
+
+    if args.bench_generator:
+        run_generator_benchmarks(sizes, args.trials, dataset)
+        return
+
     if args.db == "all":
-        dbs = ["postgres", "sqlite", "mongo", "unqlite"]
+        dbs = [
+            db
+            for db in ["postgres", "sqlite", "mongo", "unqlite"]
+            if supports_operation(db, args.operation)
+        ]
     else:
         dbs = [args.db]
 
@@ -65,13 +111,18 @@ def main():
 
         for size in sizes:
             print(f"\n--- Size: {size:,} ---")
+            size_dataset = prepare_dataset(size, dataset)
+            set_dataset_context(size, size_dataset)
             for trial in range(1, args.trials + 1):
                 print(
                     f"Trial {trial}/{args.trials} -- Start-time: {datetime.now().strftime('%H:%M:%S')}"
                 )
                 try:
                     DATABASE_FUNCTIONS[db](
-                        size, OPERATIONS[args.operation], trial=trial
+                        size,
+                        OPERATIONS[args.operation],
+                        trial=trial,
+                        dataset=size_dataset,
                     )
                     print(f"Completed: {db} - {size:,} (trial {trial})")
                 except Exception as e:
@@ -1,3 +1,6 @@
 RESULTS_CSV_FILE = "results/benchmark_results.csv"
 SUMMARY_CSV_FILE = "results/benchmark_summary.csv"
 ANALYSIS_FILE = "results/benchmark_analysis.md"
+DATASETS_DIR = "results/datasets"
+EXPORTS_DIR = "results/exports"
+PLAN_NODES_CSV_FILE = "results/explain/plan_nodes.csv"
@@ -1,6 +1,8 @@
-import random
+import os
 import time
 
+import bson
+from bson.raw_bson import RawBSONDocument
 from pymongo import MongoClient
 
 from src.config.connections import DATABASES
@@ -11,18 +13,25 @@ from src.nosql.queries import (
     NONINDEXED_OPERATIONS,
 )
 from src.utils.benchmark_helpers import needs_starting_data_refresh
+from src.utils.dataset import iter_starting_chunks
+from src.utils.export import (
+    NATIVE_LOAD_FORMATS,
+    NATIVE_LOAD_TOOLS,
+    export_paths,
+    export_starting_data,
+    native_tool,
+    run_native_tool,
+)
 from src.utils.generator import (
+    APPEND_TABLES,
+    RECONCILE_STREAM,
+    VALUE_POOLS,
+    assign_ids,
+    dataset_key,
+    dataset_options,
+    free_ids,
     generate_address,
-    generate_bulk_addresses,
-    generate_bulk_categories,
-    generate_bulk_inventory,
-    generate_bulk_order_items,
-    generate_bulk_orders,
-    generate_bulk_payments,
-    generate_bulk_products,
-    generate_bulk_reviews,
     generate_bulk_users,
-    generate_bulk_warehouses,
     generate_category,
     generate_inventory,
     generate_order,
@@ -31,16 +40,28 @@ from src.utils.generator import (
     generate_product,
     generate_review,
     generate_warehouse,
+    generator_context,
+    plant_probe_user_ids,
     split_starting_data,
+    table_randoms,
 )
+from src.utils.ingest import INGEST_PHASES, KEY_TABLES, run_ingest_phase
+from src.utils.probes import build_probe_catalog, draw_probe_email, set_probe_catalog
 from src.utils.results import save_explain_result, save_result
 
+BSON_POOLS = {
+    key: [RawBSONDocument(bson.encode(value)) for value in values]
+    for key, values in VALUE_POOLS.items()
+}
+
 
 class MongoBenchmark:
-    def __init__(self):
+    def __init__(self, dataset=None):
         self.config = DATABASES["mongo"]
         self.client = None
         self.db = None
+        self.dataset = dataset_options(dataset)
+        self.generator_context = generator_context(self.dataset)
 
     def connect(self):
         self.client = MongoClient(self.config["host"], self.config["port"])
@@ -96,6 +117,17 @@ class MongoBenchmark:
     def needs_starting_data_refresh(self, target_size):
         return needs_starting_data_refresh(self, target_size)
 
+    def get_dataset_key(self):
+        doc = self.db.benchmark_metadata.find_one({"_id": "dataset"})
+        return doc["value"] if doc else None
+
+    def save_dataset_key(self):
+        self.db.benchmark_metadata.replace_one(
+            {"_id": "dataset"},
+            {"_id": "dataset", "value": dataset_key(self.dataset)},
+            upsert=True,
+        )
+
     def collection_count(self, collection_name):
         return getattr(self.db, collection_name).count_documents({})
 
@@ -106,6 +138,15 @@ class MongoBenchmark:
                 max_id = max(max_id, doc["_id"])
         return max_id
 
+    def get_key_range(self, collection_name):
+        collection = getattr(self.db, collection_name)
+        numeric = {"_id": {"$type": "number"}}
+        low = collection.find_one(numeric, {"_id": 1}, sort=[("_id", 1)])
+        high = collection.find_one(numeric, {"_id": 1}, sort=[("_id", -1)])
+        if low is None:
+            return None, None
+        return low["_id"], high["_id"]
+
     def get_numeric_ids(self, collection_name, field_name="_id"):
         values = []
         for doc in getattr(self.db, collection_name).find({}, {field_name: 1}):
@@ -128,7 +169,8 @@ class MongoBenchmark:
         return [doc["_id"] for doc in docs]
 
     def reconcile_starting_data(self, total_records):
-        target_counts = split_starting_data(total_records)
+        target_counts = split_starting_data(total_records, self.dataset["weights"])
+        rngs = table_randoms(self.dataset["seed"], RECONCILE_STREAM)
 
         users_to_delete = self.get_ids_to_trim("users", target_counts["users"])
         categories_to_delete = self.get_ids_to_trim(
@@ -210,10 +252,12 @@ class MongoBenchmark:
 
         users_missing = target_counts["users"] - self.collection_count("users")
         if users_missing > 0:
-            start_id = self.get_max_numeric_id("users") + 1
-            users = generate_bulk_users(users_missing)
-            for idx, user in enumerate(users, start=start_id):
-                user["_id"] = idx
+            new_ids = free_ids(self.get_numeric_ids("users"), users_missing)
+            users = generate_bulk_users(
+                users_missing, rngs["users"], self.generator_context
+            )
+            assign_ids(users, new_ids, "_id")
+            plant_probe_user_ids(users, "_id")
             self.db.users.insert_many(users)
 
         categories_missing = target_counts["categories"] - self.collection_count(
@@ -221,16 +265,16 @@ class MongoBenchmark:
         )
         if categories_missing > 0:
             existing_category_ids = self.get_numeric_ids("categories")
-            start_id = self.get_max_numeric_id("categories") + 1
+            new_ids = free_ids(existing_category_ids, categories_missing)
             categories = []
             for idx in range(categories_missing):
-                category_id = start_id + idx
+                category_id = new_ids[idx]
                 parent_id = (
-                    random.choice(existing_category_ids)
-                    if existing_category_ids and random.random() > 0.7
+                    rngs["categories"].choice(existing_category_ids)
+                    if existing_category_ids and rngs["categories"].random() > 0.7
                     else None
                 )
-                category = generate_category(parent_id)
+                category = generate_category(parent_id, rngs["categories"])
                 category["_id"] = category_id
                 categories.append(category)
                 existing_category_ids.append(category_id)
@@ -240,10 +284,12 @@ class MongoBenchmark:
             "warehouses"
         )
         if warehouses_missing > 0:
-            start_id = self.get_max_numeric_id("warehouses") + 1
-            warehouses = [generate_warehouse() for _ in range(warehouses_missing)]
-            for idx, warehouse in enumerate(warehouses, start=start_id):
-                warehouse["_id"] = idx
+            new_ids = free_ids(self.get_numeric_ids("warehouses"), warehouses_missing)
+            warehouses = [
+                generate_warehouse(rngs["warehouses"])
+                for _ in range(warehouses_missing)
+            ]
+            assign_ids(warehouses, new_ids, "_id")
             self.db.warehouses.insert_many(warehouses)
 
         user_ids = self.get_numeric_ids("users")
@@ -252,25 +298,32 @@ class MongoBenchmark:
 
         products_missing = target_counts["products"] - self.collection_count("products")
         if products_missing > 0 and category_ids:
-            start_id = self.get_max_numeric_id("products") + 1
+            new_ids = free_ids(self.get_numeric_ids("products"), products_missing)
             products = [
-                generate_product(random.choice(category_ids))
+                generate_product(
+                    rngs["products"].choice(category_ids),
+                    rngs["products"],
+                    self.generator_context,
+                )
                 for _ in range(products_missing)
             ]
-            for idx, product in enumerate(products, start=start_id):
-                product["_id"] = idx
+            assign_ids(products, new_ids, "_id")
             self.db.products.insert_many(products)
 
         product_ids = self.get_numeric_ids("products")
 
         orders_missing = target_counts["orders"] - self.collection_count("orders")
         if orders_missing > 0 and user_ids:
-            start_id = self.get_max_numeric_id("orders") + 1
+            new_ids = free_ids(self.get_numeric_ids("orders"), orders_missing)
             orders = [
-                generate_order(random.choice(user_ids)) for _ in range(orders_missing)
+                generate_order(
+                    rngs["orders"].choice(user_ids),
+                    rngs["orders"],
+                    self.generator_context,
+                )
+                for _ in range(orders_missing)
             ]
-            for idx, order in enumerate(orders, start=start_id):
-                order["_id"] = idx
+            assign_ids(orders, new_ids, "_id")
             self.db.orders.insert_many(orders)
 
         order_ids = self.get_numeric_ids("orders")
@@ -279,128 +332,173 @@ class MongoBenchmark:
             "order_items"
         )
         if order_items_missing > 0 and order_ids and product_ids:
-            start_id = self.get_max_numeric_id("order_items") + 1
+            new_ids = free_ids(self.get_numeric_ids("order_items"), order_items_missing)
             order_items = [
                 generate_order_item(
-                    random.choice(order_ids), random.choice(product_ids)
+                    rngs["order_items"].choice(order_ids),
+                    rngs["order_items"].choice(product_ids),
+                    rngs["order_items"],
                 )
                 for _ in range(order_items_missing)
             ]
-            for idx, item in enumerate(order_items, start=start_id):
-                item["_id"] = idx
+            assign_ids(order_items, new_ids, "_id")
             self.db.order_items.insert_many(order_items)
 
         reviews_missing = target_counts["reviews"] - self.collection_count("reviews")
         if reviews_missing > 0 and user_ids and product_ids:
-            start_id = self.get_max_numeric_id("reviews") + 1
+            new_ids = free_ids(self.get_numeric_ids("reviews"), reviews_missing)
             reviews = [
-                generate_review(random.choice(user_ids), random.choice(product_ids))
+                generate_review(
+                    rngs["reviews"].choice(user_ids),
+                    rngs["reviews"].choice(product_ids),
+                    rngs["reviews"],
+                    self.generator_context,
+                )
                 for _ in range(reviews_missing)
             ]
-            for idx, review in enumerate(reviews, start=start_id):
-                review["_id"] = idx
+            assign_ids(reviews, new_ids, "_id")
             self.db.reviews.insert_many(reviews)
 
         inventory_missing = target_counts["inventory"] - self.collection_count(
             "inventory"
         )
         if inventory_missing > 0 and product_ids and warehouse_ids:
-            start_id = self.get_max_numeric_id("inventory") + 1
+            new_ids = free_ids(self.get_numeric_ids("inventory"), inventory_missing)
             inventory = [
                 generate_inventory(
-                    random.choice(product_ids), random.choice(warehouse_ids)
+                    rngs["inventory"].choice(product_ids),
+                    rngs["inventory"].choice(warehouse_ids),
+                    rngs["inventory"],
                 )
                 for _ in range(inventory_missing)
             ]
-            for idx, record in enumerate(inventory, start=start_id):
-                record["_id"] = idx
+            assign_ids(inventory, new_ids, "_id")
             self.db.inventory.insert_many(inventory)
 
         addresses_missing = target_counts["addresses"] - self.collection_count(
             "addresses"
         )
         if addresses_missing > 0 and user_ids:
-            start_id = self.get_max_numeric_id("addresses") + 1
+            new_ids = free_ids(self.get_numeric_ids("addresses"), addresses_missing)
             addresses = [
-                generate_address(random.choice(user_ids))
+                generate_address(rngs["addresses"].choice(user_ids), rngs["addresses"])
                 for _ in range(addresses_missing)
             ]
-            for idx, address in enumerate(addresses, start=start_id):
-                address["_id"] = idx
+            assign_ids(addresses, new_ids, "_id")
             self.db.addresses.insert_many(addresses)
 
         payments_missing = target_counts["payments"] - self.collection_count("payments")
         if payments_missing > 0 and order_ids:
-            start_id = self.get_max_numeric_id("payments") + 1
+            new_ids = free_ids(self.get_numeric_ids("payments"), payments_missing)
             payments = [
-                generate_payment(random.choice(order_ids))
+                generate_payment(rngs["payments"].choice(order_ids), rngs["payments"])
                 for _ in range(payments_missing)
             ]
-            for idx, payment in enumerate(payments, start=start_id):
-                payment["_id"] = idx
+            assign_ids(payments, new_ids, "_id")
             self.db.payments.insert_many(payments)
+        self.save_dataset_key()
+
+    def insert_starting_chunk(self, table, start_id, chunk):
+        if not chunk:
+            return
+        if self.dataset["generator"] == "columnar":
+            docs = chunk.records(id_field="_id", pools=BSON_POOLS)
+        else:
+            docs = chunk
+            for idx, doc in enumerate(docs, start=start_id):
+                doc["_id"] = idx
+        getattr(self.db, table).insert_many(docs)
 
     def populate_starting_data(self, total_records):
-        counts = split_starting_data(total_records)
-
-        users = generate_bulk_users(counts["users"])
-        for idx, user in enumerate(users, start=1):
-            user["_id"] = idx
-
-        categories = generate_bulk_categories(counts["categories"])
-        for idx, category in enumerate(categories, start=1):
-            category["_id"] = idx
-
-        warehouses = generate_bulk_warehouses(counts["warehouses"])
-        for idx, warehouse in enumerate(warehouses, start=1):
-            warehouse["_id"] = idx
-
-        products = generate_bulk_products(
-            counts["products"], list(range(1, counts["categories"] + 1))
-        )
-        for idx, product in enumerate(products, start=1):
-            product["_id"] = idx
-
-        orders = generate_bulk_orders(counts["orders"], counts["users"])
-        for idx, order in enumerate(orders, start=1):
-            order["_id"] = idx
-
-        order_items = generate_bulk_order_items(
-            counts["order_items"], counts["orders"], counts["products"]
-        )
-        for idx, item in enumerate(order_items, start=1):
-            item["_id"] = idx
+        for table, start_id, chunk in iter_starting_chunks(total_records, self.dataset):
+            self.insert_starting_chunk(table, start_id, chunk)
+        self.save_dataset_key()
+
+    def load_native_export(self, directory, fmt):
+        database = self.config["database"]
+        connection = ["--host", self.config["host"], "--port", str(self.config["port"])]
+        if fmt == "mongo_bson":
+            run_native_tool(
+                [
+                    native_tool(fmt),
+                    *connection,
+                    "--quiet",
+                    "--drop",
+                    "--nsFrom",
+                    "dump.*",
+                    "--nsTo",
+                    f"{database}.*",
+                    "--dir",
+                    directory,
+                ]
+            )
+            return
+        for table, path in export_paths(directory, fmt).items():
+            run_native_tool(
+                [
+                    native_tool(fmt),
+                    *connection,
+                    "--quiet",
+                    "--db",
+                    database,
+                    "--collection",
+                    table,
+                    "--file",
+                    path,
+                ]
+            )
 
-        reviews = generate_bulk_reviews(
-            counts["reviews"], counts["users"], counts["products"]
-        )
-        for idx, review in enumerate(reviews, start=1):
-            review["_id"] = idx
+    def run_load_benchmark(self, size, trial=1):
+        self.setup_collections(create_indexes=False)
+        start = time.time()
+        self.populate_starting_data(size)
+        elapsed = (time.time() - start) * 1000
+        save_result("mongo", "populate_starting_data", size, elapsed, size, trial=trial)
+
+        for fmt in NATIVE_LOAD_FORMATS["mongo"]:
+            operation = f"native_load_{fmt}"
+            if not native_tool(fmt):
+                print(f"Skipping {operation}: {NATIVE_LOAD_TOOLS[fmt]} not found")
+                save_result("mongo", operation, size, None, size, trial, "unsupported")
+                continue
+            directory = export_starting_data(size, self.dataset, fmt)
+            self.setup_collections(create_indexes=False)
+            start = time.time()
+            self.load_native_export(os.path.abspath(directory), fmt)
+            elapsed = (time.time() - start) * 1000
+            save_result("mongo", operation, size, elapsed, size, trial=trial)
 
-        inventory = generate_bulk_inventory(
-            counts["inventory"], counts["products"], counts["warehouses"]
-        )
-        for idx, record in enumerate(inventory, start=1):
-            record["_id"] = idx
-
-        addresses = generate_bulk_addresses(counts["addresses"], counts["users"])
-        for idx, address in enumerate(addresses, start=1):
-            address["_id"] = idx
-
-        payments = generate_bulk_payments(counts["payments"], counts["orders"])
-        for idx, payment in enumerate(payments, start=1):
-            payment["_id"] = idx
-
-        self.db.users.insert_many(users)
-        self.db.categories.insert_many(categories)
-        self.db.warehouses.insert_many(warehouses)
-        self.db.products.insert_many(products)
-        self.db.orders.insert_many(orders)
-        self.db.order_items.insert_many(order_items)
-        self.db.reviews.insert_many(reviews)
-        self.db.inventory.insert_many(inventory)
-        self.db.addresses.insert_many(addresses)
-        self.db.payments.insert_many(payments)
+    def insert_append_batch(self, batch):
+        for table, records in batch.items():
+            docs = [
+                {"_id": record["id"], **{k: v for k, v in record.items() if k != "id"}}
+                for record in records
+            ]
+            getattr(self.db, table).insert_many(docs)
+
+    def delete_appended_rows(self, start_ids):
+        for table in reversed(APPEND_TABLES):
+            getattr(self.db, table).delete_many({"_id": {"$gt": start_ids[table]}})
+
+    def run_ingest_benchmark(self, size, trial=1):
+        key_ranges = {table: self.get_key_range(table) for table in KEY_TABLES}
+        start_ids = {table: self.get_max_numeric_id(table) for table in APPEND_TABLES}
+        for phase in INGEST_PHASES:
+            if phase == "indexed":
+                self.ensure_indexes()
+            else:
+                self.drop_indexes()
+            run_ingest_phase(
+                "mongo",
+                phase,
+                size,
+                trial,
+                self.dataset,
+                key_ranges,
+                start_ids,
+                self.insert_append_batch,
+            )
+            self.delete_appended_rows(start_ids)
 
     def ensure_indexes(self):
         self.db.users.create_index("email")
@@ -432,7 +530,7 @@ class MongoBenchmark:
                 doc = query_func()
                 self.db.users.insert_one(doc)
             elif name == "insert_bulk":
-                docs = generate_bulk_users(1000)
+                docs = generate_bulk_users(1000, ctx=self.generator_context)
                 self.db.users.insert_many(docs)
             elif name == "insert_ignore":
                 doc = query_func()
@@ -527,7 +625,7 @@ class MongoBenchmark:
                 doc = query_func()
                 self.db.users.insert_one(doc)
             elif name == "index_insert_bulk":
-                docs = generate_bulk_users(1000)
+                docs = generate_bulk_users(1000, ctx=self.generator_context)
                 self.db.users.insert_many(docs)
             elif name == "index_insert_ignore":
                 doc = query_func()
@@ -641,7 +739,7 @@ class MongoBenchmark:
                 list(self.db.orders.aggregate(pipeline))
             elif name == "explain_update":
                 update_doc = query_func()
-                self.db.users.update_one({"email": "user1@example.com"}, update_doc)
+                self.db.users.update_one({"email": draw_probe_email()}, update_doc)
             elif name == "explain_update_many":
                 update_doc = query_func()
                 self.db.products.update_many(update_doc.get("$match", {}), update_doc)
@@ -689,8 +787,9 @@ class MongoBenchmark:
         return results
 
 
-def run_mongo_benchmark(size, operation_type="all", trial=1):
-    bench = MongoBenchmark()
+def run_mongo_benchmark(size, operation_type="all", trial=1, dataset=None):
+    bench = MongoBenchmark(dataset=dataset)
+    set_probe_catalog(build_probe_catalog(size, bench.dataset))
     bench.connect()
 
     try:
@@ -728,6 +827,23 @@ def run_mongo_benchmark(size, operation_type="all", trial=1):
                     bench.ensure_indexes()
             bench.run_indexed_queries(size, trial=trial)
 
+        if operation_type in ["load"]:
+            bench.run_load_benchmark(size, trial=trial)
+
+        if operation_type in ["ingest"]:
+            if bench.get_total_record_count() is None:
+                bench.setup_collections(create_indexes=True)
+                bench.populate_starting_data(size)
+            else:
+                needs_refresh, use_populate = bench.needs_starting_data_refresh(size)
+                if needs_refresh:
+                    if use_populate:
+                        bench.setup_collections(create_indexes=True)
+                        bench.populate_starting_data(size)
+                    else:
+                        bench.reconcile_starting_data(size)
+            bench.run_ingest_benchmark(size, trial=trial)
+
         if operation_type in ["explain"]:
             bench.run_explain_queries(trial=trial)
 
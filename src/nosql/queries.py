@@ -2,6 +2,7 @@ from src.utils.benchmark_helpers import (
     DELETE_TARGET_CATEGORIES,
     DELETE_TARGET_IDS,
 )
+from src.utils.probes import draw_probe_date, draw_probe_email, draw_probe_id
 
 NONINDEXED_OPERATIONS = {
     # CREATE - 6 queries
@@ -36,7 +37,7 @@ NONINDEXED_OPERATIONS = {
         "preferences": {"theme": "dark"},
     },
     # READ - 6 queries
-    "select_single": lambda: {"_id": 1},
+    "select_single": lambda: {"_id": draw_probe_id()},
     "select_where": lambda: {"email": {"$regex": "test"}},
     "select_join": lambda: [
         {
@@ -160,8 +161,8 @@ INDEXED_OPERATIONS = {
         "attributes": {"color": "green"},
     },
     # READ - 6 queries (using indexed fields)
-    "index_select_single": lambda: {"email": "user1000@example.com"},
-    "index_select_where": lambda: {"created_at": {"$gte": "2024-01-01"}},
+    "index_select_single": lambda: {"email": draw_probe_email()},
+    "index_select_where": lambda: {"created_at": {"$gte": draw_probe_date()}},
     "index_select_join": lambda: [
         {
             "$lookup": {
@@ -172,7 +173,7 @@ INDEXED_OPERATIONS = {
             }
         },
         {"$unwind": "$user"},
-        {"$match": {"user.created_at": {"$gte": "2024-01-01"}}},
+        {"$match": {"user.created_at": {"$gte": draw_probe_date()}}},
         {
             "$project": {
                 "_id": 1,
@@ -201,7 +202,7 @@ INDEXED_OPERATIONS = {
     "index_select_distinct": lambda: [{"$group": {"_id": "$status"}}],
     # UPDATE - 6 queries (using indexed fields)
     "index_update_single": lambda: {
-        "filter": {"email": "user1@example.com"},
+        "filter": {"email": draw_probe_email()},
         "update": {"$set": {"name": "updated_email_user"}},
     },
     "index_update_many": lambda: {
@@ -259,10 +260,9 @@ EXPLAIN_OPERATIONS = {
         "email": "explain@example.com",
         "preferences": {"theme": "dark"},
     },
-    "explain_select": lambda: {"email": "user1000@example.com"},
-    "explain_select_where": lambda: {"created_at": {"$gte": "2024-01-01"}},
+    "explain_select": lambda: {"email": draw_probe_email()},
+    "explain_select_where": lambda: {"created_at": {"$gte": draw_probe_date()}},
     "explain_select_join": lambda: [
-        {"$match": {"users.created_at": {"$gte": "2024-01-01"}}},
         {
             "$lookup": {
                 "from": "users",
@@ -271,6 +271,8 @@ EXPLAIN_OPERATIONS = {
                 "as": "user",
             }
         },
+        {"$unwind": "$user"},
+        {"$match": {"user.created_at": {"$gte": draw_probe_date()}}},
         {"$limit": 100},
     ],
     "explain_select_aggregate": lambda: [
@@ -1,5 +1,4 @@
 import os
-import random
 import time
 from datetime import date, datetime
 
@@ -13,18 +12,16 @@ from src.nosql.queries import (
     NONINDEXED_OPERATIONS,
 )
 from src.utils.benchmark_helpers import needs_starting_data_refresh
+from src.utils.dataset import iter_starting_chunks
 from src.utils.generator import (
+    RECONCILE_STREAM,
+    TOP_UP_STREAM,
+    assign_ids,
+    dataset_key,
+    dataset_options,
+    free_ids,
     generate_address,
-    generate_bulk_addresses,
-    generate_bulk_categories,
-    generate_bulk_inventory,
-    generate_bulk_order_items,
-    generate_bulk_orders,
-    generate_bulk_payments,
-    generate_bulk_products,
-    generate_bulk_reviews,
     generate_bulk_users,
-    generate_bulk_warehouses,
     generate_category,
     generate_inventory,
     generate_order,
@@ -33,16 +30,31 @@ from src.utils.generator import (
     generate_product,
     generate_review,
     generate_warehouse,
+    generator_context,
+    plant_probe_user_ids,
     split_starting_data,
+    table_random,
+    table_randoms,
+)
+from src.utils.probes import (
+    build_probe_catalog,
+    draw_probe_date,
+    draw_probe_email,
+    draw_probe_id,
+    set_probe_catalog,
 )
 from src.utils.results import save_explain_result, save_result
 
+DATASET_KEY = "benchmark_metadata:dataset"
+
 
 class UnqliteBenchmark:
-    def __init__(self):
+    def __init__(self, dataset=None):
         self.config = DATABASES["unqlite"]
         self.db = None
         self.record_ids = []
+        self.dataset = dataset_options(dataset)
+        self.generator_context = generator_context(self.dataset)
 
     def connect(self):
         self.db = unqlite.UnQLite(self.config["database"])
@@ -123,6 +135,14 @@ class UnqliteBenchmark:
     def needs_starting_data_refresh(self, target_size):
         return needs_starting_data_refresh(self, target_size)
 
+    def get_dataset_key(self):
+        if DATASET_KEY not in self.db:
+            return None
+        return self.db[DATASET_KEY].decode("utf-8")
+
+    def save_dataset_key(self):
+        self.db[DATASET_KEY] = dataset_key(self.dataset)
+
     def _bulk_store(self, collection_name, docs):
         for doc in docs:
             self._store_doc(collection_name, doc)
@@ -186,7 +206,8 @@ class UnqliteBenchmark:
             col.delete(doc["__id"])
 
     def reconcile_starting_data(self, total_records):
-        target_counts = split_starting_data(total_records)
+        target_counts = split_starting_data(total_records, self.dataset["weights"])
+        rngs = table_randoms(self.dataset["seed"], RECONCILE_STREAM)
 
         users_to_delete = self.get_docs_to_trim("users", target_counts["users"])
         categories_to_delete = self.get_docs_to_trim(
@@ -303,10 +324,12 @@ class UnqliteBenchmark:
 
         users_missing = target_counts["users"] - self.collection_count("users")
         if users_missing > 0:
-            start_id = self.get_max_field_id("users") + 1
-            users = generate_bulk_users(users_missing)
-            for offset, user in enumerate(users):
-                user["id"] = start_id + offset
+            new_ids = free_ids(self.get_field_ids("users"), users_missing)
+            users = generate_bulk_users(
+                users_missing, rngs["users"], self.generator_context
+            )
+            assign_ids(users, new_ids)
+            plant_probe_user_ids(users)
             self._bulk_store("users", users)
 
         categories_missing = target_counts["categories"] - self.collection_count(
@@ -314,16 +337,16 @@ class UnqliteBenchmark:
         )
         if categories_missing > 0:
             existing_category_ids = self.get_field_ids("categories")
-            start_id = self.get_max_field_id("categories") + 1
+            new_ids = free_ids(existing_category_ids, categories_missing)
             categories = []
             for offset in range(categories_missing):
-                category_id = start_id + offset
+                category_id = new_ids[offset]
                 parent_id = (
-                    random.choice(existing_category_ids)
-                    if existing_category_ids and random.random() > 0.7
+                    rngs["categories"].choice(existing_category_ids)
+                    if existing_category_ids and rngs["categories"].random() > 0.7
                     else None
                 )
-                category = generate_category(parent_id)
+                category = generate_category(parent_id, rngs["categories"])
                 category["id"] = category_id
                 categories.append(category)
                 existing_category_ids.append(category_id)
@@ -333,10 +356,12 @@ class UnqliteBenchmark:
             "warehouses"
         )
         if warehouses_missing > 0:
-            start_id = self.get_max_field_id("warehouses") + 1
-            warehouses = [generate_warehouse() for _ in range(warehouses_missing)]
-            for offset, warehouse in enumerate(warehouses):
-                warehouse["id"] = start_id + offset
+            new_ids = free_ids(self.get_field_ids("warehouses"), warehouses_missing)
+            warehouses = [
+                generate_warehouse(rngs["warehouses"])
+                for _ in range(warehouses_missing)
+            ]
+            assign_ids(warehouses, new_ids)
             self._bulk_store("warehouses", warehouses)
 
         user_ids = self.get_field_ids("users")
@@ -345,25 +370,32 @@ class UnqliteBenchmark:
 
         products_missing = target_counts["products"] - self.collection_count("products")
         if products_missing > 0 and category_ids:
-            start_id = self.get_max_field_id("products") + 1
+            new_ids = free_ids(self.get_field_ids("products"), products_missing)
             products = [
-                generate_product(random.choice(category_ids))
+                generate_product(
+                    rngs["products"].choice(category_ids),
+                    rngs["products"],
+                    self.generator_context,
+                )
                 for _ in range(products_missing)
             ]
-            for offset, product in enumerate(products):
-                product["id"] = start_id + offset
+            assign_ids(products, new_ids)
             self._bulk_store("products", products)
 
         product_ids = self.get_field_ids("products")
 
         orders_missing = target_counts["orders"] - self.collection_count("orders")
         if orders_missing > 0 and user_ids:
-            start_id = self.get_max_field_id("orders") + 1
+            new_ids = free_ids(self.get_field_ids("orders"), orders_missing)
             orders = [
-                generate_order(random.choice(user_ids)) for _ in range(orders_missing)
+                generate_order(
+                    rngs["orders"].choice(user_ids),
+                    rngs["orders"],
+                    self.generator_context,
+                )
+                for _ in range(orders_missing)
             ]
-            for offset, order in enumerate(orders):
-                order["id"] = start_id + offset
+            assign_ids(orders, new_ids)
             self._bulk_store("orders", orders)
 
         order_ids = self.get_field_ids("orders")
@@ -374,18 +406,29 @@ class UnqliteBenchmark:
         if order_items_missing > 0 and order_ids and product_ids:
             order_items = [
                 generate_order_item(
-                    random.choice(order_ids), random.choice(product_ids)
+                    rngs["order_items"].choice(order_ids),
+                    rngs["order_items"].choice(product_ids),
+                    rngs["order_items"],
                 )
                 for _ in range(order_items_missing)
             ]
+            new_ids = free_ids(self.get_field_ids("order_items"), order_items_missing)
+            assign_ids(order_items, new_ids)
             self._bulk_store("order_items", order_items)
 
         reviews_missing = target_counts["reviews"] - self.collection_count("reviews")
         if reviews_missing > 0 and user_ids and product_ids:
             reviews = [
-                generate_review(random.choice(user_ids), random.choice(product_ids))
+                generate_review(
+                    rngs["reviews"].choice(user_ids),
+                    rngs["reviews"].choice(product_ids),
+                    rngs["reviews"],
+                    self.generator_context,
+                )
                 for _ in range(reviews_missing)
             ]
+            new_ids = free_ids(self.get_field_ids("reviews"), reviews_missing)
+            assign_ids(reviews, new_ids)
             self._bulk_store("reviews", reviews)
 
         inventory_missing = target_counts["inventory"] - self.collection_count(
@@ -394,10 +437,14 @@ class UnqliteBenchmark:
         if inventory_missing > 0 and product_ids and warehouse_ids:
             inventory = [
                 generate_inventory(
-                    random.choice(product_ids), random.choice(warehouse_ids)
+                    rngs["inventory"].choice(product_ids),
+                    rngs["inventory"].choice(warehouse_ids),
+                    rngs["inventory"],
                 )
                 for _ in range(inventory_missing)
             ]
+            new_ids = free_ids(self.get_field_ids("inventory"), inventory_missing)
+            assign_ids(inventory, new_ids)
             self._bulk_store("inventory", inventory)
 
         addresses_missing = target_counts["addresses"] - self.collection_count(
@@ -405,21 +452,28 @@ class UnqliteBenchmark:
         )
         if addresses_missing > 0 and user_ids:
             addresses = [
-                generate_address(random.choice(user_ids))
+                generate_address(rngs["addresses"].choice(user_ids), rngs["addresses"])
                 for _ in range(addresses_missing)
             ]
+            new_ids = free_ids(self.get_field_ids("addresses"), addresses_missing)
+            assign_ids(addresses, new_ids)
             self._bulk_store("addresses", addresses)
 
         payments_missing = target_counts["payments"] - self.collection_count("payments")
         if payments_missing > 0 and order_ids:
             payments = [
-                generate_payment(random.choice(order_ids))
+                generate_payment(rngs["payments"].choice(order_ids), rngs["payments"])
                 for _ in range(payments_missing)
             ]
+            new_ids = free_ids(self.get_field_ids("payments"), payments_missing)
+            assign_ids(payments, new_ids)
             self._bulk_store("payments", payments)
+        self.save_dataset_key()
 
     def ensure_addresses_volume(self, total_records):
-        target_addresses = split_starting_data(total_records)["addresses"]
+        target_addresses = split_starting_data(total_records, self.dataset["weights"])[
+            "addresses"
+        ]
         addresses = self._get_collection("addresses")
         if not addresses.exists():
             addresses.create()
@@ -439,56 +493,27 @@ class UnqliteBenchmark:
             return
 
         missing = target_addresses - current_addresses
-        addresses = [generate_address(random.choice(user_ids)) for _ in range(missing)]
+        rng = table_random(self.dataset["seed"], "addresses", TOP_UP_STREAM)
+        addresses = [
+            generate_address(rng.choice(user_ids), rng) for _ in range(missing)
+        ]
         self._bulk_store("addresses", addresses)
 
-    def populate_starting_data(self, total_records):
-        counts = split_starting_data(total_records)
-
-        users = generate_bulk_users(counts["users"])
-        for idx, user in enumerate(users, start=1):
-            user["id"] = idx
-
-        categories = generate_bulk_categories(counts["categories"])
-        warehouses = generate_bulk_warehouses(counts["warehouses"])
-        for idx, warehouse in enumerate(warehouses, start=1):
-            warehouse["id"] = idx
-
-        products = generate_bulk_products(
-            counts["products"], list(range(1, counts["categories"] + 1))
-        )
-        for idx, product in enumerate(products, start=1):
-            product["id"] = idx
-
-        orders = generate_bulk_orders(counts["orders"], counts["users"])
-        for idx, order in enumerate(orders, start=1):
-            order["id"] = idx
-
-        order_items = generate_bulk_order_items(
-            counts["order_items"], counts["orders"], counts["products"]
-        )
-
-        reviews = generate_bulk_reviews(
-            counts["reviews"], counts["users"], counts["products"]
-        )
-
-        inventory = generate_bulk_inventory(
-            counts["inventory"], counts["products"], counts["warehouses"]
-        )
+    def insert_starting_chunk(self, table, start_id, chunk):
+        if not chunk:
+            return
+        if self.dataset["generator"] == "columnar":
+            docs = chunk.records()
+        else:
+            docs = chunk
+            for idx, doc in enumerate(docs, start=start_id):
+                doc["id"] = idx
+        self._bulk_store(table, docs)
 
-        addresses = generate_bulk_addresses(counts["addresses"], counts["users"])
-        payments = generate_bulk_payments(counts["payments"], counts["orders"])
-
-        self._bulk_store("users", users)
-        self._bulk_store("categories", categories)
-        self._bulk_store("warehouses", warehouses)
-        self._bulk_store("products", products)
-        self._bulk_store("orders", orders)
-        self._bulk_store("order_items", order_items)
-        self._bulk_store("reviews", reviews)
-        self._bulk_store("inventory", inventory)
-        self._bulk_store("addresses", addresses)
-        self._bulk_store("payments", payments)
+    def populate_starting_data(self, total_records):
+        for table, start_id, chunk in iter_starting_chunks(total_records, self.dataset):
+            self.insert_starting_chunk(table, start_id, chunk)
+        self.save_dataset_key()
 
     def run_nonindexed_queries(self, size, trial=1):
         results = {}
@@ -519,7 +544,7 @@ class UnqliteBenchmark:
                 self._store_doc("users", doc)
                 elapsed = (time.time() - start) * 1000
             elif name == "insert_bulk":
-                docs = generate_bulk_users(1000)
+                docs = generate_bulk_users(1000, ctx=self.generator_context)
                 col = self._get_collection("users")
                 if not col.exists():
                     col.create()
@@ -574,8 +599,9 @@ class UnqliteBenchmark:
                 elapsed = (time.time() - start) * 1000
             elif name == "select_single":
                 col = self._get_collection("users")
+                user_id = draw_probe_id()
                 start = time.time()
-                list(col.filter(lambda doc: doc.get("id") == 1))
+                list(col.filter(lambda doc: doc.get("id") == user_id))
                 elapsed = (time.time() - start) * 1000
             elif name == "select_where":
                 col = self._get_collection("users")
@@ -746,7 +772,7 @@ class UnqliteBenchmark:
                 self._store_doc("users", doc)
                 elapsed = (time.time() - start) * 1000
             elif name == "index_insert_bulk":
-                docs = generate_bulk_users(1000)
+                docs = generate_bulk_users(1000, ctx=self.generator_context)
                 col = self._get_collection("users")
                 if not col.exists():
                     col.create()
@@ -793,17 +819,15 @@ class UnqliteBenchmark:
                 elapsed = (time.time() - start) * 1000
             elif name == "index_select_single":
                 col = self._get_collection("users")
+                email = draw_probe_email()
                 start = time.time()
-                list(col.filter(lambda doc: doc.get("email") == "user1000@example.com"))
+                list(col.filter(lambda doc: doc.get("email") == email))
                 elapsed = (time.time() - start) * 1000
             elif name == "index_select_where":
                 col = self._get_collection("users")
+                since = draw_probe_date(as_text=True)
                 start = time.time()
-                list(
-                    col.filter(
-                        lambda doc: (doc.get("created_at") or "") >= "2024-01-01"
-                    )
-                )
+                list(col.filter(lambda doc: (doc.get("created_at") or "") >= since))
                 elapsed = (time.time() - start) * 1000
             elif name == "index_select_aggregate":
                 col = self._get_collection("orders")
@@ -838,10 +862,9 @@ class UnqliteBenchmark:
                 elapsed = (time.time() - start) * 1000
             elif name == "index_update_single":
                 col = self._get_collection("users")
+                email = draw_probe_email()
                 start = time.time()
-                matching = list(
-                    col.filter(lambda doc: doc.get("email") == "user1@example.com")
-                )
+                matching = list(col.filter(lambda doc: doc.get("email") == email))
                 for doc in matching:
                     self._update_doc(col, doc["__id"], {"name": "updated_email_user"})
                 elapsed = (time.time() - start) * 1000
@@ -991,8 +1014,9 @@ class UnqliteBenchmark:
         return results
 
 
-def run_unqlite_benchmark(size, operation_type="all", trial=1):
-    bench = UnqliteBenchmark()
+def run_unqlite_benchmark(size, operation_type="all", trial=1, dataset=None):
+    bench = UnqliteBenchmark(dataset=dataset)
+    set_probe_catalog(build_probe_catalog(size, bench.dataset))
     bench.connect()
 
     try:
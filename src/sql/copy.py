@@ -0,0 +1,72 @@
+from itertools import groupby
+
+from src.utils.export import (
+    PG_COPY_SIGNATURE,
+    PG_COPY_TRAILER,
+    encode_pg_binary,
+    encode_pg_text,
+)
+from src.utils.generator import STARTING_DATA_FIELDS
+
+COPY_READ_SIZE = 2**20
+
+COPY_ENCODERS = {"copy": encode_pg_text, "copy_binary": encode_pg_binary}
+
+COPY_OPTIONS = {"copy": "FORMAT text", "copy_binary": "FORMAT binary"}
+
+COPY_FRAMES = {"copy_binary": (PG_COPY_SIGNATURE, PG_COPY_TRAILER)}
+
+
+class CopyStream:
+    def __init__(self, blocks):
+        self.blocks = iter(blocks)
+        self.block = memoryview(b"")
+        self.offset = 0
+
+    def read(self, size=-1):
+        while self.offset >= len(self.block):
+            block = next(self.blocks, None)
+            if block is None:
+                return b""
+            self.block, self.offset = memoryview(block), 0
+        end = len(self.block) if size < 0 else self.offset + size
+        data = self.block[self.offset : end]
+        self.offset += len(data)
+        return data.tobytes()
+
+
+def copy_blocks(table, chunks, strategy):
+    encode = COPY_ENCODERS[strategy]
+    header, trailer = COPY_FRAMES.get(strategy, (b"", b""))
+    yield header
+    for start_id, chunk in chunks:
+        if chunk:
+            yield encode(table, chunk, start_id)
+    yield trailer
+
+
+def copy_table(cur, table, chunks, strategy="copy"):
+    fields = ", ".join(["id", *STARTING_DATA_FIELDS[table]])
+    cur.copy_expert(
+        f"COPY {table} ({fields}) FROM STDIN ({COPY_OPTIONS[strategy]})",
+        CopyStream(copy_blocks(table, chunks, strategy)),
+        size=COPY_READ_SIZE,
+    )
+    reset_sequence(cur, table)
+
+
+def reset_sequence(cur, table):
+    cur.execute(
+        f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+        f"COALESCE(MAX(id), 1), MAX(id) IS NOT NULL) FROM {table}"
+    )
+
+
+def copy_starting_chunks(cur, chunks, strategy="copy"):
+    for table, table_chunks in groupby(chunks, key=lambda item: item[0]):
+        copy_table(
+            cur,
+            table,
+            ((start_id, chunk) for _, start_id, chunk in table_chunks),
+            strategy,
+        )
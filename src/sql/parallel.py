@@ -0,0 +1,127 @@
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+
+from psycopg2.extras import execute_values
+
+from src.sql.copy import copy_table, reset_sequence
+from src.utils.dataset import iter_range_chunks, materialize_dataset, plan_load_ranges
+from src.utils.export import export_rows, with_ids
+from src.utils.generator import STARTING_DATA_FIELDS
+
+FOREIGN_KEYS_QUERY = """
+SELECT DISTINCT conrelid::regclass::text, confrelid::regclass::text
+FROM pg_constraint
+WHERE contype = 'f'
+    AND connamespace = 'public'::regnamespace
+"""
+
+
+def table_dependencies(cur, tables):
+    cur.execute(FOREIGN_KEYS_QUERY)
+    dependencies = {table: set() for table in tables}
+    self_referencing = set()
+    for child, parent in cur.fetchall():
+        if child == parent:
+            self_referencing.add(child)
+        elif child in dependencies and parent in dependencies:
+            dependencies[child].add(parent)
+    return dependencies, self_referencing
+
+
+def merge_table_ranges(ranges, tables):
+    merged = {}
+    result = []
+    for table, tasks in ranges:
+        if table not in tables:
+            result.append((table, tasks))
+            continue
+        if table not in merged:
+            merged[table] = []
+            result.append((table, merged[table]))
+        merged[table].extend(tasks)
+    return result
+
+
+def insert_table_values(cur, table, chunks):
+    fields = ", ".join(["id", *STARTING_DATA_FIELDS[table]])
+    for start_id, chunk in chunks:
+        if chunk:
+            execute_values(
+                cur,
+                f"INSERT INTO {table} ({fields}) VALUES %s",
+                with_ids(export_rows(chunk, STARTING_DATA_FIELDS[table]), start_id),
+            )
+    reset_sequence(cur, table)
+
+
+def load_range(connect, total_records, dataset, table, tasks, strategy, executor):
+    chunks = (
+        (start_id, chunk)
+        for _, start_id, chunk in iter_range_chunks(
+            total_records, dataset, tasks, executor
+        )
+    )
+    conn = connect()
+    try:
+        with conn.cursor() as cur:
+            if strategy == "values":
+                insert_table_values(cur, table, chunks)
+            else:
+                copy_table(cur, table, chunks, strategy)
+    finally:
+        conn.close()
+
+
+def parallel_load(connect, cur, total_records, dataset, strategy, connections):
+    dataset = materialize_dataset(total_records, dataset)
+    ranges = plan_load_ranges(total_records, dataset, connections)
+    tables = list(dict.fromkeys(table for table, _ in ranges))
+    dependencies, self_referencing = table_dependencies(cur, tables)
+    # Rows of a self-referencing table may point into another range, whose
+    # uncommitted inserts a concurrent connection's FK check cannot see.
+    ranges = merge_table_ranges(ranges, self_referencing)
+    remaining = {table: 0 for table in tables}
+    for table, _ in ranges:
+        remaining[table] += 1
+
+    loaded = set()
+    running = {}
+    with ProcessPoolExecutor(max_workers=dataset["workers"]) as generators:
+        with ThreadPoolExecutor(max_workers=connections) as loaders:
+            while len(loaded) < len(tables):
+                ready = {
+                    table
+                    for table in tables
+                    if dependencies[table] <= loaded
+                    and table not in loaded
+                    and table not in running.values()
+                }
+                for table, tasks in ranges:
+                    if table in ready:
+                        future = loaders.submit(
+                            load_range,
+                            connect,
+                            total_records,
+                            dataset,
+                            table,
+                            tasks,
+                            strategy,
+                            generators,
+                        )
+                        running[future] = table
+                if not running:
+                    raise RuntimeError(
+                        f"foreign key cycle between {sorted(set(tables) - loaded)}"
+                    )
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    table = running.pop(future)
+                    future.result()
+                    remaining[table] -= 1
+                    if remaining[table] == 0:
+                        loaded.add(table)
@@ -0,0 +1,60 @@
+import re
+
+PG_PLAN_FIELDS = {
+    "relation": "Relation Name",
+    "index_name": "Index Name",
+    "parent_relationship": "Parent Relationship",
+    "estimated_rows": "Plan Rows",
+    "actual_rows": "Actual Rows",
+    "actual_loops": "Actual Loops",
+    "actual_total_time_ms": "Actual Total Time",
+    "shared_hit_blocks": "Shared Hit Blocks",
+    "shared_read_blocks": "Shared Read Blocks",
+    "temp_written_blocks": "Temp Written Blocks",
+}
+
+SQLITE_ACCESS_PATTERN = re.compile(
+    r"^(?P<access>SCAN|SEARCH) (?P<relation>\w+)(?: AS \w+)?"
+    r"(?: USING (?P<kind>(?:COVERING )?INDEX|INTEGER PRIMARY KEY)(?: (?P<index>\w+))?)?"
+)
+
+
+def parse_pg_plan(explain_rows):
+    nodes = []
+    stack = [(explain_rows[0][0][0]["Plan"], 0, 0)]
+    while stack:
+        plan, parent_id, depth = stack.pop()
+        node = {
+            "node_id": len(nodes) + 1,
+            "parent_id": parent_id,
+            "depth": depth,
+            "node_type": plan["Node Type"],
+        }
+        for field, key in PG_PLAN_FIELDS.items():
+            node[field] = plan.get(key, "")
+        nodes.append(node)
+        for child in reversed(plan.get("Plans", [])):
+            stack.append((child, node["node_id"], depth + 1))
+    return nodes
+
+
+def parse_sqlite_plan(explain_rows):
+    depths = {0: -1}
+    nodes = []
+    for node_id, parent_id, _, detail in explain_rows:
+        depths[node_id] = depths.get(parent_id, -1) + 1
+        node = {
+            "node_id": node_id,
+            "parent_id": parent_id,
+            "depth": depths[node_id],
+            "node_type": detail,
+        }
+        match = SQLITE_ACCESS_PATTERN.match(detail)
+        if match:
+            node["node_type"] = match["access"]
+            if match["kind"]:
+                node["node_type"] += f" USING {match['kind']}"
+            node["relation"] = match["relation"]
+            node["index_name"] = match["index"] or ""
+        nodes.append(node)
+    return nodes
@@ -1,64 +1,146 @@
 import json
-import random
+import os
 import time
+from datetime import datetime
 
 import psycopg2
 from psycopg2.extras import execute_values
 
 from src.config.connections import DATABASES
+from src.sql.copy import copy_starting_chunks, reset_sequence
+from src.sql.parallel import parallel_load
+from src.sql.plans import parse_pg_plan
 from src.sql.queries import (
     EXPLAIN_QUERIES,
     INDEXED_QUERIES,
     JSON_QUERIES,
     NONINDEXED_QUERIES,
 )
-from src.sql.schema import INDEXES, SCHEMA
+from src.sql.reconcile import (
+    KEY_RANGE,
+    TOP_UP_INSERTS,
+    TOP_UP_KEYS,
+    TRIM_BOUND,
+    TRIM_CHILD_TABLES,
+    TRIM_PARENT_TABLES,
+    TRIM_STATEMENTS,
+)
+from src.sql.schema import (
+    BARE_SCHEMA,
+    DATASET_KEY_QUERY,
+    DATASET_KEY_UPSERT,
+    FOREIGN_KEYS,
+    INDEX_STATEMENTS,
+    INDEXES,
+    KEY_CONSTRAINTS,
+    METADATA_SCHEMA,
+    SCHEMA,
+)
+from src.sql.server_stats import (
+    BASELINE_SAMPLES,
+    detect_stats_sources,
+    flush_server_stats,
+    server_stats_baseline,
+    server_stats_delta,
+    snapshot_server_stats,
+)
 from src.utils.benchmark_helpers import (
     DELETE_TARGET_CATEGORIES,
     DELETE_TARGET_IDS,
     needs_starting_data_refresh,
+    returns_rows,
+)
+from src.utils.dataset import iter_starting_chunks
+from src.utils.export import (
+    NATIVE_LOAD_FORMATS,
+    NATIVE_LOAD_TOOLS,
+    export_paths,
+    export_starting_data,
+    native_tool,
+    run_native_tool,
 )
 from src.utils.generator import (
-    generate_address,
-    generate_bulk_addresses,
-    generate_bulk_categories,
-    generate_bulk_inventory,
-    generate_bulk_order_items,
-    generate_bulk_orders,
-    generate_bulk_payments,
-    generate_bulk_products,
-    generate_bulk_reviews,
+    APPEND_TABLES,
+    DATE_RANGE_DAYS,
+    LOAD_STRATEGIES,
+    PROBE_STRIDE,
+    RECONCILE_STREAM,
+    STARTING_DATA_FIELDS,
+    STARTING_DATA_INSERT_ORDER,
+    TOP_UP_STREAM,
+    dataset_key,
+    dataset_options,
     generate_bulk_users,
-    generate_bulk_warehouses,
-    generate_category,
-    generate_inventory,
-    generate_order,
-    generate_order_item,
-    generate_payment,
-    generate_review,
-    generate_warehouse,
+    generator_context,
+    parse_row_width,
+    pooled_json,
     split_starting_data,
+    table_seed,
+)
+from src.utils.ingest import (
+    INGEST_PHASES,
+    KEY_TABLES,
+    append_rows,
+    run_ingest_phase,
 )
-from src.utils.results import save_explain_result, save_result
+from src.utils.probes import build_probe_catalog, set_probe_catalog
+from src.utils.results import save_explain_result, save_plan_nodes, save_result
+
+MAINTENANCE_WORK_MEM = "512MB"
+
+
+def current_rss_bytes():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def numbered_placeholders(query):
+    parts = query.split("%s")
+    return parts[0] + "".join(
+        f"${index}{part}" for index, part in enumerate(parts[1:], start=1)
+    )
 
 
 class PostgresBenchmark:
-    def __init__(self):
+    def __init__(self, dataset=None):
         self.config = DATABASES["postgres"]
         self.conn = None
-
-    def connect(self):
-        self.conn = psycopg2.connect(
+        self.stats_conn = None
+        self.stats_sources = None
+        self.stats_baseline = None
+        self.prepared_statements = set()
+        self.dataset = dataset_options(dataset)
+        self.generator_context = generator_context(self.dataset)
+
+    def open_connection(self):
+        conn = psycopg2.connect(
             host=self.config["host"],
             port=self.config["port"],
             database=self.config["database"],
             user=self.config["user"],
             password=self.config["password"],
         )
-        self.conn.autocommit = True
+        conn.autocommit = True
+        return conn
+
+    def connect(self):
+        self.conn = self.open_connection()
+        # snapshots run on their own connection so their catalog reads are
+        # not counted against the benchmarked one
+        self.stats_conn = self.open_connection()
+        with self.stats_conn.cursor() as cur:
+            self.stats_sources = detect_stats_sources(cur)
+        self.stats_baseline = self.measure_stats_baseline()
+        self.prepared_statements = set()
 
     def close(self):
+        if self.stats_conn:
+            self.stats_conn.close()
         if self.conn:
+            if self.prepared_statements and not self.conn.closed:
+                with self.conn.cursor() as cur:
+                    cur.execute("DEALLOCATE ALL")
+                self.prepared_statements = set()
             self.conn.close()
 
     def setup_schema(self, create_indexes=True):
@@ -67,6 +149,113 @@ class PostgresBenchmark:
             if create_indexes:
                 cur.execute(INDEXES)
 
+    def current_wal_lsn(self):
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT pg_current_wal_lsn()")
+            return cur.fetchone()[0]
+
+    def wal_bytes_since(self, lsn):
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT pg_wal_lsn_diff(pg_current_wal_lsn(), %s)", (lsn,))
+            return int(cur.fetchone()[0])
+
+    def set_tables_logged(self, logged=True):
+        tables = STARTING_DATA_INSERT_ORDER
+        if not logged:
+            tables = list(reversed(tables))
+        with self.conn.cursor() as cur:
+            for table in tables:
+                cur.execute(
+                    f"ALTER TABLE {table} SET {'LOGGED' if logged else 'UNLOGGED'}"
+                )
+
+    def load_starting_data(self, total_records, create_indexes=True, trial=1):
+        unlogged = self.dataset["unlogged"]
+        lsn = self.current_wal_lsn()
+        start = time.time()
+        if self.dataset["defer_constraints"]:
+            self.build_deferred_schema(total_records, create_indexes, trial)
+        else:
+            self.setup_schema(create_indexes=create_indexes)
+            if unlogged:
+                self.set_tables_logged(False)
+            self.populate_starting_data(total_records)
+        if not unlogged:
+            return
+
+        phases = {"load": (time.time() - start, self.wal_bytes_since(lsn))}
+        lsn = self.current_wal_lsn()
+        start = time.time()
+        self.set_tables_logged(True)
+        phases["set_logged"] = (time.time() - start, self.wal_bytes_since(lsn))
+
+        for phase, (elapsed, wal_bytes) in phases.items():
+            save_result(
+                "postgres",
+                f"unlogged_{phase}",
+                total_records,
+                elapsed * 1000,
+                total_records,
+                trial=trial,
+                details={"wal_bytes": wal_bytes},
+            )
+            print(f"unlogged_{phase}: {elapsed:.2f}s, {wal_bytes / 2**20:,.1f} MiB WAL")
+
+    def build_deferred_schema(self, total_records, create_indexes=True, trial=1):
+        with self.conn.cursor() as cur:
+            cur.execute(BARE_SCHEMA)
+        if self.dataset["unlogged"]:
+            self.set_tables_logged(False)
+
+        timings = {}
+        start = time.time()
+        self.populate_starting_data(total_records)
+        timings["load"] = time.time() - start
+
+        steps = {**KEY_CONSTRAINTS, **FOREIGN_KEYS}
+        if create_indexes:
+            steps.update(INDEX_STATEMENTS)
+        workers = self.dataset["maintenance_workers"]
+        with self.conn.cursor() as cur:
+            cur.execute("SET max_parallel_maintenance_workers = %s", (workers,))
+            cur.execute("SET maintenance_work_mem = %s", (MAINTENANCE_WORK_MEM,))
+            for name, statement in steps.items():
+                start = time.time()
+                cur.execute(statement)
+                timings[name] = time.time() - start
+            cur.execute("RESET max_parallel_maintenance_workers")
+            cur.execute("RESET maintenance_work_mem")
+
+        for name, elapsed in timings.items():
+            save_result(
+                "postgres",
+                f"deferred_{name}",
+                total_records,
+                elapsed * 1000,
+                total_records,
+                trial=trial,
+            )
+        total = sum(timings.values())
+        save_result(
+            "postgres",
+            "deferred_total",
+            total_records,
+            total * 1000,
+            total_records,
+            trial=trial,
+            details={
+                "load_ms": round(timings["load"] * 1000, 1),
+                "constraints_ms": round((total - timings["load"]) * 1000, 1),
+                "maintenance_workers": workers,
+            },
+        )
+        slowest = max(steps, key=timings.get) if steps else "load"
+        print(
+            f"deferred build: load {timings['load']:.2f}s, "
+            f"constraints and indexes {total - timings['load']:.2f}s "
+            f"(slowest {slowest} {timings[slowest]:.2f}s)"
+        )
+
     def _starting_tables_exist(self):
         with self.conn.cursor() as cur:
             cur.execute(
@@ -111,6 +300,20 @@ class PostgresBenchmark:
     def needs_starting_data_refresh(self, target_size):
         return needs_starting_data_refresh(self, target_size)
 
+    def get_dataset_key(self):
+        with self.conn.cursor() as cur:
+            cur.execute("SELECT to_regclass('public.benchmark_metadata') IS NOT NULL")
+            if not cur.fetchone()[0]:
+                return None
+            cur.execute(DATASET_KEY_QUERY)
+            row = cur.fetchone()
+        return row[0] if row else None
+
+    def save_dataset_key(self):
+        with self.conn.cursor() as cur:
+            cur.execute(METADATA_SCHEMA)
+            cur.execute(DATASET_KEY_UPSERT, (dataset_key(self.dataset),))
+
     def ensure_indexes(self):
         with self.conn.cursor() as cur:
             cur.execute("CREATE INDEX IF NOT EXISTS idx_users_email ON users(email)")
@@ -193,9 +396,14 @@ class PostgresBenchmark:
             )
 
     def bulk_insert_users(self, count):
-        users = generate_bulk_users(count)
+        users = generate_bulk_users(count, ctx=self.generator_context)
         data = [
-            (u["name"], u["email"], u["created_at"], json.dumps(u["preferences"]))
+            (
+                u["name"],
+                u["email"],
+                u["created_at"],
+                pooled_json("users", "preferences", u["preferences"]),
+            )
             for u in users
         ]
         with self.conn.cursor() as cur:
@@ -221,39 +429,16 @@ class PostgresBenchmark:
             cur.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table_name}")
             return cur.fetchone()[0]
 
-    def get_ids_to_trim(self, table_name, target_count):
-        current_count = self.get_table_count(table_name)
-        excess = current_count - target_count
-        if excess <= 0:
-            return []
-
-        with self.conn.cursor() as cur:
-            cur.execute(
-                f"SELECT id FROM {table_name} ORDER BY id DESC LIMIT %s",
-                (excess,),
-            )
-            return [row[0] for row in cur.fetchall()]
-
-    def delete_ids(self, table_name, ids):
-        if not ids:
-            return
-        with self.conn.cursor() as cur:
-            cur.execute(f"DELETE FROM {table_name} WHERE id = ANY(%s)", (ids,))
-
-    def delete_by_foreign_key(self, table_name, column_name, ids):
-        if not ids:
-            return
-        with self.conn.cursor() as cur:
-            cur.execute(
-                f"DELETE FROM {table_name} WHERE {column_name} = ANY(%s)",
-                (ids,),
-            )
-
     def insert_users(self, users):
         if not users:
             return
         data = [
-            (u["name"], u["email"], u["created_at"], json.dumps(u["preferences"]))
+            (
+                u["name"],
+                u["email"],
+                u["created_at"],
+                pooled_json("users", "preferences", u["preferences"]),
+            )
             for u in users
         ]
         with self.conn.cursor() as cur:
@@ -335,7 +520,7 @@ class PostgresBenchmark:
                 r["product_id"],
                 r["rating"],
                 r["comment"],
-                json.dumps(r["metadata"]),
+                pooled_json("reviews", "metadata", r["metadata"]),
             )
             for r in reviews
         ]
@@ -383,7 +568,12 @@ class PostgresBenchmark:
         if not payments:
             return
         data = [
-            (p["order_id"], p["method"], p["amount"], json.dumps(p["data"]))
+            (
+                p["order_id"],
+                p["method"],
+                p["amount"],
+                pooled_json("payments", "data", p["data"]),
+            )
             for p in payments
         ]
         with self.conn.cursor() as cur:
@@ -393,333 +583,206 @@ class PostgresBenchmark:
                 data,
             )
 
-    def reconcile_starting_data(self, total_records):
-        target_counts = split_starting_data(total_records)
-
-        users_to_delete = self.get_ids_to_trim("users", target_counts["users"])
-        categories_to_delete = self.get_ids_to_trim(
-            "categories", target_counts["categories"]
-        )
-        warehouses_to_delete = self.get_ids_to_trim(
-            "warehouses", target_counts["warehouses"]
-        )
-        products_to_delete = self.get_ids_to_trim("products", target_counts["products"])
-        orders_to_delete = self.get_ids_to_trim("orders", target_counts["orders"])
-
-        if users_to_delete:
-            self.delete_by_foreign_key("payments", "order_id", orders_to_delete)
-            with self.conn.cursor() as cur:
-                cur.execute(
-                    "DELETE FROM payments WHERE order_id IN (SELECT id FROM orders WHERE user_id = ANY(%s))",
-                    (users_to_delete,),
-                )
-                cur.execute(
-                    "DELETE FROM order_items WHERE order_id IN (SELECT id FROM orders WHERE user_id = ANY(%s))",
-                    (users_to_delete,),
-                )
-                cur.execute(
-                    "DELETE FROM orders WHERE user_id = ANY(%s)",
-                    (users_to_delete,),
-                )
-            self.delete_by_foreign_key("reviews", "user_id", users_to_delete)
-            self.delete_by_foreign_key("addresses", "user_id", users_to_delete)
-
-        if categories_to_delete:
-            with self.conn.cursor() as cur:
-                cur.execute(
-                    "UPDATE categories SET parent_id = NULL WHERE parent_id = ANY(%s)",
-                    (categories_to_delete,),
-                )
-                cur.execute(
-                    "DELETE FROM order_items WHERE product_id IN (SELECT id FROM products WHERE category_id = ANY(%s))",
-                    (categories_to_delete,),
-                )
-                cur.execute(
-                    "DELETE FROM reviews WHERE product_id IN (SELECT id FROM products WHERE category_id = ANY(%s))",
-                    (categories_to_delete,),
-                )
-                cur.execute(
-                    "DELETE FROM inventory WHERE product_id IN (SELECT id FROM products WHERE category_id = ANY(%s))",
-                    (categories_to_delete,),
-                )
-                cur.execute(
-                    "DELETE FROM products WHERE category_id = ANY(%s)",
-                    (categories_to_delete,),
-                )
-
-        if warehouses_to_delete:
-            self.delete_by_foreign_key(
-                "inventory", "warehouse_id", warehouses_to_delete
-            )
-
-        if products_to_delete:
-            self.delete_by_foreign_key("order_items", "product_id", products_to_delete)
-            self.delete_by_foreign_key("reviews", "product_id", products_to_delete)
-            self.delete_by_foreign_key("inventory", "product_id", products_to_delete)
-
-        if orders_to_delete:
-            self.delete_by_foreign_key("payments", "order_id", orders_to_delete)
-            self.delete_by_foreign_key("order_items", "order_id", orders_to_delete)
-
-        self.delete_ids("orders", orders_to_delete)
-        self.delete_ids("products", products_to_delete)
-        self.delete_ids("warehouses", warehouses_to_delete)
-        self.delete_ids("categories", categories_to_delete)
-        self.delete_ids("users", users_to_delete)
-
-        self.delete_ids(
-            "order_items",
-            self.get_ids_to_trim("order_items", target_counts["order_items"]),
-        )
-        self.delete_ids(
-            "reviews", self.get_ids_to_trim("reviews", target_counts["reviews"])
-        )
-        self.delete_ids(
-            "inventory",
-            self.get_ids_to_trim("inventory", target_counts["inventory"]),
-        )
-        self.delete_ids(
-            "addresses",
-            self.get_ids_to_trim("addresses", target_counts["addresses"]),
-        )
-        self.delete_ids(
-            "payments",
-            self.get_ids_to_trim("payments", target_counts["payments"]),
-        )
-
-        users_missing = target_counts["users"] - self.get_table_count("users")
-        if users_missing > 0:
-            self.insert_users(generate_bulk_users(users_missing))
-
-        categories_missing = target_counts["categories"] - self.get_table_count(
-            "categories"
-        )
-        if categories_missing > 0:
-            existing_category_ids = self.get_existing_ids("categories")
-            categories = []
-            for _ in range(categories_missing):
-                parent_id = (
-                    random.choice(existing_category_ids)
-                    if existing_category_ids and random.random() > 0.7
-                    else None
-                )
-                category = generate_category(parent_id)
-                categories.append(category)
-            self.insert_categories(categories)
-
-        warehouses_missing = target_counts["warehouses"] - self.get_table_count(
-            "warehouses"
-        )
-        if warehouses_missing > 0:
-            self.insert_warehouses(
-                [generate_warehouse() for _ in range(warehouses_missing)]
-            )
-
-        user_ids = self.get_existing_ids("users")
-        category_ids = self.get_existing_ids("categories")
-        warehouse_ids = self.get_existing_ids("warehouses")
-        product_ids = self.get_existing_ids("products")
-        order_ids = self.get_existing_ids("orders")
-
-        products_missing = target_counts["products"] - self.get_table_count("products")
-        if products_missing > 0 and category_ids:
-            self.insert_products(generate_bulk_products(products_missing, category_ids))
-
-        user_ids = self.get_existing_ids("users")
-        product_ids = self.get_existing_ids("products")
-
-        orders_missing = target_counts["orders"] - self.get_table_count("orders")
-        if orders_missing > 0 and user_ids:
-            self.insert_orders(
-                [generate_order(random.choice(user_ids)) for _ in range(orders_missing)]
-            )
-
-        order_ids = self.get_existing_ids("orders")
+    def get_trim_bound(self, table_name, target_count):
+        with self.conn.cursor() as cur:
+            cur.execute(TRIM_BOUND.format(table=table_name), (target_count,))
+            row = cur.fetchone()
+            return row[0] if row else None
 
-        order_items_missing = target_counts["order_items"] - self.get_table_count(
-            "order_items"
-        )
-        if order_items_missing > 0 and order_ids and product_ids:
-            self.insert_order_items(
-                [
-                    generate_order_item(
-                        random.choice(order_ids),
-                        random.choice(product_ids),
-                    )
-                    for _ in range(order_items_missing)
-                ]
-            )
+    def get_key_range(self, table_name):
+        with self.conn.cursor() as cur:
+            cur.execute(KEY_RANGE.format(table=table_name))
+            return cur.fetchone()
 
-        reviews_missing = target_counts["reviews"] - self.get_table_count("reviews")
-        if reviews_missing > 0 and user_ids and product_ids:
-            self.insert_reviews(
-                [
-                    generate_review(
-                        random.choice(user_ids),
-                        random.choice(product_ids),
-                    )
-                    for _ in range(reviews_missing)
-                ]
-            )
+    def reconcile_starting_data(self, total_records):
+        target_counts = split_starting_data(total_records, self.dataset["weights"])
 
-        inventory_missing = target_counts["inventory"] - self.get_table_count(
-            "inventory"
-        )
-        if inventory_missing > 0 and product_ids and warehouse_ids:
-            self.insert_inventory(
-                [
-                    generate_inventory(
-                        random.choice(product_ids),
-                        random.choice(warehouse_ids),
-                    )
-                    for _ in range(inventory_missing)
-                ]
+        bounds = {
+            table: self.get_trim_bound(table, target_counts[table])
+            for table in TRIM_PARENT_TABLES
+        }
+        with self.conn.cursor() as cur:
+            for statement in TRIM_STATEMENTS:
+                cur.execute(statement, bounds)
+            for table in TRIM_CHILD_TABLES:
+                bound = self.get_trim_bound(table, target_counts[table])
+                if bound is not None:
+                    cur.execute(f"DELETE FROM {table} WHERE id >= %s", (bound,))
+
+        widths = parse_row_width(self.dataset["row_width"])
+        params = {
+            "reference_time": self.dataset["reference_time"] or datetime.now(),
+            "date_range_days": DATE_RANGE_DAYS,
+            "probe_stride": PROBE_STRIDE,
+            "tags": widths["products.tags"],
+            "attributes": widths["products.attributes"],
+            "comment": widths["reviews.comment"],
+        }
+        for table in STARTING_DATA_INSERT_ORDER:
+            missing = target_counts[table] - self.get_table_count(table)
+            if missing <= 0:
+                continue
+            key_ranges = {key: self.get_key_range(key) for key in TOP_UP_KEYS[table]}
+            if any(low is None for low, _ in key_ranges.values()):
+                continue
+            if table == "categories":
+                key_ranges["categories"] = self.get_key_range("categories")
+            for key, (low, high) in key_ranges.items():
+                params[f"{key}_lo"], params[f"{key}_hi"] = low, high
+            self.top_up_table(table, params, missing, target_counts[table])
+        self.save_dataset_key()
+
+    def top_up_table(self, table, params, missing, target, stream=RECONCILE_STREAM):
+        with self.conn.cursor() as cur:
+            if self.dataset["seed"] is not None:
+                seed = table_seed(self.dataset["seed"], table, stream)
+                cur.execute("SELECT setseed(%s)", (seed / 2**64,))
+            cur.execute(
+                TOP_UP_INSERTS[table], {**params, "missing": missing, "target": target}
             )
+            reset_sequence(cur, table)
 
-        addresses_missing = target_counts["addresses"] - self.get_table_count(
-            "addresses"
-        )
-        if addresses_missing > 0 and user_ids:
-            self.insert_addresses(
-                [
-                    generate_address(random.choice(user_ids))
-                    for _ in range(addresses_missing)
-                ]
-            )
+    def insert_starting_chunk(self, table, chunk):
+        if not chunk:
+            return
+        if self.dataset["generator"] != "columnar":
+            getattr(self, f"insert_{table}")(chunk)
+            return
 
-        payments_missing = target_counts["payments"] - self.get_table_count("payments")
-        if payments_missing > 0 and order_ids:
-            self.insert_payments(
-                [
-                    generate_payment(random.choice(order_ids))
-                    for _ in range(payments_missing)
-                ]
+        fields = STARTING_DATA_FIELDS[table]
+        with self.conn.cursor() as cur:
+            execute_values(
+                cur,
+                f"INSERT INTO {table} ({', '.join(fields)}) VALUES %s",
+                chunk.rows(fields),
             )
 
-    def populate_starting_data(self, total_records):
-        counts = split_starting_data(total_records)
-
-        users = generate_bulk_users(counts["users"])
-        users_data = [
-            (u["name"], u["email"], u["created_at"], json.dumps(u["preferences"]))
-            for u in users
-        ]
-
-        categories = generate_bulk_categories(counts["categories"])
-        categories_data = [(c["name"], c["parent_id"]) for c in categories]
-
-        warehouses = generate_bulk_warehouses(counts["warehouses"])
-        warehouses_data = [(w["name"], w["location"]) for w in warehouses]
-
-        category_ids = list(range(1, counts["categories"] + 1))
-        products = generate_bulk_products(counts["products"], category_ids)
-        products_data = [
-            (p["name"], p["price"], p["category_id"], json.dumps(p["attributes"]))
-            for p in products
-        ]
-
-        orders = generate_bulk_orders(counts["orders"], counts["users"])
-        orders_data = [
-            (o["user_id"], o["status"], o["total"], o["created_at"]) for o in orders
-        ]
-
-        order_items = generate_bulk_order_items(
-            counts["order_items"], counts["orders"], counts["products"]
-        )
-        order_items_data = [
-            (oi["order_id"], oi["product_id"], oi["quantity"], oi["price"])
-            for oi in order_items
-        ]
-
-        reviews = generate_bulk_reviews(
-            counts["reviews"], counts["users"], counts["products"]
+    def populate_starting_data(self, total_records, strategy=None):
+        strategy = strategy or self.dataset["load_strategy"]
+        connections = self.dataset["load_connections"]
+        if connections > 1:
+            with self.conn.cursor() as cur:
+                parallel_load(
+                    self.open_connection,
+                    cur,
+                    total_records,
+                    self.dataset,
+                    strategy,
+                    connections,
+                )
+        else:
+            chunks = iter_starting_chunks(total_records, self.dataset)
+            if strategy == "values":
+                for table, _, chunk in chunks:
+                    self.insert_starting_chunk(table, chunk)
+            else:
+                with self.conn.cursor() as cur:
+                    copy_starting_chunks(cur, chunks, strategy)
+        self.save_dataset_key()
+
+    def load_native_export(self, directory, fmt):
+        options = "FORMAT binary" if fmt == "pg_binary" else "FORMAT text"
+        commands = []
+        for table, path in export_paths(directory, fmt).items():
+            fields = ", ".join(STARTING_DATA_FIELDS[table])
+            commands += ["-c", f"\\copy {table} ({fields}) FROM '{path}' ({options})"]
+        run_native_tool(
+            [
+                native_tool(fmt),
+                "-X",
+                "-q",
+                "-v",
+                "ON_ERROR_STOP=1",
+                "-h",
+                self.config["host"],
+                "-p",
+                str(self.config["port"]),
+                "-U",
+                self.config["user"],
+                "-d",
+                self.config["database"],
+                *commands,
+            ],
+            env={"PGPASSWORD": self.config["password"]},
         )
-        reviews_data = [
-            (
-                r["user_id"],
-                r["product_id"],
-                r["rating"],
-                r["comment"],
-                json.dumps(r["metadata"]),
-            )
-            for r in reviews
-        ]
 
-        inventory = generate_bulk_inventory(
-            counts["inventory"], counts["products"], counts["warehouses"]
-        )
-        inventory_data = [
-            (i["product_id"], i["warehouse_id"], i["quantity"]) for i in inventory
-        ]
+    def run_load_benchmark(self, size, trial=1):
+        for strategy in LOAD_STRATEGIES:
+            self.setup_schema(create_indexes=False)
+            lsn = self.current_wal_lsn()
+            start = time.time()
+            self.populate_starting_data(size, strategy)
+            elapsed = time.time() - start
+            wal_bytes = self.wal_bytes_since(lsn)
+            rows_per_s = size / elapsed if elapsed > 0 else 0.0
+            save_result(
+                "postgres",
+                f"populate_{strategy}",
+                size,
+                elapsed * 1000,
+                size,
+                trial=trial,
+                details={
+                    "rows_per_s": round(rows_per_s, 1),
+                    "connections": self.dataset["load_connections"],
+                    "wal_bytes": wal_bytes,
+                },
+            )
+            print(f"populate_{strategy}: {size:,} rows, {rows_per_s:,.0f} rows/s")
+
+        for fmt in NATIVE_LOAD_FORMATS["postgres"]:
+            operation = f"native_load_{fmt}"
+            if not native_tool(fmt):
+                print(f"Skipping {operation}: {NATIVE_LOAD_TOOLS[fmt]} not found")
+                save_result(
+                    "postgres", operation, size, None, size, trial, "unsupported"
+                )
+                continue
+            directory = export_starting_data(size, self.dataset, fmt)
+            self.setup_schema(create_indexes=False)
+            start = time.time()
+            self.load_native_export(os.path.abspath(directory), fmt)
+            elapsed = (time.time() - start) * 1000
+            save_result("postgres", operation, size, elapsed, size, trial=trial)
 
-        addresses = generate_bulk_addresses(counts["addresses"], counts["users"])
-        addresses_data = [
-            (
-                a["user_id"],
-                a["city"],
-                a["country"],
-                json.dumps(a["details"]),
-            )
-            for a in addresses
-        ]
+        if self.dataset["defer_constraints"] or self.dataset["unlogged"]:
+            self.load_starting_data(size, trial=trial)
 
-        payments = generate_bulk_payments(counts["payments"], counts["orders"])
-        payments_data = [
-            (p["order_id"], p["method"], p["amount"], json.dumps(p["data"]))
-            for p in payments
-        ]
+    def insert_append_batch(self, batch):
+        with self.conn.cursor() as cur:
+            for table, records in batch.items():
+                fields = ", ".join(["id", *STARTING_DATA_FIELDS[table]])
+                execute_values(
+                    cur,
+                    f"INSERT INTO {table} ({fields}) VALUES %s",
+                    append_rows(records, table),
+                )
 
+    def delete_appended_rows(self, start_ids):
         with self.conn.cursor() as cur:
-            execute_values(
-                cur,
-                "INSERT INTO users (name, email, created_at, preferences) VALUES %s",
-                users_data,
-            )
-            execute_values(
-                cur,
-                "INSERT INTO categories (name, parent_id) VALUES %s",
-                categories_data,
-            )
-            execute_values(
-                cur,
-                "INSERT INTO warehouses (name, location) VALUES %s",
-                warehouses_data,
-            )
-            execute_values(
-                cur,
-                "INSERT INTO products (name, price, category_id, attributes) VALUES %s",
-                products_data,
-            )
-            execute_values(
-                cur,
-                "INSERT INTO orders (user_id, status, total, created_at) VALUES %s",
-                orders_data,
-            )
-            execute_values(
-                cur,
-                "INSERT INTO order_items (order_id, product_id, quantity, price) VALUES %s",
-                order_items_data,
-            )
-            execute_values(
-                cur,
-                "INSERT INTO reviews (user_id, product_id, rating, comment, metadata) VALUES %s",
-                reviews_data,
-            )
-            execute_values(
-                cur,
-                "INSERT INTO inventory (product_id, warehouse_id, quantity) VALUES %s",
-                inventory_data,
-            )
-            execute_values(
-                cur,
-                "INSERT INTO addresses (user_id, city, country, details) VALUES %s",
-                addresses_data,
-            )
-            execute_values(
-                cur,
-                "INSERT INTO payments (order_id, method, amount, data) VALUES %s",
-                payments_data,
-            )
+            for table in reversed(APPEND_TABLES):
+                cur.execute(f"DELETE FROM {table} WHERE id > %s", (start_ids[table],))
+                reset_sequence(cur, table)
+
+    def run_ingest_benchmark(self, size, trial=1):
+        key_ranges = {table: self.get_key_range(table) for table in KEY_TABLES}
+        start_ids = {table: self.get_max_id(table) for table in APPEND_TABLES}
+        for phase in INGEST_PHASES:
+            if phase == "indexed":
+                self.ensure_indexes()
+            else:
+                self.drop_indexes()
+            run_ingest_phase(
+                "postgres",
+                phase,
+                size,
+                trial,
+                self.dataset,
+                key_ranges,
+                start_ids,
+                self.insert_append_batch,
+            )
+            self.delete_appended_rows(start_ids)
 
     def cleanup_benchmark_rows(self):
         with self.conn.cursor() as cur:
@@ -865,36 +928,104 @@ class PostgresBenchmark:
             cur.execute(f"DELETE FROM addresses WHERE user_id IN ({user_ids})")
 
     def ensure_addresses_volume(self, total_records):
-        target_addresses = split_starting_data(total_records)["addresses"]
-        with self.conn.cursor() as cur:
-            cur.execute("SELECT COUNT(*) FROM addresses")
-            current_addresses = cur.fetchone()[0]
-            if current_addresses >= target_addresses:
-                return
-
-            cur.execute("SELECT id FROM users")
-            user_ids = [row[0] for row in cur.fetchall()]
-            if not user_ids:
-                return
-
-            missing = target_addresses - current_addresses
-            address_rows = []
-            for _ in range(missing):
-                address = generate_address(random.choice(user_ids))
-                address_rows.append(
-                    (
-                        address["user_id"],
-                        address["city"],
-                        address["country"],
-                        json.dumps(address["details"]),
-                    )
-                )
+        target_addresses = split_starting_data(total_records, self.dataset["weights"])[
+            "addresses"
+        ]
+        missing = target_addresses - self.get_table_count("addresses")
+        if missing <= 0:
+            return
+        low, high = self.get_key_range("users")
+        if low is None:
+            return
+        params = {"users_lo": low, "users_hi": high}
+        self.top_up_table(
+            "addresses", params, missing, target_addresses, stream=TOP_UP_STREAM
+        )
 
-            execute_values(
-                cur,
-                "INSERT INTO addresses (user_id, city, country, details) VALUES %s",
-                address_rows,
-            )
+    def snapshot_server_stats(self):
+        with self.conn.cursor() as cur:
+            flush_server_stats(cur, self.stats_sources)
+        with self.stats_conn.cursor() as cur:
+            return snapshot_server_stats(cur, self.stats_sources)
+
+    def server_stats_since(self, before):
+        after = self.snapshot_server_stats()
+        return server_stats_delta(before, after, self.stats_baseline)
+
+    def measure_stats_baseline(self):
+        before = self.snapshot_server_stats()
+        deltas = []
+        for _ in range(BASELINE_SAMPLES):
+            after = self.snapshot_server_stats()
+            deltas.append(server_stats_delta(before, after))
+            before = after
+        return server_stats_baseline(deltas)
+
+    def prepare_statement(self, cur, name, query, params):
+        execute = f"EXECUTE {name}"
+        if params:
+            execute += f" ({', '.join(['%s'] * len(params))})"
+        if name not in self.prepared_statements:
+            cur.execute(f"PREPARE {name} AS {numbered_placeholders(query)}")
+            self.prepared_statements.add(name)
+            # builds and caches the generic plan outside the timed call
+            cur.execute(f"EXPLAIN {execute}", params)
+        return execute
+
+    def timed_execute(self, name, query, params, fetch=False):
+        prepared = self.dataset["statement_mode"] == "prepared"
+        with self.conn.cursor() as cur:
+            if prepared:
+                # generic plans only for the prepared statements, the rest of
+                # the session keeps the default plan_cache_mode
+                cur.execute("SET plan_cache_mode = force_generic_plan")
+                query = self.prepare_statement(cur, name, query, params)
+            before = self.snapshot_server_stats()
+            start = time.time()
+            cur.execute(query, params)
+            if fetch:
+                cur.fetchall()
+            elapsed = (time.time() - start) * 1000
+            details = self.server_stats_since(before)
+            if prepared:
+                cur.execute("RESET plan_cache_mode")
+        return elapsed, details
+
+    def timed_stream(self, name, query, params):
+        itersize = self.dataset["itersize"]
+        before = self.snapshot_server_stats()
+        baseline = peak = current_rss_bytes()
+        self.conn.autocommit = False
+        try:
+            with self.conn.cursor(name=f"stream_{name}") as cur:
+                cur.itersize = itersize
+                start = time.time()
+                cur.execute(query, params)
+                rows = 0
+                first_row = None
+                for _ in cur:
+                    if first_row is None:
+                        first_row = time.time() - start
+                    rows += 1
+                    if rows % itersize == 1:
+                        peak = max(peak, current_rss_bytes())
+                elapsed = time.time() - start
+        finally:
+            self.conn.rollback()
+            self.conn.autocommit = True
+
+        first_row = elapsed if first_row is None else first_row
+        steady = elapsed - first_row
+        details = {
+            "fetch_mode": "stream",
+            "itersize": itersize,
+            "rows": rows,
+            "first_row_ms": round(first_row * 1000, 2),
+            "rows_per_s": round((rows - 1) / steady, 1) if rows > 1 and steady else 0.0,
+            "peak_rss_delta_bytes": peak - baseline,
+            **self.server_stats_since(before),
+        }
+        return elapsed * 1000, details
 
     def run_nonindexed_queries(self, size, trial=1):
         self.cleanup_benchmark_rows()
@@ -903,13 +1034,13 @@ class PostgresBenchmark:
         for name, q in NONINDEXED_QUERIES.items():
             params = q["params"]()
             if name == "insert_bulk":
-                users = generate_bulk_users(1000)
+                users = generate_bulk_users(1000, ctx=self.generator_context)
                 data = [
                     (
                         u["name"],
                         u["email"],
                         u["created_at"],
-                        json.dumps(u["preferences"]),
+                        pooled_json("users", "preferences", u["preferences"]),
                     )
                     for u in users
                 ]
@@ -917,30 +1048,25 @@ class PostgresBenchmark:
                 flat_data = []
                 for u in data:
                     flat_data.extend(u)
-                start = time.time()
-                with self.conn.cursor() as cur:
-                    cur.execute(query, flat_data)
-                elapsed = (time.time() - start) * 1000
+                elapsed, details = self.timed_execute(name, query, flat_data)
             elif name == "insert_many":
                 cats = [(f"cat{i}",) for i in range(100)]
                 query = q["query"] + "(%s)" + ",(%s)" * 99
                 flat_data = []
                 for c in cats:
                     flat_data.extend(c)
-                start = time.time()
-                with self.conn.cursor() as cur:
-                    cur.execute(query, flat_data)
-                elapsed = (time.time() - start) * 1000
+                elapsed, details = self.timed_execute(name, query, flat_data)
+            elif self.dataset["fetch_mode"] == "stream" and returns_rows(name):
+                elapsed, details = self.timed_stream(name, q["query"], params)
             else:
-                start = time.time()
-                with self.conn.cursor() as cur:
-                    cur.execute(q["query"], params)
-                    if name.startswith("select"):
-                        cur.fetchall()
-                elapsed = (time.time() - start) * 1000
+                elapsed, details = self.timed_execute(
+                    name, q["query"], params, fetch=returns_rows(name)
+                )
 
             results[name] = elapsed
-            save_result("postgres", name, size, elapsed, size, trial=trial)
+            save_result(
+                "postgres", name, size, elapsed, size, trial=trial, details=details
+            )
         self.ensure_addresses_volume(size)
         return results
 
@@ -951,13 +1077,13 @@ class PostgresBenchmark:
         for name, q in INDEXED_QUERIES.items():
             params = q["params"]()
             if name == "index_insert_bulk":
-                users = generate_bulk_users(1000)
+                users = generate_bulk_users(1000, ctx=self.generator_context)
                 data = [
                     (
                         u["name"],
                         u["email"],
                         u["created_at"],
-                        json.dumps(u["preferences"]),
+                        pooled_json("users", "preferences", u["preferences"]),
                     )
                     for u in users
                 ]
@@ -965,10 +1091,7 @@ class PostgresBenchmark:
                 flat_data = []
                 for u in data:
                     flat_data.extend(u)
-                start = time.time()
-                with self.conn.cursor() as cur:
-                    cur.execute(query, flat_data)
-                elapsed = (time.time() - start) * 1000
+                elapsed, details = self.timed_execute(name, query, flat_data)
             elif name == "index_insert_many":
                 prods = [
                     (f"product{i}", 10.0, 1, '{"color": "red"}') for i in range(100)
@@ -977,64 +1100,85 @@ class PostgresBenchmark:
                 flat_data = []
                 for p in prods:
                     flat_data.extend(p)
-                start = time.time()
-                with self.conn.cursor() as cur:
-                    cur.execute(query, flat_data)
-                elapsed = (time.time() - start) * 1000
+                elapsed, details = self.timed_execute(name, query, flat_data)
+            elif self.dataset["fetch_mode"] == "stream" and returns_rows(name):
+                elapsed, details = self.timed_stream(name, q["query"], params)
             else:
-                start = time.time()
-                with self.conn.cursor() as cur:
-                    cur.execute(q["query"], params)
-                    if name.startswith("select"):
-                        cur.fetchall()
-                elapsed = (time.time() - start) * 1000
+                elapsed, details = self.timed_execute(
+                    name, q["query"], params, fetch=returns_rows(name)
+                )
             results[name] = elapsed
-            save_result("postgres", name, size, elapsed, size, trial=trial)
+            save_result(
+                "postgres", name, size, elapsed, size, trial=trial, details=details
+            )
         self.ensure_addresses_volume(size)
         return results
 
-    def run_explain_queries(self, trial=1):
+    def run_explain_queries(self, size, trial=1):
         for name, q in EXPLAIN_QUERIES.items():
             params = q["params"]()
-            start = time.time()
-            with self.conn.cursor() as cur:
-                cur.execute(q["query"], params)
-                plan = cur.fetchall()
-            elapsed = (time.time() - start) * 1000
-            plan_text = "\n".join([str(row) for row in plan])
+            self.conn.autocommit = False
+            try:
+                start = time.time()
+                with self.conn.cursor() as cur:
+                    cur.execute(q["query"], params)
+                    plan = cur.fetchall()
+                elapsed = (time.time() - start) * 1000
+            except psycopg2.Error as e:
+                save_explain_result(
+                    "postgres", name, str(e).strip(), None, trial=trial, status="error"
+                )
+                continue
+            finally:
+                self.conn.rollback()
+                self.conn.autocommit = True
+            nodes = parse_pg_plan(plan)
+            plan_text = json.dumps(plan[0][0])
             save_explain_result("postgres", name, plan_text, elapsed, trial=trial)
+            save_plan_nodes("postgres", name, size, nodes, trial=trial)
         return True
 
     def run_json_queries(self, size, trial=1):
         results = {}
         for name, q in JSON_QUERIES.items():
             params = q["params"]()
+            before = self.snapshot_server_stats()
             start = time.time()
             with self.conn.cursor() as cur:
                 cur.execute(q["query"], params)
                 cur.fetchall()
             elapsed = (time.time() - start) * 1000
+            details = self.server_stats_since(before)
             results[name] = elapsed
-            save_result("postgres", f"json_{name}", size, elapsed, size, trial=trial)
+            save_result(
+                "postgres",
+                f"json_{name}",
+                size,
+                elapsed,
+                size,
+                trial=trial,
+                details=details,
+            )
         return results
 
 
-def run_postgres_benchmark(size, operation_type="all", trial=1):
-    bench = PostgresBenchmark()
+def run_postgres_benchmark(size, operation_type="all", trial=1, dataset=None):
+    bench = PostgresBenchmark(dataset=dataset)
+    set_probe_catalog(build_probe_catalog(size, bench.dataset))
     bench.connect()
 
     try:
         if operation_type in ["all", "nonindexed"]:
             if bench.get_total_record_count() is None:
-                bench.setup_schema(create_indexes=False)
-                bench.populate_starting_data(size)
+                bench.load_starting_data(size, create_indexes=False, trial=trial)
             else:
                 needs_refresh, use_populate = bench.needs_starting_data_refresh(size)
                 if needs_refresh:
                     bench.drop_indexes()
                     if use_populate:
-                        bench.setup_schema(create_indexes=False)
-                        bench.populate_starting_data(size)
+                        bench.load_starting_data(
+                            size, create_indexes=False, trial=trial
+                        )
                     else:
                         bench.reconcile_starting_data(size)
                 else:
@@ -1043,23 +1187,48 @@ def run_postgres_benchmark(size, operation_type="all", trial=1):
 
         if operation_type in ["all", "indexed"]:
             if bench.get_total_record_count() is None:
-                bench.setup_schema(create_indexes=True)
-                bench.populate_starting_data(size)
+                bench.load_starting_data(size, create_indexes=True, trial=trial)
             else:
                 needs_refresh, use_populate = bench.needs_starting_data_refresh(size)
                 if needs_refresh:
                     bench.ensure_indexes()
                     if use_populate:
-                        bench.setup_schema(create_indexes=True)
-                        bench.populate_starting_data(size)
+                        bench.load_starting_data(size, create_indexes=True, trial=trial)
                     else:
                         bench.reconcile_starting_data(size)
                 else:
                     bench.ensure_indexes()
             bench.run_indexed_queries(size, trial=trial)
 
+        if operation_type in ["load"]:
+            bench.run_load_benchmark(size, trial=trial)
+
+        if operation_type in ["ingest"]:
+            if bench.get_total_record_count() is None:
+                bench.load_starting_data(size, create_indexes=True, trial=trial)
+            else:
+                needs_refresh, use_populate = bench.needs_starting_data_refresh(size)
+                if needs_refresh:
+                    if use_populate:
+                        bench.load_starting_data(size, create_indexes=True, trial=trial)
+                    else:
+                        bench.reconcile_starting_data(size)
+            bench.run_ingest_benchmark(size, trial=trial)
+
         if operation_type in ["explain"]:
-            bench.run_explain_queries(trial=trial)
+            if bench.get_total_record_count() is None:
+                bench.load_starting_data(size, create_indexes=True, trial=trial)
+            else:
+                needs_refresh, use_populate = bench.needs_starting_data_refresh(size)
+                if needs_refresh:
+                    bench.ensure_indexes()
+                    if use_populate:
+                        bench.load_starting_data(size, create_indexes=True, trial=trial)
+                    else:
+                        bench.reconcile_starting_data(size)
+                else:
+                    bench.ensure_indexes()
+            bench.run_explain_queries(size, trial=trial)
 
         if operation_type in ["all", "json"]:
             bench.run_json_queries(size, trial=trial)
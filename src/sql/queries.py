@@ -1,3 +1,5 @@
+from src.utils.probes import draw_probe_date, draw_probe_email, draw_probe_id
+
 NONINDEXED_QUERIES = {
     # CREATE - 6 queries
     "insert_single": {
@@ -50,7 +52,7 @@ NONINDEXED_QUERIES = {
     # READ - 6 queries
     "select_single": {
         "query": "SELECT * FROM users WHERE id = %s",
-        "params": lambda: (1,),
+        "params": lambda: (draw_probe_id(),),
     },
     "select_where": {
         "query": "SELECT * FROM users WHERE email LIKE %s",
@@ -177,18 +179,18 @@ INDEXED_QUERIES = {
     # READ - 6 queries (using indexed fields: email, category_id, price, user_id, status, created_at)
     "index_select_single": {
         "query": "SELECT * FROM users WHERE email = %s",
-        "params": lambda: ("user1000@example.com",),
+        "params": lambda: (draw_probe_email(),),
     },
     "index_select_where": {
         "query": "SELECT * FROM users WHERE created_at >= %s",
-        "params": lambda: ("2024-01-01",),
+        "params": lambda: (draw_probe_date(as_text=True),),
     },
     "index_select_join": {
         "query": """SELECT o.id, u.name, o.total, o.status 
                     FROM orders o 
                     JOIN users u ON o.user_id = u.id 
                     WHERE u.created_at >= %s""",
-        "params": lambda: ("2024-01-01",),
+        "params": lambda: (draw_probe_date(as_text=True),),
     },
     "index_select_aggregate": {
         "query": "SELECT COUNT(*), SUM(total), AVG(total) FROM orders WHERE user_id = %s",
@@ -205,7 +207,7 @@ INDEXED_QUERIES = {
     # UPDATE - 6 queries (using indexed fields)
     "index_update_single": {
         "query": "UPDATE users SET name = %s WHERE email = %s",
-        "params": lambda: ("updated_email_user", "user1@example.com"),
+        "params": lambda: ("updated_email_user", draw_probe_email()),
     },
     "index_update_many": {
         "query": "UPDATE products SET price = price * %s WHERE category_id = %s",
@@ -256,7 +258,8 @@ INDEXED_QUERIES = {
 
 EXPLAIN_QUERIES = {
     "explain_insert": {
-        "query": "EXPLAIN INSERT INTO users (name, email, created_at, preferences) VALUES (%s, %s, %s, %s)",
+        "query": """EXPLAIN (FORMAT JSON)
+                    INSERT INTO users (name, email, created_at, preferences) VALUES (%s, %s, %s, %s)""",
         "params": lambda: (
             "explain_user",
             "explain@example.com",
@@ -265,71 +268,85 @@ EXPLAIN_QUERIES = {
         ),
     },
     "explain_select": {
-        "query": "EXPLAIN ANALYZE SELECT * FROM users WHERE email = %s",
-        "params": lambda: ("user1000@example.com",),
+        "query": """EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)
+                    SELECT * FROM users WHERE email = %s""",
+        "params": lambda: (draw_probe_email(),),
     },
     "explain_select_where": {
-        "query": "EXPLAIN ANALYZE SELECT * FROM users WHERE created_at >= %s",
-        "params": lambda: ("2024-01-01",),
+        "query": """EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)
+                    SELECT * FROM users WHERE created_at >= %s""",
+        "params": lambda: (draw_probe_date(as_text=True),),
     },
     "explain_select_join": {
-        "query": """EXPLAIN ANALYZE 
+        "query": """EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)
                     SELECT o.id, u.name, o.total, o.status 
                     FROM orders o 
                     JOIN users u ON o.user_id = u.id 
                     WHERE u.created_at >= %s""",
-        "params": lambda: ("2024-01-01",),
+        "params": lambda: (draw_probe_date(as_text=True),),
     },
     "explain_select_aggregate": {
-        "query": "EXPLAIN ANALYZE SELECT COUNT(*), SUM(total), AVG(total) FROM orders WHERE user_id = %s",
+        "query": """EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)
+                    SELECT COUNT(*), SUM(total), AVG(total) FROM orders WHERE user_id = %s""",
         "params": lambda: (1,),
     },
     "explain_select_pagination": {
-        "query": "EXPLAIN ANALYZE SELECT * FROM orders ORDER BY created_at DESC LIMIT %s OFFSET %s",
+        "query": """EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)
+                    SELECT * FROM orders ORDER BY created_at DESC LIMIT %s OFFSET %s""",
         "params": lambda: (10, 0),
     },
     "explain_select_distinct": {
-        "query": "EXPLAIN ANALYZE SELECT DISTINCT status FROM orders",
+        "query": """EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)
+                    SELECT DISTINCT status FROM orders""",
         "params": lambda: (),
     },
     "explain_update": {
-        "query": "EXPLAIN ANALYZE UPDATE users SET name = %s WHERE email = %s",
-        "params": lambda: ("updated_email_user", "user1@example.com"),
+        "query": """EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)
+                    UPDATE users SET name = %s WHERE email = %s""",
+        "params": lambda: ("updated_email_user", draw_probe_email()),
     },
     "explain_update_many": {
-        "query": "EXPLAIN ANALYZE UPDATE products SET price = price * %s WHERE category_id = %s",
+        "query": """EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)
+                    UPDATE products SET price = price * %s WHERE category_id = %s""",
         "params": lambda: (1.1, 1),
     },
     "explain_update_in": {
-        "query": "EXPLAIN ANALYZE UPDATE products SET price = %s WHERE category_id IN (%s, %s, %s)",
+        "query": """EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)
+                    UPDATE products SET price = %s WHERE category_id IN (%s, %s, %s)""",
         "params": lambda: (9.99, 1, 2, 3),
     },
     "explain_delete": {
-        "query": "EXPLAIN ANALYZE DELETE FROM users WHERE email = %s",
+        "query": """EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)
+                    DELETE FROM users WHERE email = %s""",
         "params": lambda: ("delete@example.com",),
     },
     "explain_delete_many": {
-        "query": "EXPLAIN ANALYZE DELETE FROM users WHERE created_at < %s",
+        "query": """EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)
+                    DELETE FROM users WHERE created_at < %s""",
         "params": lambda: ("2020-01-01",),
     },
     "explain_delete_in": {
-        "query": "EXPLAIN ANALYZE DELETE FROM products WHERE category_id IN (%s, %s)",
+        "query": """EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)
+                    DELETE FROM products WHERE category_id IN (%s, %s)""",
         "params": lambda: (100, 101),
     },
     "explain_delete_cascade": {
-        "query": "EXPLAIN ANALYZE DELETE FROM orders WHERE user_id = %s",
+        "query": """EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)
+                    DELETE FROM orders WHERE user_id = %s""",
         "params": lambda: (1,),
     },
     "explain_indexed_select": {
-        "query": "EXPLAIN ANALYZE SELECT * FROM products WHERE category_id = %s",
+        "query": """EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)
+                    SELECT * FROM products WHERE category_id = %s""",
         "params": lambda: (1,),
     },
     "explain_indexed_range": {
-        "query": "EXPLAIN ANALYZE SELECT * FROM products WHERE price BETWEEN %s AND %s",
+        "query": """EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)
+                    SELECT * FROM products WHERE price BETWEEN %s AND %s""",
         "params": lambda: (100, 500),
     },
     "explain_complex_join": {
-        "query": """EXPLAIN ANALYZE 
+        "query": """EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)
                     SELECT u.name, COUNT(o.id) as order_count, SUM(o.total) as total_spent
                     FROM users u
                     LEFT JOIN orders o ON u.id = o.user_id
@@ -0,0 +1,344 @@
+TRIM_PARENT_TABLES = ["users", "categories", "warehouses", "products", "orders"]
+
+TRIM_CHILD_TABLES = ["order_items", "reviews", "inventory", "addresses", "payments"]
+
+TRIM_BOUND = "SELECT id FROM {table} ORDER BY id OFFSET %s LIMIT 1"
+
+TRIM_STATEMENTS = [
+    "UPDATE categories SET parent_id = NULL WHERE parent_id >= %(categories)s",
+    """
+    DELETE FROM payments
+    WHERE order_id >= %(orders)s
+        OR order_id IN (SELECT id FROM orders WHERE user_id >= %(users)s)
+    """,
+    """
+    DELETE FROM order_items
+    WHERE order_id >= %(orders)s
+        OR order_id IN (SELECT id FROM orders WHERE user_id >= %(users)s)
+        OR product_id >= %(products)s
+        OR product_id IN (SELECT id FROM products WHERE category_id >= %(categories)s)
+    """,
+    """
+    DELETE FROM reviews
+    WHERE user_id >= %(users)s
+        OR product_id >= %(products)s
+        OR product_id IN (SELECT id FROM products WHERE category_id >= %(categories)s)
+    """,
+    """
+    DELETE FROM inventory
+    WHERE warehouse_id >= %(warehouses)s
+        OR product_id >= %(products)s
+        OR product_id IN (SELECT id FROM products WHERE category_id >= %(categories)s)
+    """,
+    "DELETE FROM addresses WHERE user_id >= %(users)s",
+    "DELETE FROM orders WHERE id >= %(orders)s OR user_id >= %(users)s",
+    "DELETE FROM products WHERE id >= %(products)s OR category_id >= %(categories)s",
+    "DELETE FROM warehouses WHERE id >= %(warehouses)s",
+    "DELETE FROM categories WHERE id >= %(categories)s",
+    "DELETE FROM users WHERE id >= %(users)s",
+]
+
+KEY_RANGE = "SELECT MIN(id), MAX(id) FROM {table}"
+
+TOP_UP_KEYS = {
+    "users": [],
+    "categories": [],
+    "warehouses": [],
+    "products": ["categories"],
+    "orders": ["users"],
+    "order_items": ["orders", "products"],
+    "reviews": ["users", "products"],
+    "inventory": ["products", "warehouses"],
+    "addresses": ["users"],
+    "payments": ["orders"],
+}
+
+TOP_UP_INSERTS = {
+    "users": """
+    INSERT INTO users (id, name, email, created_at, preferences)
+    SELECT
+        id,
+        left(md5(random()::text), 20),
+        CASE
+            WHEN mod(id - 1, %(probe_stride)s) = 0 THEN 'user' || id || '@example.com'
+            ELSE left(md5(random()::text), 8) || id || '@'
+                || left(md5(random()::text), 5) || '.com'
+        END,
+        %(reference_time)s::timestamp
+            - make_interval(days => floor(random() * (%(date_range_days)s + 1))::int),
+        jsonb_build_object(
+            'theme', (ARRAY['light', 'dark'])[1 + floor(random() * 2)::int],
+            'notifications', random() < 0.5,
+            'language', (ARRAY['en', 'pl', 'de'])[1 + floor(random() * 3)::int]
+        )
+    FROM (
+        SELECT g AS id
+        FROM generate_series(1, %(target)s + %(missing)s) AS g
+        WHERE NOT EXISTS (SELECT 1 FROM users t WHERE t.id = g)
+        ORDER BY g
+        LIMIT %(missing)s
+    ) AS new_rows
+    """,
+    "categories": """
+    INSERT INTO categories (id, name, parent_id)
+    SELECT
+        id,
+        left(md5(random()::text), 15),
+        CASE WHEN parent_roll > 0.7 THEN (
+            SELECT c.id FROM categories c
+            WHERE c.id >= parent_key ORDER BY c.id LIMIT 1
+        ) END
+    FROM (
+        SELECT
+            id,
+            random() AS parent_roll,
+            %(categories_lo)s
+                + floor(random() * (%(categories_hi)s - %(categories_lo)s + 1))::int
+                AS parent_key
+        FROM (
+            SELECT g AS id
+            FROM generate_series(1, %(target)s + %(missing)s) AS g
+            WHERE NOT EXISTS (SELECT 1 FROM categories t WHERE t.id = g)
+            ORDER BY g
+            LIMIT %(missing)s
+        ) AS free_ids
+    ) AS new_rows
+    """,
+    "warehouses": """
+    INSERT INTO warehouses (id, name, location)
+    SELECT id, left(md5(random()::text), 15), left(md5(random()::text), 20)
+    FROM (
+        SELECT g AS id
+        FROM generate_series(1, %(target)s + %(missing)s) AS g
+        WHERE NOT EXISTS (SELECT 1 FROM warehouses t WHERE t.id = g)
+        ORDER BY g
+        LIMIT %(missing)s
+    ) AS new_rows
+    """,
+    "products": """
+    INSERT INTO products (id, name, price, category_id, attributes)
+    SELECT
+        id,
+        left(md5(random()::text) || md5(random()::text), 30),
+        round((10 + random() * 990)::numeric, 2),
+        (
+            SELECT c.id FROM categories c
+            WHERE c.id >= category_key ORDER BY c.id LIMIT 1
+        ),
+        jsonb_build_object(
+            'color',
+            (ARRAY['red', 'blue', 'green', 'black', 'white'])[
+                1 + floor(random() * 5)::int
+            ],
+            'weight', 1 + floor(random() * 100)::int,
+            'tags', COALESCE(
+                (
+                    SELECT jsonb_agg(left(md5(random()::text), 5))
+                    FROM generate_series(1, %(tags)s)
+                    WHERE id IS NOT NULL
+                ),
+                '[]'
+            )
+        ) || COALESCE(
+            (
+                SELECT jsonb_object_agg(
+                    'attr_' || (n - 1), left(md5(random()::text), 10)
+                )
+                FROM generate_series(1, %(attributes)s) AS n
+                WHERE id IS NOT NULL
+            ),
+            '{}'
+        )
+    FROM (
+        SELECT
+            id,
+            %(categories_lo)s
+                + floor(random() * (%(categories_hi)s - %(categories_lo)s + 1))::int
+                AS category_key
+        FROM (
+            SELECT g AS id
+            FROM generate_series(1, %(target)s + %(missing)s) AS g
+            WHERE NOT EXISTS (SELECT 1 FROM products t WHERE t.id = g)
+            ORDER BY g
+            LIMIT %(missing)s
+        ) AS free_ids
+    ) AS new_rows
+    """,
+    "orders": """
+    INSERT INTO orders (id, user_id, status, total, created_at)
+    SELECT
+        id,
+        (SELECT u.id FROM users u WHERE u.id >= user_key ORDER BY u.id LIMIT 1),
+        (ARRAY['pending', 'completed', 'cancelled'])[1 + floor(random() * 3)::int],
+        round((50 + random() * 4950)::numeric, 2),
+        %(reference_time)s::timestamp
+            - make_interval(days => floor(random() * (%(date_range_days)s + 1))::int)
+    FROM (
+        SELECT
+            id,
+            %(users_lo)s
+                + floor(random() * (%(users_hi)s - %(users_lo)s + 1))::int
+                AS user_key
+        FROM (
+            SELECT g AS id
+            FROM generate_series(1, %(target)s + %(missing)s) AS g
+            WHERE NOT EXISTS (SELECT 1 FROM orders t WHERE t.id = g)
+            ORDER BY g
+            LIMIT %(missing)s
+        ) AS free_ids
+    ) AS new_rows
+    """,
+    "order_items": """
+    INSERT INTO order_items (id, order_id, product_id, quantity, price)
+    SELECT
+        id,
+        (SELECT o.id FROM orders o WHERE o.id >= order_key ORDER BY o.id LIMIT 1),
+        (
+            SELECT p.id FROM products p
+            WHERE p.id >= product_key ORDER BY p.id LIMIT 1
+        ),
+        1 + floor(random() * 10)::int,
+        round((10 + random() * 490)::numeric, 2)
+    FROM (
+        SELECT
+            id,
+            %(orders_lo)s
+                + floor(random() * (%(orders_hi)s - %(orders_lo)s + 1))::int
+                AS order_key,
+            %(products_lo)s
+                + floor(random() * (%(products_hi)s - %(products_lo)s + 1))::int
+                AS product_key
+        FROM (
+            SELECT g AS id
+            FROM generate_series(1, %(target)s + %(missing)s) AS g
+            WHERE NOT EXISTS (SELECT 1 FROM order_items t WHERE t.id = g)
+            ORDER BY g
+            LIMIT %(missing)s
+        ) AS free_ids
+    ) AS new_rows
+    """,
+    "reviews": """
+    INSERT INTO reviews (id, user_id, product_id, rating, comment, metadata)
+    SELECT
+        id,
+        (SELECT u.id FROM users u WHERE u.id >= user_key ORDER BY u.id LIMIT 1),
+        (
+            SELECT p.id FROM products p
+            WHERE p.id >= product_key ORDER BY p.id LIMIT 1
+        ),
+        1 + floor(random() * 5)::int,
+        COALESCE(
+            (
+                SELECT left(string_agg(md5(random()::text), ''), %(comment)s)
+                FROM generate_series(1, (%(comment)s + 31) / 32)
+                WHERE id IS NOT NULL
+            ),
+            ''
+        ),
+        jsonb_build_object(
+            'helpful', floor(random() * 51)::int,
+            'verified', random() < 0.5
+        )
+    FROM (
+        SELECT
+            id,
+            %(users_lo)s
+                + floor(random() * (%(users_hi)s - %(users_lo)s + 1))::int
+                AS user_key,
+            %(products_lo)s
+                + floor(random() * (%(products_hi)s - %(products_lo)s + 1))::int
+                AS product_key
+        FROM (
+            SELECT g AS id
+            FROM generate_series(1, %(target)s + %(missing)s) AS g
+            WHERE NOT EXISTS (SELECT 1 FROM reviews t WHERE t.id = g)
+            ORDER BY g
+            LIMIT %(missing)s
+        ) AS free_ids
+    ) AS new_rows
+    """,
+    "inventory": """
+    INSERT INTO inventory (id, product_id, warehouse_id, quantity)
+    SELECT
+        id,
+        (
+            SELECT p.id FROM products p
+            WHERE p.id >= product_key ORDER BY p.id LIMIT 1
+        ),
+        (
+            SELECT w.id FROM warehouses w
+            WHERE w.id >= warehouse_key ORDER BY w.id LIMIT 1
+        ),
+        floor(random() * 1001)::int
+    FROM (
+        SELECT
+            id,
+            %(products_lo)s
+                + floor(random() * (%(products_hi)s - %(products_lo)s + 1))::int
+                AS product_key,
+            %(warehouses_lo)s
+                + floor(random() * (%(warehouses_hi)s - %(warehouses_lo)s + 1))::int
+                AS warehouse_key
+        FROM (
+            SELECT g AS id
+            FROM generate_series(1, %(target)s + %(missing)s) AS g
+            WHERE NOT EXISTS (SELECT 1 FROM inventory t WHERE t.id = g)
+            ORDER BY g
+            LIMIT %(missing)s
+        ) AS free_ids
+    ) AS new_rows
+    """,
+    "addresses": """
+    INSERT INTO addresses (id, user_id, city, country, details)
+    SELECT
+        id,
+        (SELECT u.id FROM users u WHERE u.id >= user_key ORDER BY u.id LIMIT 1),
+        left(md5(random()::text), 15),
+        left(md5(random()::text), 15),
+        jsonb_build_object(
+            'street', left(md5(random()::text), 20),
+            'zip', left(md5(random()::text), 6),
+            'phone', left(md5(random()::text), 10)
+        )
+    FROM (
+        SELECT
+            id,
+            %(users_lo)s
+                + floor(random() * (%(users_hi)s - %(users_lo)s + 1))::int
+                AS user_key
+        FROM (
+            SELECT g AS id
+            FROM generate_series(1, %(target)s + %(missing)s) AS g
+            WHERE NOT EXISTS (SELECT 1 FROM addresses t WHERE t.id = g)
+            ORDER BY g
+            LIMIT %(missing)s
+        ) AS free_ids
+    ) AS new_rows
+    """,
+    "payments": """
+    INSERT INTO payments (id, order_id, method, amount, data)
+    SELECT
+        id,
+        (SELECT o.id FROM orders o WHERE o.id >= order_key ORDER BY o.id LIMIT 1),
+        (ARRAY['card', 'cash', 'transfer'])[1 + floor(random() * 3)::int],
+        round((50 + random() * 4950)::numeric, 2),
+        jsonb_build_object(
+            'transaction_id', left(md5(random()::text), 20),
+            'processed', random() < 0.5
+        )
+    FROM (
+        SELECT
+            id,
+            %(orders_lo)s
+                + floor(random() * (%(orders_hi)s - %(orders_lo)s + 1))::int
+                AS order_key
+        FROM (
+            SELECT g AS id
+            FROM generate_series(1, %(target)s + %(missing)s) AS g
+            WHERE NOT EXISTS (SELECT 1 FROM payments t WHERE t.id = g)
+            ORDER BY g
+            LIMIT %(missing)s
+        ) AS free_ids
+    ) AS new_rows
+    """,
+}
@@ -1,4 +1,4 @@
-SCHEMA = """
+BARE_SCHEMA = """
 DROP TABLE IF EXISTS order_items CASCADE;
 DROP TABLE IF EXISTS reviews CASCADE;
 DROP TABLE IF EXISTS payments CASCADE;
@@ -11,76 +11,76 @@ DROP TABLE IF EXISTS warehouses CASCADE;
 DROP TABLE IF EXISTS users CASCADE;
 
 CREATE TABLE users (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     name VARCHAR(100) NOT NULL,
-    email VARCHAR(100) UNIQUE NOT NULL,
+    email VARCHAR(100) NOT NULL,
     created_at TIMESTAMP NOT NULL,
     preferences JSONB
 );
 
 CREATE TABLE categories (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     name VARCHAR(100) NOT NULL,
-    parent_id INTEGER REFERENCES categories(id)
+    parent_id INTEGER
 );
 
 CREATE TABLE products (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     name VARCHAR(200) NOT NULL,
     price DECIMAL(10,2) NOT NULL,
-    category_id INTEGER REFERENCES categories(id),
+    category_id INTEGER,
     attributes JSONB
 );
 
 CREATE TABLE orders (
-    id SERIAL PRIMARY KEY,
-    user_id INTEGER REFERENCES users(id),
+    id SERIAL,
+    user_id INTEGER,
     status VARCHAR(50) NOT NULL,
     total DECIMAL(10,2) NOT NULL,
     created_at TIMESTAMP NOT NULL
 );
 
 CREATE TABLE order_items (
-    id SERIAL PRIMARY KEY,
-    order_id INTEGER REFERENCES orders(id),
-    product_id INTEGER REFERENCES products(id),
+    id SERIAL,
+    order_id INTEGER,
+    product_id INTEGER,
     quantity INTEGER NOT NULL,
     price DECIMAL(10,2) NOT NULL
 );
 
 CREATE TABLE reviews (
-    id SERIAL PRIMARY KEY,
-    user_id INTEGER REFERENCES users(id),
-    product_id INTEGER REFERENCES products(id),
+    id SERIAL,
+    user_id INTEGER,
+    product_id INTEGER,
     rating INTEGER NOT NULL CHECK (rating >= 1 AND rating <= 5),
     comment TEXT,
     metadata JSONB
 );
 
 CREATE TABLE warehouses (
-    id SERIAL PRIMARY KEY,
+    id SERIAL,
     name VARCHAR(100) NOT NULL,
     location VARCHAR(200) NOT NULL
 );
 
 CREATE TABLE inventory (
-    id SERIAL PRIMARY KEY,
-    product_id INTEGER REFERENCES products(id),
-    warehouse_id INTEGER REFERENCES warehouses(id),
+    id SERIAL,
+    product_id INTEGER,
+    warehouse_id INTEGER,
     quantity INTEGER NOT NULL
 );
 
 CREATE TABLE addresses (
-    id SERIAL PRIMARY KEY,
-    user_id INTEGER REFERENCES users(id),
+    id SERIAL,
+    user_id INTEGER,
     city VARCHAR(100) NOT NULL,
     country VARCHAR(100) NOT NULL,
     details JSONB
 );
 
 CREATE TABLE payments (
-    id SERIAL PRIMARY KEY,
-    order_id INTEGER REFERENCES orders(id),
+    id SERIAL,
+    order_id INTEGER,
     method VARCHAR(50) NOT NULL,
     amount DECIMAL(10,2) NOT NULL,
     data JSONB
@@ -105,6 +105,81 @@ CREATE INDEX idx_addresses_user ON addresses(user_id);
 CREATE INDEX idx_payments_order ON payments(order_id);
 """
 
+INDEX_STATEMENTS = {
+    statement.split()[2]: statement
+    for statement in (part.strip() for part in INDEXES.split(";"))
+    if statement
+}
+
+KEY_CONSTRAINTS = {
+    "users_pkey": "ALTER TABLE users ADD PRIMARY KEY (id)",
+    "categories_pkey": "ALTER TABLE categories ADD PRIMARY KEY (id)",
+    "products_pkey": "ALTER TABLE products ADD PRIMARY KEY (id)",
+    "orders_pkey": "ALTER TABLE orders ADD PRIMARY KEY (id)",
+    "order_items_pkey": "ALTER TABLE order_items ADD PRIMARY KEY (id)",
+    "reviews_pkey": "ALTER TABLE reviews ADD PRIMARY KEY (id)",
+    "warehouses_pkey": "ALTER TABLE warehouses ADD PRIMARY KEY (id)",
+    "inventory_pkey": "ALTER TABLE inventory ADD PRIMARY KEY (id)",
+    "addresses_pkey": "ALTER TABLE addresses ADD PRIMARY KEY (id)",
+    "payments_pkey": "ALTER TABLE payments ADD PRIMARY KEY (id)",
+    "users_email_key": (
+        "ALTER TABLE users ADD CONSTRAINT users_email_key UNIQUE (email)"
+    ),
+}
+
+FOREIGN_KEYS = {
+    "categories_parent_id_fkey": (
+        "ALTER TABLE categories ADD CONSTRAINT categories_parent_id_fkey "
+        "FOREIGN KEY (parent_id) REFERENCES categories(id)"
+    ),
+    "products_category_id_fkey": (
+        "ALTER TABLE products ADD CONSTRAINT products_category_id_fkey "
+        "FOREIGN KEY (category_id) REFERENCES categories(id)"
+    ),
+    "orders_user_id_fkey": (
+        "ALTER TABLE orders ADD CONSTRAINT orders_user_id_fkey "
+        "FOREIGN KEY (user_id) REFERENCES users(id)"
+    ),
+    "order_items_order_id_fkey": (
+        "ALTER TABLE order_items ADD CONSTRAINT order_items_order_id_fkey "
+        "FOREIGN KEY (order_id) REFERENCES orders(id)"
+    ),
+    "order_items_product_id_fkey": (
+        "ALTER TABLE order_items ADD CONSTRAINT order_items_product_id_fkey "
+        "FOREIGN KEY (product_id) REFERENCES products(id)"
+    ),
+    "reviews_user_id_fkey": (
+        "ALTER TABLE reviews ADD CONSTRAINT reviews_user_id_fkey "
+        "FOREIGN KEY (user_id) REFERENCES users(id)"
+    ),
+    "reviews_product_id_fkey": (
+        "ALTER TABLE reviews ADD CONSTRAINT reviews_product_id_fkey "
+        "FOREIGN KEY (product_id) REFERENCES products(id)"
+    ),
+    "inventory_product_id_fkey": (
+        "ALTER TABLE inventory ADD CONSTRAINT inventory_product_id_fkey "
+        "FOREIGN KEY (product_id) REFERENCES products(id)"
+    ),
+    "inventory_warehouse_id_fkey": (
+        "ALTER TABLE inventory ADD CONSTRAINT inventory_warehouse_id_fkey "
+        "FOREIGN KEY (warehouse_id) REFERENCES warehouses(id)"
+    ),
+    "addresses_user_id_fkey": (
+        "ALTER TABLE addresses ADD CONSTRAINT addresses_user_id_fkey "
+        "FOREIGN KEY (user_id) REFERENCES users(id)"
+    ),
+    "payments_order_id_fkey": (
+        "ALTER TABLE payments ADD CONSTRAINT payments_order_id_fkey "
+        "FOREIGN KEY (order_id) REFERENCES orders(id)"
+    ),
+}
+
+SCHEMA = BARE_SCHEMA + "".join(
+    f"{statement};\n"
+    for statement in [*KEY_CONSTRAINTS.values(), *FOREIGN_KEYS.values()]
+)
+
+
 SQLITE_SCHEMA = """
 DROP TABLE IF EXISTS order_items;
 DROP TABLE IF EXISTS reviews;
@@ -211,3 +286,17 @@ CREATE INDEX idx_inventory_warehouse ON inventory(warehouse_id);
 CREATE INDEX idx_addresses_user ON addresses(user_id);
 CREATE INDEX idx_payments_order ON payments(order_id);
 """
+
+METADATA_SCHEMA = """
+CREATE TABLE IF NOT EXISTS benchmark_metadata (
+    name TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+)
+"""
+
+DATASET_KEY_UPSERT = """
+INSERT INTO benchmark_metadata (name, value) VALUES ('dataset', %s)
+ON CONFLICT (name) DO UPDATE SET value = excluded.value
+"""
+
+DATASET_KEY_QUERY = "SELECT value FROM benchmark_metadata WHERE name = 'dataset'"
@@ -0,0 +1,96 @@
+import psycopg2
+
+STATS_SOURCES_QUERY = """
+SELECT
+    EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_stat_statements'),
+    to_regclass('pg_catalog.pg_stat_io') IS NOT NULL,
+    to_regproc('pg_catalog.pg_stat_force_next_flush') IS NOT NULL
+"""
+
+FLUSH_STATS = "SELECT /* server_stats */ pg_stat_force_next_flush()"
+
+STATEMENTS_SNAPSHOT = """
+SELECT /* server_stats */
+    COALESCE(SUM(total_exec_time), 0),
+    COALESCE(SUM(total_plan_time), 0),
+    COALESCE(SUM(shared_blks_hit), 0),
+    COALESCE(SUM(shared_blks_read), 0),
+    COALESCE(SUM(temp_blks_written), 0)
+FROM pg_stat_statements
+WHERE dbid = (SELECT oid FROM pg_database WHERE datname = current_database())
+    AND query NOT LIKE '%server_stats%'
+"""
+
+DATABASE_SNAPSHOT = """
+SELECT /* server_stats */
+    blks_hit,
+    blks_read,
+    temp_bytes,
+    pg_wal_lsn_diff(pg_current_wal_lsn(), '0/0')
+FROM pg_stat_database
+WHERE datname = current_database()
+"""
+
+IO_SNAPSHOT = """
+SELECT /* server_stats */
+    COALESCE(SUM(hits), 0),
+    COALESCE(SUM(reads), 0),
+    COALESCE(SUM(writes), 0)
+FROM pg_stat_io
+"""
+
+STATEMENTS_FIELDS = [
+    "server_exec_ms",
+    "server_plan_ms",
+    "shared_blks_hit",
+    "shared_blks_read",
+    "temp_blks_written",
+]
+
+DATABASE_FIELDS = ["db_blks_hit", "db_blks_read", "db_temp_bytes", "wal_bytes"]
+
+IO_FIELDS = ["io_hits", "io_reads", "io_writes"]
+
+BASELINE_SAMPLES = 3
+
+
+def detect_stats_sources(cur):
+    cur.execute(STATS_SOURCES_QUERY)
+    statements, io, flush = cur.fetchone()
+    if statements:
+        try:
+            cur.execute(STATEMENTS_SNAPSHOT)
+        except psycopg2.Error:
+            statements = False
+    return {"statements": statements, "io": io, "flush": flush}
+
+
+def flush_server_stats(cur, sources):
+    if sources["flush"]:
+        cur.execute(FLUSH_STATS)
+
+
+def snapshot_server_stats(cur, sources):
+    snapshot = {}
+    for enabled, query, fields in [
+        (sources["statements"], STATEMENTS_SNAPSHOT, STATEMENTS_FIELDS),
+        (True, DATABASE_SNAPSHOT, DATABASE_FIELDS),
+        (sources["io"], IO_SNAPSHOT, IO_FIELDS),
+    ]:
+        if enabled:
+            cur.execute(query)
+            snapshot.update(zip(fields, (float(value) for value in cur.fetchone())))
+    return snapshot
+
+
+def server_stats_delta(before, after, baseline=None):
+    baseline = baseline or {}
+    delta = {}
+    for field, value in after.items():
+        change = max(0, value - before[field] - baseline.get(field, 0))
+        delta[field] = round(change, 3) if field.endswith("_ms") else int(change)
+    return delta
+
+
+def server_stats_baseline(deltas):
+    return {field: min(delta[field] for delta in deltas) for field in deltas[0]}
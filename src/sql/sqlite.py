@@ -1,33 +1,49 @@
 import json
-import random
+import os
 import sqlite3
 import time
 
 from src.config.connections import DATABASES
+from src.sql.plans import parse_sqlite_plan
 from src.sql.queries import (
     EXPLAIN_QUERIES,
     INDEXED_QUERIES,
     JSON_QUERIES,
     NONINDEXED_QUERIES,
 )
-from src.sql.schema import SQLITE_INDEXES, SQLITE_SCHEMA
+from src.sql.reconcile import KEY_RANGE
+from src.sql.schema import (
+    DATASET_KEY_QUERY,
+    DATASET_KEY_UPSERT,
+    METADATA_SCHEMA,
+    SQLITE_INDEXES,
+    SQLITE_SCHEMA,
+)
 from src.utils.benchmark_helpers import (
     DELETE_TARGET_CATEGORIES,
     DELETE_TARGET_IDS,
     needs_starting_data_refresh,
+    returns_rows,
+)
+from src.utils.dataset import iter_starting_chunks
+from src.utils.export import (
+    NATIVE_LOAD_FORMATS,
+    NATIVE_LOAD_TOOLS,
+    export_paths,
+    export_starting_data,
+    native_tool,
+    run_native_tool,
 )
 from src.utils.generator import (
+    APPEND_TABLES,
+    RECONCILE_STREAM,
+    STARTING_DATA_FIELDS,
+    TOP_UP_STREAM,
+    dataset_key,
+    dataset_options,
     generate_address,
-    generate_bulk_addresses,
-    generate_bulk_categories,
-    generate_bulk_inventory,
-    generate_bulk_order_items,
-    generate_bulk_orders,
-    generate_bulk_payments,
     generate_bulk_products,
-    generate_bulk_reviews,
     generate_bulk_users,
-    generate_bulk_warehouses,
     generate_category,
     generate_inventory,
     generate_order,
@@ -35,9 +51,22 @@ from src.utils.generator import (
     generate_payment,
     generate_review,
     generate_warehouse,
+    generator_context,
+    is_probe_id,
+    pooled_json,
+    probe_email,
     split_starting_data,
+    table_random,
+    table_randoms,
+)
+from src.utils.ingest import (
+    INGEST_PHASES,
+    KEY_TABLES,
+    append_rows,
+    run_ingest_phase,
 )
-from src.utils.results import save_explain_result, save_result
+from src.utils.probes import build_probe_catalog, set_probe_catalog
+from src.utils.results import save_explain_result, save_plan_nodes, save_result
 
 
 def to_sqlite_query(query):
@@ -45,12 +74,17 @@ def to_sqlite_query(query):
 
 
 class SQLiteBenchmark:
-    def __init__(self):
+    def __init__(self, dataset=None):
         self.config = DATABASES["sqlite"]
         self.conn = None
+        self.dataset = dataset_options(dataset)
+        self.generator_context = generator_context(self.dataset)
 
     def connect(self):
-        self.conn = sqlite3.connect(self.config["database"])
+        cached_statements = 128 if self.dataset["statement_mode"] == "prepared" else 0
+        self.conn = sqlite3.connect(
+            self.config["database"], cached_statements=cached_statements
+        )
         self.conn.row_factory = sqlite3.Row
 
     def close(self):
@@ -117,6 +151,24 @@ class SQLiteBenchmark:
     def needs_starting_data_refresh(self, target_size):
         return needs_starting_data_refresh(self, target_size)
 
+    def get_dataset_key(self):
+        cur = self.conn.cursor()
+        cur.execute(
+            "SELECT name from sqlite_master WHERE type='table' AND name=?",
+            ("benchmark_metadata",),
+        )
+        if cur.fetchone() is None:
+            return None
+        cur.execute(DATASET_KEY_QUERY)
+        row = cur.fetchone()
+        return row[0] if row else None
+
+    def save_dataset_key(self):
+        cur = self.conn.cursor()
+        cur.execute(METADATA_SCHEMA)
+        cur.execute(to_sqlite_query(DATASET_KEY_UPSERT), (dataset_key(self.dataset),))
+        self.conn.commit()
+
     def ensure_indexes(self):
         cur = self.conn.cursor()
         for stmt in SQLITE_INDEXES.split(";"):
@@ -172,7 +224,7 @@ class SQLiteBenchmark:
         self.conn.commit()
 
     def bulk_insert_users(self, count):
-        users = generate_bulk_users(count)
+        users = generate_bulk_users(count, ctx=self.generator_context)
         cur = self.conn.cursor()
         cur.executemany(
             "INSERT INTO users (name, email, created_at, preferences) VALUES (?, ?, ?, ?)",
@@ -181,7 +233,7 @@ class SQLiteBenchmark:
                     u["name"],
                     u["email"],
                     str(u["created_at"]),
-                    json.dumps(u["preferences"]),
+                    pooled_json("users", "preferences", u["preferences"]),
                 )
                 for u in users
             ],
@@ -198,6 +250,11 @@ class SQLiteBenchmark:
         cur.execute(f"SELECT id FROM {table_name} ORDER BY id")
         return [row[0] for row in cur.fetchall()]
 
+    def get_key_range(self, table_name):
+        cur = self.conn.cursor()
+        cur.execute(KEY_RANGE.format(table=table_name))
+        return cur.fetchone()
+
     def get_max_id(self, table_name):
         cur = self.conn.cursor()
         cur.execute(f"SELECT COALESCE(MAX(id), 0) FROM {table_name}")
@@ -247,7 +304,7 @@ class SQLiteBenchmark:
                     u["name"],
                     u["email"],
                     str(u["created_at"]),
-                    json.dumps(u["preferences"]),
+                    pooled_json("users", "preferences", u["preferences"]),
                 )
                 for u in users
             ],
@@ -330,7 +387,7 @@ class SQLiteBenchmark:
                     r["product_id"],
                     r["rating"],
                     r["comment"],
-                    json.dumps(r["metadata"]),
+                    pooled_json("reviews", "metadata", r["metadata"]),
                 )
                 for r in reviews
             ],
@@ -372,14 +429,20 @@ class SQLiteBenchmark:
         cur.executemany(
             "INSERT INTO payments (order_id, method, amount, data) VALUES (?, ?, ?, ?)",
             [
-                (p["order_id"], p["method"], p["amount"], json.dumps(p["data"]))
+                (
+                    p["order_id"],
+                    p["method"],
+                    p["amount"],
+                    pooled_json("payments", "data", p["data"]),
+                )
                 for p in payments
             ],
         )
         self.conn.commit()
 
     def reconcile_starting_data(self, total_records):
-        target_counts = split_starting_data(total_records)
+        target_counts = split_starting_data(total_records, self.dataset["weights"])
+        rngs = table_randoms(self.dataset["seed"], RECONCILE_STREAM)
 
         users_to_delete = self.get_ids_to_trim("users", target_counts["users"])
         categories_to_delete = self.get_ids_to_trim(
@@ -501,7 +564,36 @@ class SQLiteBenchmark:
 
         users_missing = target_counts["users"] - self.get_table_count("users")
         if users_missing > 0:
-            self.insert_users(generate_bulk_users(users_missing))
+            cur.execute(
+                """
+                WITH RECURSIVE ids(id) AS (
+                    SELECT 1 UNION ALL SELECT id + 1 FROM ids WHERE id < ?
+                )
+                SELECT id FROM ids
+                WHERE NOT EXISTS (SELECT 1 FROM users WHERE users.id = ids.id)
+                LIMIT ?
+                """,
+                (target_counts["users"] + users_missing, users_missing),
+            )
+            free_ids = [row[0] for row in cur.fetchall()]
+            users = generate_bulk_users(
+                users_missing, rngs["users"], self.generator_context
+            )
+            cur.executemany(
+                "INSERT INTO users (id, name, email, created_at, preferences) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [
+                    (
+                        user_id,
+                        u["name"],
+                        probe_email(user_id) if is_probe_id(user_id) else u["email"],
+                        str(u["created_at"]),
+                        pooled_json("users", "preferences", u["preferences"]),
+                    )
+                    for user_id, u in zip(free_ids, users)
+                ],
+            )
+            self.conn.commit()
 
         categories_missing = target_counts["categories"] - self.get_table_count(
             "categories"
@@ -511,11 +603,11 @@ class SQLiteBenchmark:
             categories = []
             for _ in range(categories_missing):
                 parent_id = (
-                    random.choice(existing_category_ids)
-                    if existing_category_ids and random.random() > 0.7
+                    rngs["categories"].choice(existing_category_ids)
+                    if existing_category_ids and rngs["categories"].random() > 0.7
                     else None
                 )
-                category = generate_category(parent_id)
+                category = generate_category(parent_id, rngs["categories"])
                 categories.append(category)
             self.insert_categories(categories)
 
@@ -524,7 +616,10 @@ class SQLiteBenchmark:
         )
         if warehouses_missing > 0:
             self.insert_warehouses(
-                [generate_warehouse() for _ in range(warehouses_missing)]
+                [
+                    generate_warehouse(rngs["warehouses"])
+                    for _ in range(warehouses_missing)
+                ]
             )
 
         user_ids = self.get_existing_ids("users")
@@ -533,14 +628,28 @@ class SQLiteBenchmark:
 
         products_missing = target_counts["products"] - self.get_table_count("products")
         if products_missing > 0 and category_ids:
-            self.insert_products(generate_bulk_products(products_missing, category_ids))
+            self.insert_products(
+                generate_bulk_products(
+                    products_missing,
+                    category_ids,
+                    rngs["products"],
+                    self.generator_context,
+                )
+            )
 
         product_ids = self.get_existing_ids("products")
 
         orders_missing = target_counts["orders"] - self.get_table_count("orders")
         if orders_missing > 0 and user_ids:
             self.insert_orders(
-                [generate_order(random.choice(user_ids)) for _ in range(orders_missing)]
+                [
+                    generate_order(
+                        rngs["orders"].choice(user_ids),
+                        rngs["orders"],
+                        self.generator_context,
+                    )
+                    for _ in range(orders_missing)
+                ]
             )
 
         order_ids = self.get_existing_ids("orders")
@@ -552,8 +661,9 @@ class SQLiteBenchmark:
             self.insert_order_items(
                 [
                     generate_order_item(
-                        random.choice(order_ids),
-                        random.choice(product_ids),
+                        rngs["order_items"].choice(order_ids),
+                        rngs["order_items"].choice(product_ids),
+                        rngs["order_items"],
                     )
                     for _ in range(order_items_missing)
                 ]
@@ -564,8 +674,10 @@ class SQLiteBenchmark:
             self.insert_reviews(
                 [
                     generate_review(
-                        random.choice(user_ids),
-                        random.choice(product_ids),
+                        rngs["reviews"].choice(user_ids),
+                        rngs["reviews"].choice(product_ids),
+                        rngs["reviews"],
+                        self.generator_context,
                     )
                     for _ in range(reviews_missing)
                 ]
@@ -578,8 +690,9 @@ class SQLiteBenchmark:
             self.insert_inventory(
                 [
                     generate_inventory(
-                        random.choice(product_ids),
-                        random.choice(warehouse_ids),
+                        rngs["inventory"].choice(product_ids),
+                        rngs["inventory"].choice(warehouse_ids),
+                        rngs["inventory"],
                     )
                     for _ in range(inventory_missing)
                 ]
@@ -591,7 +704,9 @@ class SQLiteBenchmark:
         if addresses_missing > 0 and user_ids:
             self.insert_addresses(
                 [
-                    generate_address(random.choice(user_ids))
+                    generate_address(
+                        rngs["addresses"].choice(user_ids), rngs["addresses"]
+                    )
                     for _ in range(addresses_missing)
                 ]
             )
@@ -600,118 +715,104 @@ class SQLiteBenchmark:
         if payments_missing > 0 and order_ids:
             self.insert_payments(
                 [
-                    generate_payment(random.choice(order_ids))
+                    generate_payment(
+                        rngs["payments"].choice(order_ids), rngs["payments"]
+                    )
                     for _ in range(payments_missing)
                 ]
             )
+        self.save_dataset_key()
 
-    def populate_starting_data(self, total_records):
-        counts = split_starting_data(total_records)
-
-        users = generate_bulk_users(counts["users"])
-        categories = generate_bulk_categories(counts["categories"])
-        warehouses = generate_bulk_warehouses(counts["warehouses"])
-        products = generate_bulk_products(
-            counts["products"], list(range(1, counts["categories"] + 1))
-        )
-        orders = generate_bulk_orders(counts["orders"], counts["users"])
-        order_items = generate_bulk_order_items(
-            counts["order_items"], counts["orders"], counts["products"]
-        )
-        reviews = generate_bulk_reviews(
-            counts["reviews"], counts["users"], counts["products"]
-        )
-        inventory = generate_bulk_inventory(
-            counts["inventory"], counts["products"], counts["warehouses"]
-        )
-        addresses = generate_bulk_addresses(counts["addresses"], counts["users"])
-        payments = generate_bulk_payments(counts["payments"], counts["orders"])
+    def insert_starting_chunk(self, table, chunk):
+        if not chunk:
+            return
+        if self.dataset["generator"] != "columnar":
+            getattr(self, f"insert_{table}")(chunk)
+            return
 
+        fields = STARTING_DATA_FIELDS[table]
         cur = self.conn.cursor()
         cur.executemany(
-            "INSERT INTO users (name, email, created_at, preferences) VALUES (?, ?, ?, ?)",
-            [
-                (
-                    u["name"],
-                    u["email"],
-                    str(u["created_at"]),
-                    json.dumps(u["preferences"]),
-                )
-                for u in users
-            ],
-        )
-        cur.executemany(
-            "INSERT INTO categories (name, parent_id) VALUES (?, ?)",
-            [(c["name"], c["parent_id"]) for c in categories],
-        )
-        cur.executemany(
-            "INSERT INTO warehouses (name, location) VALUES (?, ?)",
-            [(w["name"], w["location"]) for w in warehouses],
-        )
-        cur.executemany(
-            "INSERT INTO products (name, price, category_id, attributes) VALUES (?, ?, ?, ?)",
-            [
-                (
-                    p["name"],
-                    p["price"],
-                    p["category_id"],
-                    json.dumps(p["attributes"]),
-                )
-                for p in products
-            ],
-        )
-        cur.executemany(
-            "INSERT INTO orders (user_id, status, total, created_at) VALUES (?, ?, ?, ?)",
-            [
-                (o["user_id"], o["status"], o["total"], str(o["created_at"]))
-                for o in orders
-            ],
-        )
-        cur.executemany(
-            "INSERT INTO order_items (order_id, product_id, quantity, price) VALUES (?, ?, ?, ?)",
-            [
-                (oi["order_id"], oi["product_id"], oi["quantity"], oi["price"])
-                for oi in order_items
-            ],
+            f"INSERT INTO {table} ({', '.join(fields)}) "
+            f"VALUES ({self._placeholders(len(fields))})",
+            chunk.rows(fields, text_timestamps=True),
         )
-        cur.executemany(
-            "INSERT INTO reviews (user_id, product_id, rating, comment, metadata) VALUES (?, ?, ?, ?, ?)",
-            [
-                (
-                    r["user_id"],
-                    r["product_id"],
-                    r["rating"],
-                    r["comment"],
-                    json.dumps(r["metadata"]),
-                )
-                for r in reviews
-            ],
-        )
-        cur.executemany(
-            "INSERT INTO inventory (product_id, warehouse_id, quantity) VALUES (?, ?, ?)",
-            [(i["product_id"], i["warehouse_id"], i["quantity"]) for i in inventory],
-        )
-        cur.executemany(
-            "INSERT INTO addresses (user_id, city, country, details) VALUES (?, ?, ?, ?)",
-            [
-                (
-                    a["user_id"],
-                    a["city"],
-                    a["country"],
-                    json.dumps(a["details"]),
-                )
-                for a in addresses
-            ],
+        self.conn.commit()
+
+    def populate_starting_data(self, total_records):
+        for table, _, chunk in iter_starting_chunks(total_records, self.dataset):
+            self.insert_starting_chunk(table, chunk)
+        self.save_dataset_key()
+
+    def load_native_export(self, directory, fmt):
+        commands = [".bail on"]
+        for table, path in export_paths(directory, fmt).items():
+            commands.append(f".import --csv --skip 1 '{path}' {table}")
+        commands.append("UPDATE categories SET parent_id = NULL WHERE parent_id = '';")
+        run_native_tool(
+            [native_tool(fmt), self.config["database"]],
+            input="\n".join(commands) + "\n",
         )
-        cur.executemany(
-            "INSERT INTO payments (order_id, method, amount, data) VALUES (?, ?, ?, ?)",
-            [
-                (p["order_id"], p["method"], p["amount"], json.dumps(p["data"]))
-                for p in payments
-            ],
+
+    def run_load_benchmark(self, size, trial=1):
+        self.setup_schema(create_indexes=False)
+        start = time.time()
+        self.populate_starting_data(size)
+        elapsed = (time.time() - start) * 1000
+        save_result(
+            "sqlite", "populate_starting_data", size, elapsed, size, trial=trial
         )
+
+        for fmt in NATIVE_LOAD_FORMATS["sqlite"]:
+            operation = f"native_load_{fmt}"
+            if not native_tool(fmt):
+                print(f"Skipping {operation}: {NATIVE_LOAD_TOOLS[fmt]} not found")
+                save_result("sqlite", operation, size, None, size, trial, "unsupported")
+                continue
+            directory = export_starting_data(size, self.dataset, fmt)
+            self.setup_schema(create_indexes=False)
+            start = time.time()
+            self.load_native_export(os.path.abspath(directory), fmt)
+            elapsed = (time.time() - start) * 1000
+            save_result("sqlite", operation, size, elapsed, size, trial=trial)
+
+    def insert_append_batch(self, batch):
+        cur = self.conn.cursor()
+        for table, records in batch.items():
+            fields = ["id", *STARTING_DATA_FIELDS[table]]
+            cur.executemany(
+                f"INSERT INTO {table} ({', '.join(fields)}) "
+                f"VALUES ({self._placeholders(len(fields))})",
+                append_rows(records, table, text_timestamps=True),
+            )
+        self.conn.commit()
+
+    def delete_appended_rows(self, start_ids):
+        cur = self.conn.cursor()
+        for table in reversed(APPEND_TABLES):
+            cur.execute(f"DELETE FROM {table} WHERE id > ?", (start_ids[table],))
         self.conn.commit()
 
+    def run_ingest_benchmark(self, size, trial=1):
+        key_ranges = {table: self.get_key_range(table) for table in KEY_TABLES}
+        start_ids = {table: self.get_max_id(table) for table in APPEND_TABLES}
+        for phase in INGEST_PHASES:
+            if phase == "indexed":
+                self.ensure_indexes()
+            else:
+                self.drop_indexes()
+            run_ingest_phase(
+                "sqlite",
+                phase,
+                size,
+                trial,
+                self.dataset,
+                key_ranges,
+                start_ids,
+                self.insert_append_batch,
+            )
+            self.delete_appended_rows(start_ids)
+
     def cleanup_benchmark_rows(self):
         cur = self.conn.cursor()
         cur.execute(
@@ -779,7 +880,9 @@ class SQLiteBenchmark:
         self.conn.commit()
 
     def ensure_addresses_volume(self, total_records):
-        target_addresses = split_starting_data(total_records)["addresses"]
+        target_addresses = split_starting_data(total_records, self.dataset["weights"])[
+            "addresses"
+        ]
         cur = self.conn.cursor()
         cur.execute("SELECT COUNT(*) FROM addresses")
         current_addresses = cur.fetchone()[0]
@@ -792,9 +895,10 @@ class SQLiteBenchmark:
             return
 
         missing = target_addresses - current_addresses
+        rng = table_random(self.dataset["seed"], "addresses", TOP_UP_STREAM)
         data = []
         for _ in range(missing):
-            address = generate_address(random.choice(user_ids))
+            address = generate_address(rng.choice(user_ids), rng)
             data.append(
                 (
                     address["user_id"],
@@ -810,6 +914,18 @@ class SQLiteBenchmark:
         )
         self.conn.commit()
 
+    def warm_statement(self, query, params, many=False):
+        # One real, untimed run in both modes, so the timed call starts from
+        # the same page cache and only `prepared` finds the statement already
+        # compiled in the cache. DML is rolled back to leave the rows as-is.
+        cur = self.conn.cursor()
+        if many:
+            cur.executemany(query, params)
+        else:
+            cur.execute(query, params)
+            cur.fetchall()
+        self.conn.rollback()
+
     def run_nonindexed_queries(self, size, trial=1):
         self.cleanup_benchmark_rows()
         self.cleanup_delete_targets()
@@ -817,41 +933,45 @@ class SQLiteBenchmark:
         for name, q in NONINDEXED_QUERIES.items():
             params = q["params"]()
             if name == "insert_bulk":
-                users = generate_bulk_users(1000)
+                users = generate_bulk_users(1000, ctx=self.generator_context)
                 data = [
                     (
                         u["name"],
                         u["email"],
                         str(u["created_at"]),
-                        json.dumps(u["preferences"]),
+                        pooled_json("users", "preferences", u["preferences"]),
                     )
                     for u in users
                 ]
-                start = time.time()
-                cur = self.conn.cursor()
-                cur.executemany(
+                query = (
                     q["query"].replace("VALUES", "VALUES (?)").split("VALUES")[0]
-                    + "VALUES (?, ?, ?, ?)",
-                    data,
+                    + "VALUES (?, ?, ?, ?)"
                 )
+                cur = self.conn.cursor()
+                self.warm_statement(query, data[:1], many=True)
+                start = time.time()
+                cur.executemany(query, data)
                 self.conn.commit()
                 elapsed = (time.time() - start) * 1000
             elif name == "insert_many":
                 cats = [(f"cat{i}",) for i in range(100)]
-                start = time.time()
-                cur = self.conn.cursor()
-                cur.executemany(
+                query = (
                     q["query"].replace("VALUES", "VALUES (?)").split("VALUES")[0]
-                    + "VALUES (?)",
-                    cats,
+                    + "VALUES (?)"
                 )
+                cur = self.conn.cursor()
+                self.warm_statement(query, cats[:1], many=True)
+                start = time.time()
+                cur.executemany(query, cats)
                 self.conn.commit()
                 elapsed = (time.time() - start) * 1000
             else:
-                start = time.time()
+                query = to_sqlite_query(q["query"])
                 cur = self.conn.cursor()
-                cur.execute(to_sqlite_query(q["query"]), params)
-                if name.startswith("select"):
+                self.warm_statement(query, params)
+                start = time.time()
+                cur.execute(query, params)
+                if returns_rows(name):
                     cur.fetchall()
                 elapsed = (time.time() - start) * 1000
 
@@ -867,43 +987,47 @@ class SQLiteBenchmark:
         for name, q in INDEXED_QUERIES.items():
             params = q["params"]()
             if name == "index_insert_bulk":
-                users = generate_bulk_users(1000)
+                users = generate_bulk_users(1000, ctx=self.generator_context)
                 data = [
                     (
                         u["name"],
                         u["email"],
                         str(u["created_at"]),
-                        json.dumps(u["preferences"]),
+                        pooled_json("users", "preferences", u["preferences"]),
                     )
                     for u in users
                 ]
-                start = time.time()
-                cur = self.conn.cursor()
-                cur.executemany(
+                query = (
                     q["query"].replace("VALUES", "VALUES (?)").split("VALUES")[0]
-                    + "VALUES (?, ?, ?, ?)",
-                    data,
+                    + "VALUES (?, ?, ?, ?)"
                 )
+                cur = self.conn.cursor()
+                self.warm_statement(query, data[:1], many=True)
+                start = time.time()
+                cur.executemany(query, data)
                 self.conn.commit()
                 elapsed = (time.time() - start) * 1000
             elif name == "index_insert_many":
                 prods = [
                     (f"product{i}", 10.0, 1, '{"color": "red"}') for i in range(100)
                 ]
-                start = time.time()
-                cur = self.conn.cursor()
-                cur.executemany(
+                query = (
                     q["query"].replace("VALUES", "VALUES (?)").split("VALUES")[0]
-                    + "VALUES (?, ?, ?, ?)",
-                    prods,
+                    + "VALUES (?, ?, ?, ?)"
                 )
+                cur = self.conn.cursor()
+                self.warm_statement(query, prods[:1], many=True)
+                start = time.time()
+                cur.executemany(query, prods)
                 self.conn.commit()
                 elapsed = (time.time() - start) * 1000
             else:
-                start = time.time()
+                query = to_sqlite_query(q["query"])
                 cur = self.conn.cursor()
-                cur.execute(to_sqlite_query(q["query"]), params)
-                if name.startswith("select"):
+                self.warm_statement(query, params)
+                start = time.time()
+                cur.execute(query, params)
+                if returns_rows(name):
                     cur.fetchall()
                 elapsed = (time.time() - start) * 1000
             results[name] = elapsed
@@ -911,18 +1035,25 @@ class SQLiteBenchmark:
         self.ensure_addresses_volume(size)
         return results
 
-    def run_explain_queries(self, trial=1):
+    def run_explain_queries(self, size, trial=1):
         for name, q in EXPLAIN_QUERIES.items():
             params = q["params"]()
             start = time.time()
             cur = self.conn.cursor()
-            query = q["query"].replace("EXPLAIN ANALYZE", "EXPLAIN QUERY PLAN")
+            query = q["query"].replace(
+                "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)", "EXPLAIN QUERY PLAN"
+            )
+            query = query.replace("EXPLAIN (FORMAT JSON)", "EXPLAIN")
             query = to_sqlite_query(query)
             cur.execute(query, params)
             plan = cur.fetchall()
             elapsed = (time.time() - start) * 1000
             plan_text = "\n".join([str(list(row)) for row in plan])
             save_explain_result("sqlite", name, plan_text, elapsed, trial=trial)
+            if "EXPLAIN QUERY PLAN" in query:
+                save_plan_nodes(
+                    "sqlite", name, size, parse_sqlite_plan(plan), trial=trial
+                )
         return True
 
     def run_json_queries(self, size, trial=1):
@@ -944,8 +1075,9 @@ class SQLiteBenchmark:
         return results
 
 
-def run_sqlite_benchmark(size, operation_type="all", trial=1):
-    bench = SQLiteBenchmark()
+def run_sqlite_benchmark(size, operation_type="all", trial=1, dataset=None):
+    bench = SQLiteBenchmark(dataset=dataset)
+    set_probe_catalog(build_probe_catalog(size, bench.dataset))
     bench.connect()
 
     try:
@@ -983,8 +1115,39 @@ def run_sqlite_benchmark(size, operation_type="all", trial=1):
                     bench.ensure_indexes()
             bench.run_indexed_queries(size, trial=trial)
 
+        if operation_type in ["load"]:
+            bench.run_load_benchmark(size, trial=trial)
+
+        if operation_type in ["ingest"]:
+            if bench.get_total_record_count() is None:
+                bench.setup_schema(create_indexes=True)
+                bench.populate_starting_data(size)
+            else:
+                needs_refresh, use_populate = bench.needs_starting_data_refresh(size)
+                if needs_refresh:
+                    if use_populate:
+                        bench.setup_schema(create_indexes=True)
+                        bench.populate_starting_data(size)
+                    else:
+                        bench.reconcile_starting_data(size)
+            bench.run_ingest_benchmark(size, trial=trial)
+
         if operation_type in ["explain"]:
-            bench.run_explain_queries(trial=trial)
+            if bench.get_total_record_count() is None:
+                bench.setup_schema(create_indexes=True)
+                bench.populate_starting_data(size)
+            else:
+                needs_refresh, use_populate = bench.needs_starting_data_refresh(size)
+                if needs_refresh:
+                    bench.ensure_indexes()
+                    if use_populate:
+                        bench.setup_schema(create_indexes=True)
+                        bench.populate_starting_data(size)
+                    else:
+                        bench.reconcile_starting_data(size)
+                else:
+                    bench.ensure_indexes()
+            bench.run_explain_queries(size, trial=trial)
 
         if operation_type in ["all", "json"]:
             bench.run_json_queries(size, trial=trial)
@@ -1,6 +1,19 @@
 import argparse
+import os
+from datetime import datetime
 
 from src.config.sizes import SIZES_MAP
+from src.utils.generator import (
+    FETCH_MODES,
+    GENERATOR_MODES,
+    LOAD_STRATEGIES,
+    SHAPE_PROFILES,
+    STATEMENT_MODES,
+    load_shape,
+    parse_distribution,
+    parse_row_width,
+    resolve_seed,
+)
 
 DATABASES = {
     "postgres": "postgres",
@@ -15,9 +28,19 @@ OPERATIONS = {
     "indexed": "indexed",
     "explain": "explain",
     "json": "json",
+    "load": "load",
+    "ingest": "ingest",
     "all": "all",
 }
 
+UNSUPPORTED_OPERATIONS = {
+    "unqlite": ["load", "ingest"],
+}
+
+
+def supports_operation(database, operation):
+    return operation not in UNSUPPORTED_OPERATIONS.get(database, [])
+
 
 def parse_args():
     parser = argparse.ArgumentParser(description="Database Benchmark Tool")
@@ -49,6 +72,178 @@ def parse_args():
         default=1,
         help="Number of independent benchmark trials per database and size",
     )
+    parser.add_argument(
+        "--generator",
+        choices=GENERATOR_MODES,
+        default="rows",
+        help=(
+            "Starting data generator: rows=per-record dicts, "
+            "columnar=vectorized NumPy columns"
+        ),
+    )
+    parser.add_argument(
+        "--load-strategy",
+        choices=LOAD_STRATEGIES,
+        default="copy",
+        help=(
+            "How Postgres loads starting data: values=execute_values INSERTs, "
+            "copy=COPY FROM STDIN streamed from the chunk iterator, "
+            "copy_binary=the same in COPY binary format"
+        ),
+    )
+    parser.add_argument(
+        "--statement-mode",
+        choices=STATEMENT_MODES,
+        default="adhoc",
+        help=(
+            "How SQL suite queries are sent: adhoc=parsed and planned per call, "
+            "prepared=Postgres PREPARE/EXECUTE with a cached generic plan, "
+            "SQLite cached statements"
+        ),
+    )
+    parser.add_argument(
+        "--fetch-mode",
+        choices=FETCH_MODES,
+        default="fetchall",
+        help=(
+            "How Postgres SELECT queries of the SQL suites read results: "
+            "fetchall=materialize the whole result, stream=named server-side "
+            "cursor read --itersize rows at a time"
+        ),
+    )
+    parser.add_argument(
+        "--itersize",
+        type=int,
+        default=2_000,
+        help="Rows per round trip for --fetch-mode stream",
+    )
+    parser.add_argument(
+        "--load-connections",
+        type=int,
+        default=1,
+        help=(
+            "Postgres connections loading starting data in parallel; tables are "
+            "loaded in foreign key order and large tables split into id ranges"
+        ),
+    )
+    parser.add_argument(
+        "--defer-constraints",
+        action="store_true",
+        help=(
+            "Postgres: load into bare tables, then add primary keys, foreign keys "
+            "and indexes, timing each step"
+        ),
+    )
+    parser.add_argument(
+        "--unlogged",
+        action="store_true",
+        help=(
+            "Postgres: create the starting tables UNLOGGED, load them and switch "
+            "them to LOGGED before any measurement, recording time and WAL bytes"
+        ),
+    )
+    parser.add_argument(
+        "--maintenance-workers",
+        type=int,
+        default=4,
+        help=(
+            "max_parallel_maintenance_workers used for deferred primary key "
+            "and index builds"
+        ),
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help=(
+            "Worker processes used to generate starting data shards "
+            "(output is identical for any worker count)"
+        ),
+    )
+    parser.add_argument(
+        "--seed",
+        type=int,
+        default=None,
+        help=(
+            "Seed for the starting dataset; every engine and trial of a run gets "
+            "the same data (random seed when omitted)"
+        ),
+    )
+    parser.add_argument(
+        "--distribution",
+        default="uniform",
+        help=(
+            "Foreign key and created_at distribution: uniform, zipf[:exponent], "
+            "hotspot[:fraction[:weight]], clustered[:bursts[:spread_days]], "
+            "or per column, e.g. orders.user_id=zipf:1.3,product_id=hotspot,"
+            "created_at=clustered"
+        ),
+    )
+    parser.add_argument(
+        "--probe-hit-ratio",
+        type=float,
+        default=1.0,
+        help=(
+            "Share of point lookups that target planted probe keys "
+            "(the rest look up keys that do not exist)"
+        ),
+    )
+    parser.add_argument(
+        "--consistent",
+        action="store_true",
+        help=(
+            "Generate internally consistent data: order totals equal the sum of "
+            "their items, payments match their orders and reviews only cover "
+            "products the reviewer ordered"
+        ),
+    )
+    parser.add_argument(
+        "--row-width",
+        default="",
+        help=(
+            "Payload width per table as column=value pairs: reviews.comment "
+            "(characters), products.tags (tag count), products.attributes "
+            "(extra attributes); k/m suffixes, e.g. reviews.comment=64k,"
+            "products.tags=200"
+        ),
+    )
+    parser.add_argument(
+        "--shape",
+        default="default",
+        help=(
+            "Table mix of the starting data: a profile "
+            f"({', '.join(SHAPE_PROFILES)}) or a JSON file mapping table names "
+            "to weights"
+        ),
+    )
+    parser.add_argument(
+        "--ingest-batches",
+        type=int,
+        default=100,
+        help="Batches appended by --operation ingest per phase",
+    )
+    parser.add_argument(
+        "--ingest-batch-orders",
+        type=int,
+        default=1_000,
+        help=("Orders per ingest batch (each with 1-3 order_items and a payment)"),
+    )
+    parser.add_argument(
+        "--no-dataset-cache",
+        action="store_true",
+        help=(
+            "Regenerate columnar starting data instead of reusing "
+            "the memory-mapped copy under results/datasets"
+        ),
+    )
+    parser.add_argument(
+        "--bench-generator",
+        action="store_true",
+        help=(
+            "Measure starting data generator throughput (rows/s, bytes/row, "
+            "peak RSS) per table for the selected sizes instead of running databases"
+        ),
+    )
     parser.add_argument(
         "--draw",
         action="store_true",
@@ -67,7 +262,78 @@ def parse_args():
 
     args = parser.parse_args()
 
+    if not supports_operation(args.db, args.operation):
+        parser.error(f"--operation {args.operation} is not supported for {args.db}")
+
     if args.trials < 1:
         parser.error("--trials must be at least 1")
 
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+
+    if args.itersize < 1:
+        parser.error("--itersize must be at least 1")
+
+    if args.fetch_mode == "stream" and args.statement_mode == "prepared":
+        parser.error(
+            "--fetch-mode stream cannot be combined with --statement-mode prepared: "
+            "a server-side cursor cannot be declared over EXECUTE"
+        )
+
+    if args.load_connections < 1:
+        parser.error("--load-connections must be at least 1")
+
+    if args.maintenance_workers < 0:
+        parser.error("--maintenance-workers must not be negative")
+
+    if args.ingest_batches < 1 or args.ingest_batch_orders < 1:
+        parser.error("--ingest-batches and --ingest-batch-orders must be at least 1")
+
+    if not 0 <= args.probe_hit_ratio <= 1:
+        parser.error("--probe-hit-ratio must be between 0 and 1")
+
+    args.distribution = args.distribution.replace(" ", "")
+    try:
+        parse_distribution(args.distribution)
+    except ValueError as e:
+        parser.error(f"--distribution: {e}")
+
+    try:
+        args.weights = load_shape(args.shape)
+    except (OSError, ValueError) as e:
+        parser.error(f"--shape: {e}")
+
+    args.row_width = args.row_width.replace(" ", "")
+    try:
+        parse_row_width(args.row_width)
+    except ValueError as e:
+        parser.error(f"--row-width: {e}")
+
     return args
+
+
+def get_dataset_options(args):
+    return {
+        "generator": args.generator,
+        "workers": args.workers,
+        "seed": resolve_seed(args.seed),
+        "seed_given": args.seed is not None,
+        "cache": not args.no_dataset_cache,
+        "distribution": args.distribution,
+        "probe_hit_ratio": args.probe_hit_ratio,
+        "consistent": args.consistent,
+        "ingest_batches": args.ingest_batches,
+        "ingest_batch_orders": args.ingest_batch_orders,
+        "row_width": args.row_width,
+        "shape": args.shape,
+        "weights": args.weights,
+        "load_strategy": args.load_strategy,
+        "load_connections": args.load_connections,
+        "defer_constraints": args.defer_constraints,
+        "unlogged": args.unlogged,
+        "statement_mode": args.statement_mode,
+        "fetch_mode": args.fetch_mode,
+        "itersize": args.itersize,
+        "maintenance_workers": args.maintenance_workers,
+        "reference_time": datetime.combine(datetime.now().date(), datetime.min.time()),
+    }
@@ -1,8 +1,13 @@
 import time
 
+from src.utils.generator import dataset_key_matches, reconcilable_dataset
 from src.utils.results import save_explain_result, save_result
 
 
+def returns_rows(query_name):
+    return query_name.removeprefix("index_").startswith("select")
+
+
 def execute_and_time_query(
     execute_func, query_name, db_name, size, trial, fetch_results=True
 ):
@@ -45,7 +50,7 @@ def run_benchmark_operations(
         params = q["params"]()
 
         start = time.time()
-        execute_query_func(q["query"], params, name.startswith("select"))
+        execute_query_func(q["query"], params, returns_rows(name))
         elapsed = (time.time() - start) * 1000
 
         results[name] = elapsed
@@ -75,12 +80,24 @@ def needs_starting_data_refresh(benchmark, target_size):
         print("Current total record count is unknown, refreshing data.")
         return True, True
 
+    if not dataset_key_matches(benchmark.get_dataset_key(), benchmark.dataset):
+        print(
+            "Stored data was generated with different dataset options, refreshing data."
+        )
+        return True, True
+
     need = abs(current_size - target_size) > (target_size * DATA_REFRESH_THRESHOLD)
     if need:
         print(
             f"Current total record count {current_size:_} differs from target {target_size:_} by more than 5%, refreshing data."
         )
         use_populate = target_size < LARGE_SIZE_THRESHOLD
+        if not use_populate and not reconcilable_dataset(benchmark.dataset):
+            print(
+                "Reconcile only tops up uniform, non-consistent rows; "
+                "repopulating to keep --distribution and --consistent."
+            )
+            use_populate = True
         return True, use_populate
 
     return False, False
@@ -0,0 +1,399 @@
+import hashlib
+import json
+import os
+import random
+import shutil
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+import numpy as np
+
+from src.config.files import DATASETS_DIR
+from src.utils.generator import (
+    DATASET_SCHEMA_VERSION,
+    STARTING_DATA_INSERT_ORDER,
+    GeneratorContext,
+    RecordBatch,
+    dataset_identity,
+    dataset_options,
+    generate_columnar_table,
+    generate_table_records,
+    resolve_seed,
+    split_starting_data,
+    table_seed,
+    wide_row_bytes,
+)
+
+SHARD_ROWS = 100_000
+
+SEED_BLOCK_ROWS = 10_000
+
+SHARD_BYTES = 64 * 2**20
+
+ROW_SIZE_SAMPLE = 200
+
+CACHE_MANIFEST = "manifest.json"
+
+RANGE_WINDOW = 2
+
+
+def table_shard_rows(table, shard_rows=SHARD_ROWS, row_width=None):
+    wide_bytes = wide_row_bytes(table, row_width)
+    rows = max(1, min(shard_rows, SHARD_BYTES // max(1, wide_bytes)))
+    # whole seed blocks, so shards never generate rows they then throw away
+    if rows > SEED_BLOCK_ROWS:
+        rows -= rows % SEED_BLOCK_ROWS
+    return rows
+
+
+def plan_table_shards(table, count, shard_rows=SHARD_ROWS, row_width=None):
+    shard_rows = table_shard_rows(table, shard_rows, row_width)
+    shards = []
+    for shard_index, offset in enumerate(range(0, count, shard_rows)):
+        shards.append((table, shard_index, offset + 1, min(shard_rows, count - offset)))
+    return shards
+
+
+def plan_shards(counts, shard_rows=SHARD_ROWS, row_width=None):
+    shards = []
+    for table in STARTING_DATA_INSERT_ORDER:
+        shards.extend(plan_table_shards(table, counts[table], shard_rows, row_width))
+    return shards
+
+
+def seed_blocks(start_id, count, table_count):
+    first = (start_id - 1) // SEED_BLOCK_ROWS
+    last = (start_id + count - 2) // SEED_BLOCK_ROWS
+    for block_index in range(first, last + 1):
+        block_start = block_index * SEED_BLOCK_ROWS + 1
+        block_rows = min(SEED_BLOCK_ROWS, table_count - block_start + 1)
+        offset = max(start_id, block_start) - block_start
+        stop = min(start_id + count, block_start + block_rows) - block_start
+        yield block_index, block_start, block_rows, offset, stop
+
+
+def generate_shard(
+    mode,
+    table,
+    shard_index,
+    start_id,
+    count,
+    counts,
+    base_seed,
+    reference_time,
+    distribution="uniform",
+    consistent=False,
+    row_width="",
+):
+    ctx = GeneratorContext(
+        reference_time, distribution, consistent, row_width, base_seed
+    )
+    # seeds belong to fixed id blocks rather than to shards, so the rows do
+    # not depend on how a table is split into shards or spread over workers
+    parts = []
+    for block_index, block_start, block_rows, offset, stop in seed_blocks(
+        start_id, count, counts[table]
+    ):
+        seed = table_seed(base_seed, table, block_index)
+        if mode == "columnar":
+            rng = np.random.default_rng(seed)
+            block = RecordBatch(
+                table,
+                generate_columnar_table(
+                    table, block_rows, counts, rng, block_start, ctx
+                ),
+            )
+            if (offset, stop) != (0, block_rows):
+                block = block.slice(offset, stop)
+        else:
+            rng = random.Random(seed)
+            block = generate_table_records(
+                table, block_rows, counts, block_start, rng, ctx
+            )[offset:stop]
+        parts.append(block)
+    return parts[0] if len(parts) == 1 else merge_shards(mode, parts)
+
+
+def _generate_shard_task(task):
+    return generate_shard(*task)
+
+
+def iter_shard_results(executor, tasks, window):
+    pending_tasks = iter(tasks)
+    in_flight = deque()
+    for task in pending_tasks:
+        in_flight.append((task, executor.submit(_generate_shard_task, task)))
+        if len(in_flight) > window:
+            break
+
+    while in_flight:
+        task, future = in_flight.popleft()
+        next_task = next(pending_tasks, None)
+        if next_task is not None:
+            in_flight.append(
+                (next_task, executor.submit(_generate_shard_task, next_task))
+            )
+        yield task[1], task[3], future.result()
+
+
+def merge_shards(mode, shards):
+    shards = [shard for shard in shards if shard]
+    if mode != "columnar":
+        return [record for shard in shards for record in shard]
+    if not shards:
+        return RecordBatch(None, {})
+    return RecordBatch(
+        shards[0].table,
+        {
+            name: np.concatenate([shard[name] for shard in shards])
+            for name in shards[0].columns
+        },
+    )
+
+
+def plan_starting_tasks(total_records, dataset=None):
+    options = dataset_options(dataset)
+    counts = split_starting_data(total_records, options["weights"])
+    base_seed = resolve_seed(options["seed"])
+    reference_time = options["reference_time"] or datetime.now()
+    return [
+        (
+            options["generator"],
+            table,
+            shard_index,
+            start_id,
+            count,
+            counts,
+            base_seed,
+            reference_time,
+            options["distribution"],
+            options["consistent"],
+            options["row_width"],
+        )
+        for table, shard_index, start_id, count in plan_shards(
+            counts, row_width=options["row_width"]
+        )
+    ]
+
+
+def iter_generated_chunks(total_records, dataset=None):
+    options = dataset_options(dataset)
+    tasks = plan_starting_tasks(total_records, options)
+
+    if len(tasks) <= 1:
+        for task in tasks:
+            yield task[1], task[3], _generate_shard_task(task)
+        return
+
+    workers = options["workers"]
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from iter_shard_results(executor, tasks, workers)
+
+
+def average_row_bytes(total_records, dataset=None):
+    options = dataset_options(dataset)
+    counts = split_starting_data(total_records, options["weights"])
+    base_seed = resolve_seed(options["seed"])
+    reference_time = options["reference_time"] or datetime.now()
+    total_bytes = 0
+    for table in STARTING_DATA_INSERT_ORDER:
+        sample_rows = min(counts[table], ROW_SIZE_SAMPLE)
+        if sample_rows < 1:
+            continue
+        records = generate_shard(
+            "rows",
+            table,
+            0,
+            1,
+            sample_rows,
+            counts,
+            base_seed,
+            reference_time,
+            options["distribution"],
+            options["consistent"],
+            options["row_width"],
+        )
+        if not records:
+            continue
+        sample_bytes = sum(len(json.dumps(record, default=str)) for record in records)
+        total_bytes += sample_bytes / len(records) * counts[table]
+    return round(total_bytes / max(1, sum(counts.values())), 1)
+
+
+def uses_dataset_cache(dataset=None):
+    options = dataset_options(dataset)
+    return (
+        bool(options["cache"])
+        and options["generator"] == "columnar"
+        and options["seed"] is not None
+    )
+
+
+def dataset_cache_key(total_records, dataset=None):
+    payload = json.dumps(dataset_identity(total_records, dataset))
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def dataset_cache_dir(total_records, dataset=None):
+    return os.path.join(DATASETS_DIR, dataset_cache_key(total_records, dataset))
+
+
+def read_cache_manifest(total_records, dataset=None):
+    path = os.path.join(dataset_cache_dir(total_records, dataset), CACHE_MANIFEST)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def prepare_dataset(total_records, dataset=None):
+    options = dataset_options(dataset)
+    if not uses_dataset_cache(options):
+        return options
+
+    manifest = read_cache_manifest(total_records, options)
+    if manifest is not None:
+        options["reference_time"] = datetime.fromisoformat(manifest["reference_time"])
+    return options
+
+
+def write_dataset_cache(total_records, dataset, chunks):
+    options = dataset_options(dataset)
+    cache_dir = dataset_cache_dir(total_records, options)
+    tmp_dir = f"{cache_dir}.tmp-{os.getpid()}"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    counts = split_starting_data(total_records, options["weights"])
+    arrays = {}
+    columns = {table: [] for table in STARTING_DATA_INSERT_ORDER}
+    try:
+        for table, start_id, chunk in chunks:
+            for name, column in chunk.columns.items():
+                if (table, name) not in arrays:
+                    os.makedirs(os.path.join(tmp_dir, table), exist_ok=True)
+                    arrays[(table, name)] = np.lib.format.open_memmap(
+                        os.path.join(tmp_dir, table, f"{name}.npy"),
+                        mode="w+",
+                        dtype=column.dtype,
+                        shape=(counts[table],) + column.shape[1:],
+                    )
+                    columns[table].append(name)
+                offset = start_id - 1
+                arrays[(table, name)][offset : offset + len(column)] = column
+            yield table, start_id, chunk
+
+        for array in arrays.values():
+            array.flush()
+        arrays.clear()
+
+        manifest = {
+            "schema_version": DATASET_SCHEMA_VERSION,
+            "size": int(total_records),
+            "generator": options["generator"],
+            "seed": options["seed"],
+            "reference_time": options["reference_time"].isoformat(),
+            "counts": counts,
+            "columns": columns,
+        }
+        with open(os.path.join(tmp_dir, CACHE_MANIFEST), "w") as f:
+            json.dump(manifest, f, indent=2)
+
+        if os.path.exists(cache_dir):
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+        else:
+            os.replace(tmp_dir, cache_dir)
+    except BaseException:
+        # an abandoned or failed run must not leave a partial cache behind
+        arrays.clear()
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+
+def cached_table(cache_dir, manifest, table):
+    columns = {
+        name: np.load(os.path.join(cache_dir, table, f"{name}.npy"), mmap_mode="r")
+        for name in manifest["columns"][table]
+    }
+    return RecordBatch(table, columns)
+
+
+def iter_cached_chunks(total_records, dataset=None, shard_rows=SHARD_ROWS):
+    options = dataset_options(dataset)
+    cache_dir = dataset_cache_dir(total_records, options)
+    manifest = read_cache_manifest(total_records, options)
+    for table in STARTING_DATA_INSERT_ORDER:
+        batch = cached_table(cache_dir, manifest, table)
+        for _, _, start_id, count in plan_table_shards(
+            table, manifest["counts"][table], shard_rows, options["row_width"]
+        ):
+            offset = start_id - 1
+            yield table, start_id, batch.slice(offset, offset + count)
+
+
+def iter_starting_chunks(total_records, dataset=None):
+    options = dataset_options(dataset)
+    if not uses_dataset_cache(options):
+        yield from iter_generated_chunks(total_records, options)
+        return
+
+    if read_cache_manifest(total_records, options) is None:
+        options["reference_time"] = options["reference_time"] or datetime.now()
+        yield from write_dataset_cache(
+            total_records, options, iter_generated_chunks(total_records, options)
+        )
+        return
+
+    yield from iter_cached_chunks(total_records, options)
+
+
+def materialize_dataset(total_records, dataset=None):
+    options = dataset_options(dataset)
+    if uses_dataset_cache(options) and not read_cache_manifest(total_records, options):
+        for _ in iter_starting_chunks(total_records, options):
+            pass
+    return prepare_dataset(total_records, options)
+
+
+def plan_load_ranges(total_records, dataset=None, parts=1):
+    options = dataset_options(dataset)
+    tasks = plan_starting_tasks(total_records, options)
+    ranges = []
+    for table in STARTING_DATA_INSERT_ORDER:
+        table_tasks = [task for task in tasks if task[1] == table]
+        if not table_tasks:
+            continue
+        step = -(-len(table_tasks) // parts)
+        for offset in range(0, len(table_tasks), step):
+            ranges.append((table, table_tasks[offset : offset + step]))
+    return ranges
+
+
+def iter_range_chunks(total_records, dataset, tasks, executor=None):
+    options = dataset_options(dataset)
+    if uses_dataset_cache(options):
+        table = tasks[0][1]
+        manifest = read_cache_manifest(total_records, options)
+        batch = cached_table(dataset_cache_dir(total_records, options), manifest, table)
+        for task in tasks:
+            offset = task[3] - 1
+            yield table, task[3], batch.slice(offset, offset + task[4])
+        return
+
+    if executor is None:
+        for task in tasks:
+            yield task[1], task[3], _generate_shard_task(task)
+        return
+    yield from iter_shard_results(executor, tasks, RANGE_WINDOW)
+
+
+def generate_starting_tables(total_records, dataset=None):
+    options = dataset_options(dataset)
+    by_table = {table: [] for table in STARTING_DATA_INSERT_ORDER}
+    for table, _, chunk in iter_starting_chunks(total_records, options):
+        by_table[table].append(chunk)
+
+    return {
+        table: merge_shards(options["generator"], shards)
+        for table, shards in by_table.items()
+    }
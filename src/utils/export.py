@@ -0,0 +1,405 @@
+import csv
+import json
+import os
+import shutil
+import struct
+import subprocess
+import time
+from datetime import datetime
+
+import bson
+import numpy as np
+from bson import json_util
+
+from src.config.files import EXPORTS_DIR
+from src.utils.dataset import iter_starting_chunks
+from src.utils.generator import (
+    JSON_POOLS,
+    NULLABLE_COLUMNS,
+    STARTING_DATA_FIELDS,
+    STARTING_DATA_INSERT_ORDER,
+    RecordBatch,
+    dataset_fingerprint,
+)
+from src.utils.results import save_result
+
+EXPORT_FORMATS = {
+    "pg_text": "{table}.copy",
+    "pg_binary": "{table}.bin",
+    "mongo_json": "{table}.json",
+    "mongo_bson": "dump/{table}.bson",
+    "sqlite_csv": "{table}.csv",
+}
+
+NATIVE_LOAD_FORMATS = {
+    "postgres": ["pg_text", "pg_binary"],
+    "mongo": ["mongo_json", "mongo_bson"],
+    "sqlite": ["sqlite_csv"],
+}
+
+NATIVE_LOAD_TOOLS = {
+    "pg_text": "psql",
+    "pg_binary": "psql",
+    "mongo_json": "mongoimport",
+    "mongo_bson": "mongorestore",
+    "sqlite_csv": "sqlite3",
+}
+
+PG_COPY_TYPES = {
+    "users": ["text", "text", "timestamp", "jsonb"],
+    "categories": ["text", "int4"],
+    "products": ["text", "numeric", "int4", "jsonb"],
+    "orders": ["int4", "text", "numeric", "timestamp"],
+    "order_items": ["int4", "int4", "int4", "numeric"],
+    "reviews": ["int4", "int4", "int4", "text", "jsonb"],
+    "warehouses": ["text", "text"],
+    "inventory": ["int4", "int4", "int4"],
+    "addresses": ["int4", "text", "text", "jsonb"],
+    "payments": ["int4", "text", "numeric", "jsonb"],
+}
+
+PG_COPY_SIGNATURE = b"PGCOPY\n\xff\r\n\x00" + struct.pack("!ii", 0, 0)
+
+PG_COPY_TRAILER = struct.pack("!h", -1)
+
+PG_EPOCH = datetime(2000, 1, 1)
+
+PG_EPOCH_US = np.datetime64(PG_EPOCH, "us")
+
+PG_NUMERIC_DTYPE = np.dtype(
+    [
+        ("ndigits", ">i2"),
+        ("weight", ">i2"),
+        ("sign", ">u2"),
+        ("dscale", ">i2"),
+        ("digits", ">u2", 3),
+    ]
+)
+
+COPY_BLOCK_BYTES = 4 * 2**20
+
+PG_TEXT_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+NUMERIC_SCALE = 2
+
+
+def json_value(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    return value
+
+
+def export_rows(chunk, fields, text_timestamps=False):
+    if isinstance(chunk, RecordBatch):
+        return chunk.rows(fields, text_timestamps)
+    return (
+        tuple(
+            str(record[field])
+            if text_timestamps and isinstance(record[field], datetime)
+            else json_value(record[field])
+            for field in fields
+        )
+        for record in chunk
+    )
+
+
+def with_ids(rows, start_id=None):
+    if start_id is None:
+        return rows
+    return ((idx, *row) for idx, row in enumerate(rows, start=start_id))
+
+
+def export_documents(chunk, start_id):
+    if isinstance(chunk, RecordBatch):
+        return chunk.records(id_field="_id")
+    return ({"_id": idx, **doc} for idx, doc in enumerate(chunk, start=start_id))
+
+
+def pg_text_value(value):
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, str):
+        return value.translate(PG_TEXT_ESCAPES)
+    return str(value)
+
+
+def encode_pg_text(table, chunk, start_id=None):
+    rows = with_ids(export_rows(chunk, STARTING_DATA_FIELDS[table]), start_id)
+    lines = ("\t".join(pg_text_value(value) for value in row) + "\n" for row in rows)
+    return "".join(lines).encode("utf-8")
+
+
+def write_pg_text(f, table, chunk, start_id):
+    f.write(encode_pg_text(table, chunk))
+
+
+def pg_numeric(value, scale=NUMERIC_SCALE):
+    units = round(abs(value) * 10**scale)
+    integer, fraction = divmod(units, 10**scale)
+    digits = []
+    while integer:
+        integer, digit = divmod(integer, 10_000)
+        digits.insert(0, digit)
+    weight = len(digits) - 1
+    digits.append(fraction * 10 ** (4 - scale))
+    while digits and digits[-1] == 0:
+        digits.pop()
+    if not digits:
+        weight = 0
+    sign = 0x4000 if value < 0 else 0
+    return struct.pack(
+        f"!hhhh{len(digits)}H", len(digits), weight, sign, scale, *digits
+    )
+
+
+def pg_binary_value(kind, value):
+    if kind == "int4":
+        return struct.pack("!i", value)
+    if kind == "numeric":
+        return pg_numeric(value)
+    if kind == "timestamp":
+        delta = value - PG_EPOCH
+        micros = (delta.days * 86_400 + delta.seconds) * 1_000_000 + delta.microseconds
+        return struct.pack("!q", micros)
+    if kind == "jsonb":
+        return b"\x01" + value.encode("utf-8")
+    return value.encode("utf-8")
+
+
+def pg_binary_row(kinds, row):
+    parts = [struct.pack("!h", len(kinds))]
+    for kind, value in zip(kinds, row):
+        if value is None:
+            parts.append(struct.pack("!i", -1))
+            continue
+        encoded = pg_binary_value(kind, value)
+        parts.append(struct.pack("!i", len(encoded)))
+        parts.append(encoded)
+    return b"".join(parts)
+
+
+def byte_matrix(values):
+    values = np.ascontiguousarray(values)
+    if values.dtype.kind != "S":
+        values = np.array([value.encode("utf-8") for value in values], dtype="S")
+    width = values.dtype.itemsize if len(values) else 0
+    matrix = values.view(np.uint8).reshape(len(values), width)
+    return matrix, np.char.str_len(values).astype(np.int64)
+
+
+def fixed_matrix(values, dtype):
+    values = np.ascontiguousarray(values, dtype=dtype)
+    matrix = values.view(np.uint8).reshape(len(values), values.dtype.itemsize)
+    return matrix, np.full(len(values), values.dtype.itemsize, dtype=np.int64)
+
+
+def numeric_matrix(values, scale=NUMERIC_SCALE):
+    values = np.asarray(values, dtype=np.float64)
+    units = np.rint(np.abs(values) * 10**scale).astype(np.int64)
+    integer, fraction = np.divmod(units, 10**scale)
+    encoded = np.zeros(len(values), dtype=PG_NUMERIC_DTYPE)
+    encoded["ndigits"] = 3
+    encoded["weight"] = 1
+    encoded["sign"] = np.where(values < 0, 0x4000, 0)
+    encoded["dscale"] = scale
+    encoded["digits"] = np.stack(
+        [integer // 10_000, integer % 10_000, fraction * 10 ** (4 - scale)], axis=1
+    )
+    return fixed_matrix(encoded, PG_NUMERIC_DTYPE)
+
+
+PG_BINARY_POOLS = {
+    key: byte_matrix(np.array([b"\x01" + value.encode("utf-8") for value in pool]))
+    for key, pool in JSON_POOLS.items()
+}
+
+
+def binary_field(kind, batch, field):
+    if batch.is_pooled(field):
+        matrix, lengths = PG_BINARY_POOLS[(batch.table, field)]
+        codes = np.asarray(batch[field])
+        return matrix[codes], lengths[codes]
+    column = batch.columns.get(field)
+    if kind == "int4":
+        matrix, lengths = fixed_matrix(column, ">i4")
+        if field in NULLABLE_COLUMNS:
+            lengths[np.asarray(column) == 0] = -1
+        return matrix, lengths
+    if kind == "numeric":
+        return numeric_matrix(column)
+    if kind == "timestamp":
+        micros = np.asarray(column).astype("datetime64[us]") - PG_EPOCH_US
+        return fixed_matrix(micros.astype(np.int64), ">i8")
+    if kind == "jsonb":
+        values = batch.field_values(field)
+        return byte_matrix([b"\x01" + value.encode("utf-8") for value in values])
+    if column is not None and column.dtype.kind == "S":
+        return byte_matrix(column)
+    return byte_matrix(list(batch.field_values(field)))
+
+
+def scatter(buffer, starts, matrix, lengths):
+    if matrix.shape[1] == 0:
+        return
+    columns = np.arange(matrix.shape[1])
+    mask = columns < lengths[:, None]
+    buffer[(starts[:, None] + columns)[mask]] = matrix[mask]
+
+
+def encode_binary_block(fields):
+    count = len(fields[0][1])
+    sizes = [np.maximum(lengths, 0) for _, lengths in fields]
+    row_sizes = 2 + sum(4 + size for size in sizes)
+    starts = np.cumsum(row_sizes) - row_sizes
+    buffer = np.empty(int(row_sizes.sum()), dtype=np.uint8)
+
+    field_count = np.frombuffer(struct.pack("!h", len(fields)), dtype=np.uint8)
+    scatter(buffer, starts, np.broadcast_to(field_count, (count, 2)), np.full(count, 2))
+    position = starts + 2
+    for (matrix, lengths), size in zip(fields, sizes):
+        header = lengths.astype(">i4").view(np.uint8).reshape(count, 4)
+        scatter(buffer, position, header, np.full(count, 4))
+        scatter(buffer, position + 4, matrix, size)
+        position = position + 4 + size
+    return buffer.tobytes()
+
+
+def encode_pg_binary_batch(table, batch, start_id=None):
+    kinds = PG_COPY_TYPES[table]
+    fields = [
+        binary_field(kind, batch, field)
+        for kind, field in zip(kinds, STARTING_DATA_FIELDS[table])
+    ]
+    if start_id is not None:
+        fields.insert(0, fixed_matrix(np.asarray(batch["id"]), ">i4"))
+
+    row_bytes = 2 + sum(4 + matrix.shape[1] for matrix, _ in fields)
+    block_rows = max(1, COPY_BLOCK_BYTES // row_bytes)
+    return b"".join(
+        encode_binary_block(
+            [(matrix[start:stop], lengths[start:stop]) for matrix, lengths in fields]
+        )
+        for start, stop in (
+            (start, min(start + block_rows, len(batch)))
+            for start in range(0, len(batch), block_rows)
+        )
+    )
+
+
+def encode_pg_binary(table, chunk, start_id=None):
+    if isinstance(chunk, RecordBatch):
+        return encode_pg_binary_batch(table, chunk, start_id)
+    kinds = PG_COPY_TYPES[table]
+    if start_id is not None:
+        kinds = ["int4", *kinds]
+    rows = with_ids(export_rows(chunk, STARTING_DATA_FIELDS[table]), start_id)
+    return b"".join(pg_binary_row(kinds, row) for row in rows)
+
+
+def write_pg_binary(f, table, chunk, start_id):
+    f.write(encode_pg_binary(table, chunk))
+
+
+def write_mongo_json(f, table, chunk, start_id):
+    for doc in export_documents(chunk, start_id):
+        f.write(
+            json_util.dumps(doc, json_options=json_util.RELAXED_JSON_OPTIONS).encode(
+                "utf-8"
+            )
+        )
+        f.write(b"\n")
+
+
+def write_mongo_bson(f, table, chunk, start_id):
+    f.write(b"".join(bson.encode(doc) for doc in export_documents(chunk, start_id)))
+
+
+def write_sqlite_csv(f, table, chunk, start_id):
+    ids = range(start_id, start_id + len(chunk))
+    rows = export_rows(chunk, STARTING_DATA_FIELDS[table], text_timestamps=True)
+    writer = csv.writer(f)
+    writer.writerows((idx, *row) for idx, row in zip(ids, rows))
+
+
+EXPORT_WRITERS = {
+    "pg_text": write_pg_text,
+    "pg_binary": write_pg_binary,
+    "mongo_json": write_mongo_json,
+    "mongo_bson": write_mongo_bson,
+    "sqlite_csv": write_sqlite_csv,
+}
+
+
+def open_export_file(path, fmt, table):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if fmt == "sqlite_csv":
+        f = open(path, "w", newline="", encoding="utf-8")
+        csv.writer(f).writerow(["id", *STARTING_DATA_FIELDS[table]])
+        return f
+    f = open(path, "wb")
+    if fmt == "pg_binary":
+        f.write(PG_COPY_SIGNATURE)
+    return f
+
+
+def close_export_file(f, fmt):
+    if fmt == "pg_binary":
+        f.write(PG_COPY_TRAILER)
+    f.close()
+
+
+def export_dir(total_records, dataset, fmt):
+    return os.path.join(EXPORTS_DIR, dataset_fingerprint(total_records, dataset), fmt)
+
+
+def export_paths(directory, fmt):
+    return {
+        table: os.path.join(directory, EXPORT_FORMATS[fmt].format(table=table))
+        for table in STARTING_DATA_INSERT_ORDER
+    }
+
+
+def export_starting_data(total_records, dataset, fmt):
+    directory = export_dir(total_records, dataset, fmt)
+    if os.path.isdir(directory):
+        return directory
+
+    tmp_dir = f"{directory}.tmp"
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    paths = export_paths(tmp_dir, fmt)
+    writer = EXPORT_WRITERS[fmt]
+    files = {}
+    start = time.time()
+    try:
+        for table in STARTING_DATA_INSERT_ORDER:
+            files[table] = open_export_file(paths[table], fmt, table)
+        for table, start_id, chunk in iter_starting_chunks(total_records, dataset):
+            if chunk:
+                writer(files[table], table, chunk, start_id)
+    finally:
+        for f in files.values():
+            close_export_file(f, fmt)
+    elapsed = (time.time() - start) * 1000
+
+    os.replace(tmp_dir, directory)
+    save_result("generator", f"export_{fmt}", total_records, elapsed, total_records)
+    return directory
+
+
+def native_tool(fmt):
+    return shutil.which(NATIVE_LOAD_TOOLS[fmt])
+
+
+def run_native_tool(args, env=None, input=None):
+    result = subprocess.run(
+        args,
+        env={**os.environ, **(env or {})},
+        input=input,
+        text=True,
+        capture_output=True,
+    )
+    if result.returncode != 0:
+        tool = os.path.basename(args[0])
+        raise RuntimeError(f"{tool} failed: {result.stderr.strip()}")
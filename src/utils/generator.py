@@ -1,7 +1,14 @@
+import hashlib
+import json
+import math
+import os
 import random
 import string
+import zlib
 from datetime import datetime, timedelta
 
+import numpy as np
+
 STARTING_DATA_WEIGHTS = {
     "users": 0.20,
     "categories": 0.01,
@@ -17,6 +24,46 @@ STARTING_DATA_WEIGHTS = {
 
 STARTING_DATA_TABLES = list(STARTING_DATA_WEIGHTS.keys())
 
+SHAPE_PROFILES = {
+    "default": STARTING_DATA_WEIGHTS,
+    "order-heavy": {
+        "users": 0.08,
+        "categories": 0.005,
+        "products": 0.04,
+        "orders": 0.30,
+        "order_items": 0.42,
+        "reviews": 0.02,
+        "warehouses": 0.002,
+        "inventory": 0.02,
+        "addresses": 0.02,
+        "payments": 0.093,
+    },
+    "catalog-heavy": {
+        "users": 0.05,
+        "categories": 0.05,
+        "products": 0.40,
+        "orders": 0.05,
+        "order_items": 0.08,
+        "reviews": 0.05,
+        "warehouses": 0.02,
+        "inventory": 0.25,
+        "addresses": 0.02,
+        "payments": 0.03,
+    },
+    "review-heavy": {
+        "users": 0.15,
+        "categories": 0.01,
+        "products": 0.10,
+        "orders": 0.10,
+        "order_items": 0.14,
+        "reviews": 0.40,
+        "warehouses": 0.005,
+        "inventory": 0.04,
+        "addresses": 0.03,
+        "payments": 0.025,
+    },
+}
+
 STARTING_DATA_INSERT_ORDER = [
     "users",
     "categories",
@@ -45,135 +92,588 @@ STARTING_DATA_ORDER = [
 
 STARTING_DATA_DELETE_ORDER = STARTING_DATA_ORDER.copy()
 
+STARTING_DATA_FIELDS = {
+    "users": ["name", "email", "created_at", "preferences"],
+    "categories": ["name", "parent_id"],
+    "warehouses": ["name", "location"],
+    "products": ["name", "price", "category_id", "attributes"],
+    "orders": ["user_id", "status", "total", "created_at"],
+    "order_items": ["order_id", "product_id", "quantity", "price"],
+    "reviews": ["user_id", "product_id", "rating", "comment", "metadata"],
+    "inventory": ["product_id", "warehouse_id", "quantity"],
+    "addresses": ["user_id", "city", "country", "details"],
+    "payments": ["order_id", "method", "amount", "data"],
+}
+
+GENERATOR_MODES = ["rows", "columnar"]
+
+LOAD_STRATEGIES = ["values", "copy", "copy_binary"]
+
+STATEMENT_MODES = ["adhoc", "prepared"]
+
+FETCH_MODES = ["fetchall", "stream"]
+
+DEFAULT_DATASET_OPTIONS = {
+    "generator": "rows",
+    "seed": None,
+    "seed_given": True,
+    "workers": 1,
+    "reference_time": None,
+    "cache": True,
+    "distribution": "uniform",
+    "probe_hit_ratio": 1.0,
+    "consistent": False,
+    "ingest_batches": 100,
+    "ingest_batch_orders": 1_000,
+    "row_width": "",
+    "shape": "default",
+    "weights": None,
+    "load_strategy": "copy",
+    "load_connections": 1,
+    "defer_constraints": False,
+    "maintenance_workers": 4,
+    "unlogged": False,
+    "statement_mode": "adhoc",
+    "fetch_mode": "fetchall",
+    "itersize": 2_000,
+}
+
+DATASET_SCHEMA_VERSION = 5
+
+DATASET_IDENTITY_OPTIONS = [
+    "generator",
+    "seed",
+    "distribution",
+    "consistent",
+    "row_width",
+    "weights",
+]
+
+KEY_COLUMNS = ["user_id", "product_id", "order_id", "category_id", "warehouse_id"]
+
+TIME_COLUMNS = ["created_at"]
+
+KEY_DISTRIBUTIONS = {"uniform": [], "zipf": [1.1], "hotspot": [0.1, 0.9]}
+
+TIME_DISTRIBUTIONS = {"uniform": [], "clustered": [12, 3]}
+
+DATE_RANGE_DAYS = 365
+
+ROW_WIDTH_DEFAULTS = {
+    "reviews.comment": 100,
+    "products.tags": 3,
+    "products.attributes": 0,
+}
+
+ROW_WIDTH_BYTES = {"reviews.comment": 1, "products.tags": 5, "products.attributes": 10}
+
+WIDTH_SUFFIXES = {"k": 2**10, "m": 2**20}
+
+RECONCILE_STREAM = 2**32
+
+TOP_UP_STREAM = RECONCILE_STREAM + 1
+
+PROBE_STREAM = RECONCILE_STREAM + 2
+
+APPEND_STREAM = RECONCILE_STREAM + 3
+
+APPEND_TABLES = ["orders", "order_items", "payments"]
+
+APPEND_MEAN_GAP_SECONDS = 1.0
+
+APPEND_MAX_ITEMS = 3
+
+PROBE_STRIDE = 97
+
+EMAIL_WIDTH = 32
+
+NULLABLE_COLUMNS = {"parent_id"}
+
+TRANSACTION_ID_POOL_SIZE = 1024
+
+_transaction_id_rng = random.Random(TRANSACTION_ID_POOL_SIZE)
+
+TRANSACTION_IDS = [
+    "".join(_transaction_id_rng.choices(string.ascii_letters, k=20))
+    for _ in range(TRANSACTION_ID_POOL_SIZE)
+]
+
+VALUE_POOLS = {
+    ("users", "preferences"): [
+        {"theme": theme, "notifications": notifications, "language": language}
+        for theme in ["light", "dark"]
+        for notifications in [True, False]
+        for language in ["en", "pl", "de"]
+    ],
+    ("reviews", "metadata"): [
+        {"helpful": helpful, "verified": verified}
+        for helpful in range(0, 51)
+        for verified in [True, False]
+    ],
+    ("payments", "data"): [
+        {"transaction_id": transaction_id, "processed": processed}
+        for transaction_id in TRANSACTION_IDS
+        for processed in [True, False]
+    ],
+}
+
+JSON_POOLS = {
+    key: np.array([json.dumps(value) for value in values], dtype=object)
+    for key, values in VALUE_POOLS.items()
+}
+
+JSON_POOL_LOOKUP = {
+    key: {
+        tuple(value.items()): dumped for value, dumped in zip(values, JSON_POOLS[key])
+    }
+    for key, values in VALUE_POOLS.items()
+}
+
+HASH_GAMMA = np.uint64(0x9E3779B97F4A7C15)
+
+HASH_MIXERS = [
+    (np.uint64(30), np.uint64(0xBF58476D1CE4E5B9)),
+    (np.uint64(27), np.uint64(0x94D049BB133111EB)),
+]
+
+ASCII_LETTERS = np.frombuffer(string.ascii_letters.encode("ascii"), dtype=np.uint8)
+
+
+def dataset_options(dataset=None):
+    options = dict(DEFAULT_DATASET_OPTIONS)
+    options.update(dataset or {})
+    return options
+
+
+def resolve_seed(seed=None):
+    if seed is None:
+        return int(np.random.SeedSequence().entropy % (2**63))
+    return int(seed)
+
+
+def table_seed(base_seed, table, stream=0):
+    table_index = STARTING_DATA_TABLES.index(table)
+    sequence = np.random.SeedSequence(base_seed, spawn_key=(table_index, stream))
+    return int(sequence.generate_state(1, dtype=np.uint64)[0])
+
+
+def table_random(base_seed, table, stream=0):
+    return random.Random(table_seed(base_seed, table, stream))
+
+
+def table_randoms(base_seed, stream=0):
+    return {
+        table: table_random(base_seed, table, stream) for table in STARTING_DATA_TABLES
+    }
+
+
+def dataset_identity(total_records, dataset=None):
+    options = dataset_options(dataset)
+    identity = [DATASET_SCHEMA_VERSION, int(total_records)]
+    return identity + [options[name] for name in DATASET_IDENTITY_OPTIONS]
+
+
+def dataset_key(dataset=None):
+    options = dataset_options(dataset)
+    if not options["seed_given"]:
+        options["seed"] = None
+    version, _, *identity = dataset_identity(0, options)
+    return json.dumps([version, *identity], sort_keys=True)
+
+
+def reconcilable_dataset(dataset=None):
+    options = dataset_options(dataset)
+    distributions = parse_distribution(options["distribution"]).values()
+    uniform = all(kind == "uniform" for kind, _ in distributions)
+    return uniform and not options["consistent"]
+
 
-def random_string(length=10):
-    return "".join(random.choices(string.ascii_letters, k=length))
+def dataset_key_matches(stored_key, dataset=None):
+    options = dataset_options(dataset)
+    if stored_key is None or options["seed_given"]:
+        return stored_key == dataset_key(options)
+    try:
+        version, *identity = json.loads(stored_key)
+    except (TypeError, ValueError):
+        return False
+    if len(identity) == len(DATASET_IDENTITY_OPTIONS):
+        identity[DATASET_IDENTITY_OPTIONS.index("seed")] = None
+    return json.dumps([version, *identity], sort_keys=True) == dataset_key(options)
 
 
-def random_email():
-    return f"{random_string(8)}@{random_string(5)}.com"
+def dataset_fingerprint(total_records, dataset=None):
+    options = dataset_options(dataset)
+    reference = options["reference_time"]
+    payload = json.dumps(
+        dataset_identity(total_records, options)
+        + [reference.isoformat() if reference else None]
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
 
 
-def random_date():
-    return datetime.now() - timedelta(days=random.randint(0, 365))
+def parse_distribution(spec):
+    distributions = {}
+    for part in filter(None, (spec or "uniform").replace(" ", "").split(",")):
+        target, _, value = part.rpartition("=")
+        kind, *params = value.split(":")
+        column = target.rsplit(".", 1)[-1]
+        if (target and column in TIME_COLUMNS) or (not target and kind == "clustered"):
+            choices, columns = TIME_DISTRIBUTIONS, TIME_COLUMNS
+        elif column in KEY_COLUMNS or not target:
+            choices, columns = KEY_DISTRIBUTIONS, KEY_COLUMNS
+        else:
+            raise ValueError(f"unknown distribution column: {target}")
+        if kind not in choices:
+            raise ValueError(f"unsupported distribution for {column or 'keys'}: {kind}")
 
+        defaults = choices[kind]
+        if len(params) > len(defaults):
+            raise ValueError(f"too many parameters for {kind}: {value}")
+        values = [float(param) for param in params] + defaults[len(params) :]
+        for name in [target] if target else columns:
+            distributions[name] = (kind, values)
+    return distributions
 
-def generate_user():
+
+def parse_row_width(spec):
+    widths = dict(ROW_WIDTH_DEFAULTS)
+    for part in filter(None, (spec or "").replace(" ", "").split(",")):
+        name, _, value = part.partition("=")
+        if name not in ROW_WIDTH_DEFAULTS:
+            raise ValueError(f"unknown width column: {name}")
+        multiplier = WIDTH_SUFFIXES.get(value[-1:].lower(), 1)
+        digits = value[:-1] if multiplier > 1 else value
+        if not digits.isdigit():
+            raise ValueError(f"invalid width for {name}: {value}")
+        widths[name] = int(digits) * multiplier
+    if widths["reviews.comment"] < 1:
+        raise ValueError("reviews.comment width must be at least 1")
+    return widths
+
+
+class GeneratorContext:
+    __slots__ = (
+        "reference",
+        "distributions",
+        "cluster_centers",
+        "consistency_seed",
+        "row_widths",
+    )
+
+    def __init__(
+        self,
+        reference_time=None,
+        distribution="uniform",
+        consistent=False,
+        row_width="",
+        base_seed=None,
+    ):
+        self.reference = reference_time
+        self.distributions = parse_distribution(distribution)
+        clusters = [
+            params
+            for kind, params in self.distributions.values()
+            if kind == "clustered"
+        ]
+        rng = np.random.default_rng(base_seed)
+        count = int(max((params[0] for params in clusters), default=0))
+        self.cluster_centers = np.sort(rng.integers(0, DATE_RANGE_DAYS + 1, count))
+        self.consistency_seed = resolve_seed(base_seed) if consistent else None
+        self.row_widths = parse_row_width(row_width)
+
+    def reference_time(self):
+        return self.reference or datetime.now()
+
+    def distribution_for(self, name):
+        if name is None:
+            return "uniform", []
+        column = name.rsplit(".", 1)[-1]
+        distributions = self.distributions
+        return distributions.get(name) or distributions.get(column) or ("uniform", [])
+
+    def row_width(self, name):
+        return self.row_widths[name]
+
+    def consistent(self):
+        return self.consistency_seed is not None
+
+
+DEFAULT_CONTEXT = GeneratorContext()
+
+
+def generator_context(dataset=None):
+    options = dataset_options(dataset)
+    return GeneratorContext(
+        options["reference_time"],
+        options["distribution"],
+        options["consistent"],
+        options["row_width"],
+        options["seed"],
+    )
+
+
+def scatter_step(upper):
+    step = int(upper * 0.6180339887) | 1
+    while math.gcd(step, upper) != 1:
+        step += 2
+    return step
+
+
+def skewed_keys(kind, params, upper, u, v):
+    u, v = np.asarray(u), np.asarray(v)
+    if kind == "zipf":
+        exponent = params[0]
+        if exponent == 1:
+            ranks = (upper + 1) ** u
+        else:
+            ranks = ((upper + 1) ** (1 - exponent) - 1) * u + 1
+            ranks = ranks ** (1 / (1 - exponent))
+        ranks = np.minimum(np.floor(ranks), upper).astype(np.int64)
+    else:
+        fraction, weight = params
+        hot = max(1, int(upper * fraction))
+        ranks = np.floor(np.where(v < weight, u * hot, u * upper)).astype(np.int64) + 1
+    return (ranks - 1) * scatter_step(upper) % upper + 1
+
+
+def clustered_days(cluster_centers, params, u, v):
+    u, v = np.asarray(u), np.asarray(v)
+    centers = cluster_centers[: int(params[0])]
+    picked = centers[np.minimum((u * len(centers)).astype(np.int64), len(centers) - 1)]
+    jitter = np.round((v * 2 - 1) * params[1]).astype(np.int64)
+    return np.clip(picked + jitter, 0, DATE_RANGE_DAYS)
+
+
+def pick_key(rng, upper, name=None, ctx=DEFAULT_CONTEXT):
+    kind, params = ctx.distribution_for(name)
+    if kind == "uniform":
+        return rng.randint(1, upper)
+    return int(skewed_keys(kind, params, upper, rng.random(), rng.random()))
+
+
+def wide_row_bytes(table, spec=None):
+    widths = parse_row_width(spec)
+    prefix = f"{table}."
+    return sum(
+        width * ROW_WIDTH_BYTES[name]
+        for name, width in widths.items()
+        if name.startswith(prefix)
+    )
+
+
+def random_string(length=10, rng=random):
+    return "".join(rng.choices(string.ascii_letters, k=length))
+
+
+def random_email(rng=random):
+    return f"{random_string(8, rng)}@{random_string(5, rng)}.com"
+
+
+def probe_email(user_id):
+    return f"user{user_id}@example.com"
+
+
+def is_probe_id(user_id):
+    return (user_id - 1) % PROBE_STRIDE == 0
+
+
+def plant_probe_users(users, start_id=1):
+    for user_id, user in enumerate(users, start=start_id):
+        if is_probe_id(user_id):
+            user["email"] = probe_email(user_id)
+    return users
+
+
+def plant_probe_user_ids(users, field_name="id"):
+    for user in users:
+        if is_probe_id(user[field_name]):
+            user["email"] = probe_email(user[field_name])
+    return users
+
+
+def random_date(rng=random, name=None, ctx=DEFAULT_CONTEXT):
+    kind, params = ctx.distribution_for(name)
+    if kind == "clustered":
+        days = int(
+            clustered_days(ctx.cluster_centers, params, rng.random(), rng.random())
+        )
+    else:
+        days = rng.randint(0, DATE_RANGE_DAYS)
+    return ctx.reference_time() - timedelta(days=days)
+
+
+def pooled_json(table, field, value):
+    dumped = JSON_POOL_LOOKUP[(table, field)].get(tuple(value.items()))
+    return dumped if dumped is not None else json.dumps(value)
+
+
+def generate_user(rng=random, ctx=DEFAULT_CONTEXT):
     return {
         "id": None,
-        "name": random_string(20),
-        "email": random_email(),
-        "created_at": random_date(),
-        "preferences": {
-            "theme": random.choice(["light", "dark"]),
-            "notifications": random.choice([True, False]),
-            "language": random.choice(["en", "pl", "de"]),
-        },
+        "name": random_string(20, rng),
+        "email": random_email(rng),
+        "created_at": random_date(rng, "users.created_at", ctx),
+        "preferences": rng.choice(VALUE_POOLS[("users", "preferences")]),
     }
 
 
-def generate_product(category_id):
+def generate_product(category_id, rng=random, ctx=DEFAULT_CONTEXT):
     return {
         "id": None,
-        "name": random_string(30),
-        "price": round(random.uniform(10, 1000), 2),
+        "name": random_string(30, rng),
+        "price": round(rng.uniform(10, 1000), 2),
         "category_id": category_id,
         "attributes": {
-            "color": random.choice(["red", "blue", "green", "black", "white"]),
-            "weight": random.randint(1, 100),
-            "tags": [random_string(5) for _ in range(3)],
+            "color": rng.choice(["red", "blue", "green", "black", "white"]),
+            "weight": rng.randint(1, 100),
+            "tags": [
+                random_string(5, rng) for _ in range(ctx.row_width("products.tags"))
+            ],
+            **{
+                f"attr_{idx}": random_string(10, rng)
+                for idx in range(ctx.row_width("products.attributes"))
+            },
         },
     }
 
 
-def generate_category(parent_id=None):
-    return {"id": None, "name": random_string(15), "parent_id": parent_id}
+def generate_category(parent_id=None, rng=random):
+    return {"id": None, "name": random_string(15, rng), "parent_id": parent_id}
 
 
-def generate_order(user_id):
+def generate_order(user_id, rng=random, ctx=DEFAULT_CONTEXT):
     return {
         "id": None,
         "user_id": user_id,
-        "status": random.choice(["pending", "completed", "cancelled"]),
-        "total": round(random.uniform(50, 5000), 2),
-        "created_at": random_date(),
+        "status": rng.choice(["pending", "completed", "cancelled"]),
+        "total": round(rng.uniform(50, 5000), 2),
+        "created_at": random_date(rng, "orders.created_at", ctx),
     }
 
 
-def generate_order_item(order_id, product_id):
+def generate_order_item(order_id, product_id, rng=random):
     return {
         "id": None,
         "order_id": order_id,
         "product_id": product_id,
-        "quantity": random.randint(1, 10),
-        "price": round(random.uniform(10, 500), 2),
+        "quantity": rng.randint(1, 10),
+        "price": round(rng.uniform(10, 500), 2),
     }
 
 
-def generate_review(user_id, product_id):
+def generate_review(user_id, product_id, rng=random, ctx=DEFAULT_CONTEXT):
     return {
         "id": None,
         "user_id": user_id,
         "product_id": product_id,
-        "rating": random.randint(1, 5),
-        "comment": random_string(100),
-        "metadata": {
-            "helpful": random.randint(0, 50),
-            "verified": random.choice([True, False]),
-        },
+        "rating": rng.randint(1, 5),
+        "comment": random_string(ctx.row_width("reviews.comment"), rng),
+        "metadata": rng.choice(VALUE_POOLS[("reviews", "metadata")]),
     }
 
 
-def generate_address(user_id):
+def generate_address(user_id, rng=random):
     return {
         "id": None,
         "user_id": user_id,
-        "city": random_string(15),
-        "country": random_string(15),
+        "city": random_string(15, rng),
+        "country": random_string(15, rng),
         "details": {
-            "street": random_string(20),
-            "zip": random_string(6),
-            "phone": random_string(10),
+            "street": random_string(20, rng),
+            "zip": random_string(6, rng),
+            "phone": random_string(10, rng),
         },
     }
 
 
-def generate_payment(order_id):
+def generate_payment(order_id, rng=random):
     return {
         "id": None,
         "order_id": order_id,
-        "method": random.choice(["card", "cash", "transfer"]),
-        "amount": round(random.uniform(50, 5000), 2),
-        "data": {
-            "transaction_id": random_string(20),
-            "processed": random.choice([True, False]),
-        },
+        "method": rng.choice(["card", "cash", "transfer"]),
+        "amount": round(rng.uniform(50, 5000), 2),
+        "data": rng.choice(VALUE_POOLS[("payments", "data")]),
     }
 
 
-def generate_inventory(product_id, warehouse_id):
+def generate_inventory(product_id, warehouse_id, rng=random):
     return {
         "id": None,
         "product_id": product_id,
         "warehouse_id": warehouse_id,
-        "quantity": random.randint(0, 1000),
+        "quantity": rng.randint(0, 1000),
     }
 
 
-def generate_warehouse():
-    return {"id": None, "name": random_string(15), "location": random_string(20)}
+def generate_warehouse(rng=random):
+    return {
+        "id": None,
+        "name": random_string(15, rng),
+        "location": random_string(20, rng),
+    }
+
 
+def iter_append_batches(
+    key_ranges, start_ids, batch_orders, batches, rng=random, ctx=DEFAULT_CONTEXT
+):
+    next_ids = {table: start_ids[table] + 1 for table in APPEND_TABLES}
+    user_low, user_high = key_ranges["users"]
+    product_low, product_high = key_ranges["products"]
+    clock = ctx.reference_time()
+    for _ in range(batches):
+        batch = {table: [] for table in APPEND_TABLES}
+        for _ in range(batch_orders):
+            gap = rng.expovariate(1 / APPEND_MEAN_GAP_SECONDS)
+            clock += timedelta(microseconds=max(1, round(gap * 1_000_000)))
+            user_key = pick_key(rng, user_high - user_low + 1, "orders.user_id", ctx)
+            user_id = user_low + user_key - 1
+            order = generate_order(user_id, rng, ctx)
+            order.update(id=next_ids["orders"], status="pending", created_at=clock)
 
-def generate_bulk_users(count):
-    return [generate_user() for _ in range(count)]
+            items = []
+            for _ in range(rng.randint(1, APPEND_MAX_ITEMS)):
+                key = pick_key(
+                    rng, product_high - product_low + 1, "order_items.product_id", ctx
+                )
+                item = generate_order_item(order["id"], product_low + key - 1, rng)
+                item["id"] = next_ids["order_items"] + len(items)
+                if ctx.consistent():
+                    cents = product_price_cents(item["product_id"], ctx)
+                    item["price"] = float(cents / 100)
+                items.append(item)
+            order["total"] = round(sum(i["price"] * i["quantity"] for i in items), 2)
 
+            payment = generate_payment(order["id"], rng)
+            payment.update(id=next_ids["payments"], amount=order["total"])
 
-def generate_bulk_products(count, category_ids):
-    return [generate_product(random.choice(category_ids)) for _ in range(count)]
+            batch["orders"].append(order)
+            batch["order_items"].extend(items)
+            batch["payments"].append(payment)
+            next_ids["orders"] += 1
+            next_ids["order_items"] += len(items)
+            next_ids["payments"] += 1
+        yield batch
 
 
-def generate_bulk_categories(count):
-    return generate_bulk_categories_incremental(count, start_id=1)
+def generate_bulk_users(count, rng=random, ctx=DEFAULT_CONTEXT):
+    return [generate_user(rng, ctx) for _ in range(count)]
+
+
+def generate_bulk_products(count, category_ids, rng=random, ctx=DEFAULT_CONTEXT):
+    return [
+        generate_product(
+            category_ids[
+                pick_key(rng, len(category_ids), "products.category_id", ctx) - 1
+            ],
+            rng,
+            ctx,
+        )
+        for _ in range(count)
+    ]
+
+
+def generate_bulk_categories(count, rng=random):
+    return generate_bulk_categories_incremental(count, start_id=1, rng=rng)
 
 
 def assign_sequential_ids(records, start_id=1, field_name="id"):
@@ -182,30 +682,80 @@ def assign_sequential_ids(records, start_id=1, field_name="id"):
     return records
 
 
-def generate_bulk_categories_incremental(count, start_id=1, existing_ids=None):
+def free_ids(existing_ids, count):
+    taken = set(existing_ids)
+    ids = []
+    candidate = 1
+    while len(ids) < count:
+        if candidate not in taken:
+            ids.append(candidate)
+        candidate += 1
+    return ids
+
+
+def assign_ids(records, ids, field_name="id"):
+    for record_id, record in zip(ids, records):
+        record[field_name] = record_id
+    return records
+
+
+def generate_bulk_categories_incremental(
+    count, start_id=1, existing_ids=None, rng=random
+):
     known_ids = list(existing_ids or [])
     cats = []
     for offset in range(count):
         category_id = start_id + offset
-        parent = (
-            random.choice(known_ids) if known_ids and random.random() > 0.7 else None
-        )
-        cat = generate_category(parent)
+        parent = rng.choice(known_ids) if known_ids and rng.random() > 0.7 else None
+        cat = generate_category(parent, rng)
         cat["id"] = category_id
         cats.append(cat)
         known_ids.append(category_id)
     return cats
 
 
-def split_starting_data(total_records):
+def normalize_weights(weights):
+    unknown = sorted(set(weights) - set(STARTING_DATA_TABLES))
+    if unknown:
+        raise ValueError(f"unknown tables in weights: {', '.join(unknown)}")
+    values = {table: weights.get(table, 0) for table in STARTING_DATA_TABLES}
+    for table, value in values.items():
+        if not isinstance(value, (int, float)) or isinstance(value, bool) or value < 0:
+            raise ValueError(f"weight for {table} must be a non-negative number")
+    total = sum(values.values())
+    if total <= 0:
+        raise ValueError("weights must not all be zero")
+    return {table: value / total for table, value in values.items()}
+
+
+def load_shape(spec):
+    if spec in SHAPE_PROFILES:
+        return dict(SHAPE_PROFILES[spec])
+    if not os.path.isfile(spec):
+        raise ValueError(
+            f"unknown shape profile or weight file: {spec} "
+            f"(profiles: {', '.join(SHAPE_PROFILES)})"
+        )
+    with open(spec) as f:
+        try:
+            weights = json.load(f)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"invalid weight file {spec}: {e}")
+    if not isinstance(weights, dict):
+        raise ValueError(f"weight file {spec} must contain a JSON object")
+    return normalize_weights(weights)
+
+
+def split_starting_data(total_records, weights=None):
+    weights = weights or STARTING_DATA_WEIGHTS
     total = int(total_records)
-    if total < len(STARTING_DATA_WEIGHTS):
+    if total < len(weights):
         raise ValueError("target size is too small to split across all tables")
 
-    raw = {name: total * weight for name, weight in STARTING_DATA_WEIGHTS.items()}
+    raw = {name: total * weight for name, weight in weights.items()}
     counts = {name: int(value) for name, value in raw.items()}
 
-    for table in STARTING_DATA_WEIGHTS:
+    for table in weights:
         if counts[table] == 0:
             counts[table] = 1
 
@@ -214,7 +764,7 @@ def split_starting_data(total_records):
 
     if remainder > 0:
         order = sorted(
-            STARTING_DATA_WEIGHTS.keys(),
+            weights.keys(),
             key=lambda name: raw[name] - int(raw[name]),
             reverse=True,
         )
@@ -236,59 +786,545 @@ def split_starting_data(total_records):
     return counts
 
 
-def generate_bulk_warehouses(count):
-    return [generate_warehouse() for _ in range(count)]
+def generate_bulk_warehouses(count, rng=random):
+    return [generate_warehouse(rng) for _ in range(count)]
 
 
-def generate_bulk_orders(count, user_count):
+def generate_bulk_orders(count, user_count, rng=random, ctx=DEFAULT_CONTEXT):
     if user_count < 1:
         return []
-    return [generate_order(random.randint(1, user_count)) for _ in range(count)]
+    return [
+        generate_order(pick_key(rng, user_count, "orders.user_id", ctx), rng, ctx)
+        for _ in range(count)
+    ]
 
 
-def generate_bulk_order_items(count, order_count, product_count):
+def generate_bulk_order_items(
+    count, order_count, product_count, rng=random, ctx=DEFAULT_CONTEXT
+):
     if order_count < 1 or product_count < 1:
         return []
     return [
         generate_order_item(
-            random.randint(1, order_count),
-            random.randint(1, product_count),
+            pick_key(rng, order_count, "order_items.order_id", ctx),
+            pick_key(rng, product_count, "order_items.product_id", ctx),
+            rng,
         )
         for _ in range(count)
     ]
 
 
-def generate_bulk_reviews(count, user_count, product_count):
+def generate_bulk_reviews(
+    count, user_count, product_count, rng=random, ctx=DEFAULT_CONTEXT
+):
     if user_count < 1 or product_count < 1:
         return []
     return [
         generate_review(
-            random.randint(1, user_count),
-            random.randint(1, product_count),
+            pick_key(rng, user_count, "reviews.user_id", ctx),
+            pick_key(rng, product_count, "reviews.product_id", ctx),
+            rng,
+            ctx,
         )
         for _ in range(count)
     ]
 
 
-def generate_bulk_inventory(count, product_count, warehouse_count):
+def generate_bulk_inventory(
+    count, product_count, warehouse_count, rng=random, ctx=DEFAULT_CONTEXT
+):
     if product_count < 1 or warehouse_count < 1:
         return []
     return [
         generate_inventory(
-            random.randint(1, product_count),
-            random.randint(1, warehouse_count),
+            pick_key(rng, product_count, "inventory.product_id", ctx),
+            pick_key(rng, warehouse_count, "inventory.warehouse_id", ctx),
+            rng,
         )
         for _ in range(count)
     ]
 
 
-def generate_bulk_addresses(count, user_count):
+def generate_bulk_addresses(count, user_count, rng=random, ctx=DEFAULT_CONTEXT):
     if user_count < 1:
         return []
-    return [generate_address(random.randint(1, user_count)) for _ in range(count)]
+    return [
+        generate_address(pick_key(rng, user_count, "addresses.user_id", ctx), rng)
+        for _ in range(count)
+    ]
 
 
-def generate_bulk_payments(count, order_count):
+def generate_bulk_payments(count, order_count, rng=random, ctx=DEFAULT_CONTEXT):
     if order_count < 1:
         return []
-    return [generate_payment(random.randint(1, order_count)) for _ in range(count)]
+    return [
+        generate_payment(pick_key(rng, order_count, "payments.order_id", ctx), rng)
+        for _ in range(count)
+    ]
+
+
+def generate_table_records(
+    table, count, counts, start_id=1, rng=random, ctx=DEFAULT_CONTEXT
+):
+    records = generate_random_records(table, count, counts, start_id, rng, ctx)
+    if records and ctx.consistent():
+        ids = id_column(len(records), start_id)
+        for name, column in consistent_columns(table, ids, counts, ctx).items():
+            for record, value in zip(records, column_values(name, column)):
+                record[name] = value
+    return records
+
+
+def generate_random_records(
+    table, count, counts, start_id=1, rng=random, ctx=DEFAULT_CONTEXT
+):
+    if table == "users":
+        return plant_probe_users(generate_bulk_users(count, rng, ctx), start_id)
+    if table == "categories":
+        return generate_bulk_categories_incremental(
+            count, start_id=start_id, existing_ids=range(1, start_id), rng=rng
+        )
+    if table == "warehouses":
+        return generate_bulk_warehouses(count, rng=rng)
+    if table == "products":
+        return generate_bulk_products(
+            count, range(1, counts["categories"] + 1), rng, ctx
+        )
+    if table == "orders":
+        return generate_bulk_orders(count, counts["users"], rng, ctx)
+    if table == "order_items":
+        return generate_bulk_order_items(
+            count, counts["orders"], counts["products"], rng, ctx
+        )
+    if table == "reviews":
+        return generate_bulk_reviews(
+            count, counts["users"], counts["products"], rng, ctx
+        )
+    if table == "inventory":
+        return generate_bulk_inventory(
+            count, counts["products"], counts["warehouses"], rng, ctx
+        )
+    if table == "addresses":
+        return generate_bulk_addresses(count, counts["users"], rng, ctx)
+    if table == "payments":
+        return generate_bulk_payments(count, counts["orders"], rng, ctx)
+    raise ValueError(f"unknown table: {table}")
+
+
+def random_string_column(rng, count, length=10):
+    codes = rng.integers(0, len(ASCII_LETTERS), size=(count, length), dtype=np.uint8)
+    return ASCII_LETTERS[codes].view(f"S{length}").reshape(count)
+
+
+def random_email_column(rng, count):
+    buffer = np.empty((count, 18), dtype=np.uint8)
+    buffer[:, :8] = ASCII_LETTERS[rng.integers(0, len(ASCII_LETTERS), (count, 8))]
+    buffer[:, 8] = ord("@")
+    buffer[:, 9:14] = ASCII_LETTERS[rng.integers(0, len(ASCII_LETTERS), (count, 5))]
+    buffer[:, 14:] = np.frombuffer(b".com", dtype=np.uint8)
+    return buffer.view("S18").reshape(count)
+
+
+def plant_probe_emails(emails, ids):
+    emails = emails.astype(f"S{EMAIL_WIDTH}")
+    probe_ids = ids[is_probe_id(ids)]
+    emails[is_probe_id(ids)] = [probe_email(user_id) for user_id in probe_ids.tolist()]
+    return emails
+
+
+def random_date_column(rng, count, name=None, ctx=DEFAULT_CONTEXT):
+    now = np.datetime64(ctx.reference_time(), "us")
+    kind, params = ctx.distribution_for(name)
+    if kind == "clustered":
+        u, v = rng.random(count), rng.random(count)
+        days = clustered_days(ctx.cluster_centers, params, u, v)
+    else:
+        days = rng.integers(0, DATE_RANGE_DAYS + 1, count)
+    return now - days.astype("timedelta64[D]")
+
+
+def choice_column(rng, count, values):
+    return np.asarray(values)[rng.integers(0, len(values), count)]
+
+
+def price_column(rng, count, low, high):
+    return np.round(rng.uniform(low, high, count), 2)
+
+
+def pool_column(rng, count, table, field):
+    return rng.integers(0, len(VALUE_POOLS[(table, field)]), count, dtype=np.int16)
+
+
+def key_column(rng, count, upper, name=None, ctx=DEFAULT_CONTEXT):
+    kind, params = ctx.distribution_for(name)
+    if kind == "uniform":
+        return rng.integers(1, upper + 1, count, dtype=np.int64)
+    return skewed_keys(kind, params, upper, rng.random(count), rng.random(count))
+
+
+def id_column(count, start_id=1):
+    return np.arange(start_id, start_id + count, dtype=np.int64)
+
+
+def hashed_uniform(name, ids, ctx):
+    salt = np.random.SeedSequence(
+        ctx.consistency_seed, spawn_key=(zlib.crc32(name.encode("utf-8")),)
+    ).generate_state(1, dtype=np.uint64)[0]
+    z = np.asarray(ids, dtype=np.uint64) * HASH_GAMMA + salt
+    for shift, multiplier in HASH_MIXERS:
+        z = (z ^ (z >> shift)) * multiplier
+    z = z ^ (z >> np.uint64(31))
+    return (z >> np.uint64(11)).astype(np.float64) / 2**53
+
+
+def hashed_keys(name, ids, upper, ctx):
+    u = hashed_uniform(name, ids, ctx)
+    kind, params = ctx.distribution_for(name)
+    if kind == "uniform":
+        return np.minimum(np.floor(u * upper).astype(np.int64), upper - 1) + 1
+    return skewed_keys(kind, params, upper, u, hashed_uniform(f"{name}#", ids, ctx))
+
+
+def block_parents(child_ids, child_count, parent_count):
+    return (np.asarray(child_ids, dtype=np.int64) - 1) * parent_count // child_count + 1
+
+
+def block_first_children(parent_ids, child_count, parent_count):
+    offsets = (np.asarray(parent_ids, dtype=np.int64) - 1) * child_count
+    return -(-offsets // parent_count) + 1
+
+
+def product_price_cents(product_ids, ctx):
+    return 1000 + np.floor(hashed_uniform("products.price", product_ids, ctx) * 99_000)
+
+
+def order_item_products(item_ids, counts, ctx):
+    return hashed_keys("order_items.product_id", item_ids, counts["products"], ctx)
+
+
+def order_item_quantities(item_ids, ctx):
+    return np.floor(hashed_uniform("order_items.quantity", item_ids, ctx) * 10) + 1
+
+
+def order_users(order_ids, counts, ctx):
+    return hashed_keys("orders.user_id", order_ids, counts["users"], ctx)
+
+
+def order_totals(order_ids, counts, ctx):
+    item_count, order_count = counts["order_items"], counts["orders"]
+    first = block_first_children(order_ids, item_count, order_count)
+    lengths = block_first_children(np.asarray(order_ids) + 1, item_count, order_count)
+    lengths = lengths - first
+    offsets = np.cumsum(lengths) - lengths
+    item_ids = np.repeat(first - offsets, lengths) + np.arange(lengths.sum())
+    cents = product_price_cents(order_item_products(item_ids, counts, ctx), ctx)
+    quantities = order_item_quantities(item_ids, ctx)
+    running = np.concatenate([[0], np.cumsum(cents * quantities)])
+    return (running[offsets + lengths] - running[offsets]) / 100
+
+
+def consistent_columns(table, ids, counts, ctx):
+    if table == "products":
+        return {"price": product_price_cents(ids, ctx) / 100}
+    if counts["order_items"] < 1 or counts["products"] < 1 or counts["users"] < 1:
+        return {}
+    if table == "orders":
+        return {
+            "user_id": order_users(ids, counts, ctx),
+            "total": order_totals(ids, counts, ctx),
+        }
+    if table == "order_items":
+        product_ids = order_item_products(ids, counts, ctx)
+        return {
+            "order_id": block_parents(ids, counts["order_items"], counts["orders"]),
+            "product_id": product_ids,
+            "quantity": order_item_quantities(ids, ctx).astype(np.int64),
+            "price": product_price_cents(product_ids, ctx) / 100,
+        }
+    if table == "reviews":
+        item_ids = block_parents(ids, counts["reviews"], counts["order_items"])
+        order_ids = block_parents(item_ids, counts["order_items"], counts["orders"])
+        return {
+            "user_id": order_users(order_ids, counts, ctx),
+            "product_id": order_item_products(item_ids, counts, ctx),
+        }
+    if table == "payments":
+        order_ids = block_parents(ids, counts["payments"], counts["orders"])
+        return {"order_id": order_ids, "amount": order_totals(order_ids, counts, ctx)}
+    return {}
+
+
+def generate_columnar_users(count, rng, start_id=1, ctx=DEFAULT_CONTEXT):
+    ids = id_column(count, start_id)
+    return {
+        "id": ids,
+        "name": random_string_column(rng, count, 20),
+        "email": plant_probe_emails(random_email_column(rng, count), ids),
+        "created_at": random_date_column(rng, count, "users.created_at", ctx),
+        "preferences": pool_column(rng, count, "users", "preferences"),
+    }
+
+
+def generate_columnar_categories(count, rng, start_id=1):
+    ids = id_column(count, start_id)
+    known = ids - 1
+    has_parent = (known > 0) & (rng.random(count) > 0.7)
+    parents = np.floor(rng.random(count) * known).astype(np.int64) + 1
+    return {
+        "id": ids,
+        "name": random_string_column(rng, count, 15),
+        "parent_id": np.where(has_parent, parents, 0),
+    }
+
+
+def generate_columnar_warehouses(count, rng, start_id=1):
+    return {
+        "id": id_column(count, start_id),
+        "name": random_string_column(rng, count, 15),
+        "location": random_string_column(rng, count, 20),
+    }
+
+
+def generate_columnar_products(
+    count, category_count, rng, start_id=1, ctx=DEFAULT_CONTEXT
+):
+    if category_count < 1:
+        return {}
+    tags = ctx.row_width("products.tags")
+    columns = {
+        "id": id_column(count, start_id),
+        "name": random_string_column(rng, count, 30),
+        "price": price_column(rng, count, 10, 1000),
+        "category_id": key_column(
+            rng, count, category_count, "products.category_id", ctx
+        ),
+        "attributes.color": choice_column(
+            rng, count, ["red", "blue", "green", "black", "white"]
+        ),
+        "attributes.weight": rng.integers(1, 101, count),
+        "attributes.tags": random_string_column(rng, count * tags, 5).reshape(
+            count, tags
+        ),
+    }
+    for idx in range(ctx.row_width("products.attributes")):
+        columns[f"attributes.attr_{idx}"] = random_string_column(rng, count, 10)
+    return columns
+
+
+def generate_columnar_orders(count, user_count, rng, start_id=1, ctx=DEFAULT_CONTEXT):
+    if user_count < 1:
+        return {}
+    return {
+        "id": id_column(count, start_id),
+        "user_id": key_column(rng, count, user_count, "orders.user_id", ctx),
+        "status": choice_column(rng, count, ["pending", "completed", "cancelled"]),
+        "total": price_column(rng, count, 50, 5000),
+        "created_at": random_date_column(rng, count, "orders.created_at", ctx),
+    }
+
+
+def generate_columnar_order_items(
+    count, order_count, product_count, rng, start_id=1, ctx=DEFAULT_CONTEXT
+):
+    if order_count < 1 or product_count < 1:
+        return {}
+    return {
+        "id": id_column(count, start_id),
+        "order_id": key_column(rng, count, order_count, "order_items.order_id", ctx),
+        "product_id": key_column(
+            rng, count, product_count, "order_items.product_id", ctx
+        ),
+        "quantity": rng.integers(1, 11, count),
+        "price": price_column(rng, count, 10, 500),
+    }
+
+
+def generate_columnar_reviews(
+    count, user_count, product_count, rng, start_id=1, ctx=DEFAULT_CONTEXT
+):
+    if user_count < 1 or product_count < 1:
+        return {}
+    return {
+        "id": id_column(count, start_id),
+        "user_id": key_column(rng, count, user_count, "reviews.user_id", ctx),
+        "product_id": key_column(rng, count, product_count, "reviews.product_id", ctx),
+        "rating": rng.integers(1, 6, count),
+        "comment": random_string_column(rng, count, ctx.row_width("reviews.comment")),
+        "metadata": pool_column(rng, count, "reviews", "metadata"),
+    }
+
+
+def generate_columnar_inventory(
+    count, product_count, warehouse_count, rng, start_id=1, ctx=DEFAULT_CONTEXT
+):
+    if product_count < 1 or warehouse_count < 1:
+        return {}
+    return {
+        "id": id_column(count, start_id),
+        "product_id": key_column(
+            rng, count, product_count, "inventory.product_id", ctx
+        ),
+        "warehouse_id": key_column(
+            rng, count, warehouse_count, "inventory.warehouse_id", ctx
+        ),
+        "quantity": rng.integers(0, 1001, count),
+    }
+
+
+def generate_columnar_addresses(
+    count, user_count, rng, start_id=1, ctx=DEFAULT_CONTEXT
+):
+    if user_count < 1:
+        return {}
+    return {
+        "id": id_column(count, start_id),
+        "user_id": key_column(rng, count, user_count, "addresses.user_id", ctx),
+        "city": random_string_column(rng, count, 15),
+        "country": random_string_column(rng, count, 15),
+        "details.street": random_string_column(rng, count, 20),
+        "details.zip": random_string_column(rng, count, 6),
+        "details.phone": random_string_column(rng, count, 10),
+    }
+
+
+def generate_columnar_payments(
+    count, order_count, rng, start_id=1, ctx=DEFAULT_CONTEXT
+):
+    if order_count < 1:
+        return {}
+    return {
+        "id": id_column(count, start_id),
+        "order_id": key_column(rng, count, order_count, "payments.order_id", ctx),
+        "method": choice_column(rng, count, ["card", "cash", "transfer"]),
+        "amount": price_column(rng, count, 50, 5000),
+        "data": pool_column(rng, count, "payments", "data"),
+    }
+
+
+def generate_columnar_table(table, count, counts, rng, start_id=1, ctx=DEFAULT_CONTEXT):
+    columns = generate_random_columns(table, count, counts, rng, start_id, ctx)
+    if columns and ctx.consistent():
+        columns.update(consistent_columns(table, columns["id"], counts, ctx))
+    return columns
+
+
+def generate_random_columns(table, count, counts, rng, start_id=1, ctx=DEFAULT_CONTEXT):
+    if table == "users":
+        return generate_columnar_users(count, rng, start_id, ctx)
+    if table == "categories":
+        return generate_columnar_categories(count, rng, start_id)
+    if table == "warehouses":
+        return generate_columnar_warehouses(count, rng, start_id)
+    if table == "products":
+        return generate_columnar_products(
+            count, counts["categories"], rng, start_id, ctx
+        )
+    if table == "orders":
+        return generate_columnar_orders(count, counts["users"], rng, start_id, ctx)
+    if table == "order_items":
+        return generate_columnar_order_items(
+            count, counts["orders"], counts["products"], rng, start_id, ctx
+        )
+    if table == "reviews":
+        return generate_columnar_reviews(
+            count, counts["users"], counts["products"], rng, start_id, ctx
+        )
+    if table == "inventory":
+        return generate_columnar_inventory(
+            count, counts["products"], counts["warehouses"], rng, start_id, ctx
+        )
+    if table == "addresses":
+        return generate_columnar_addresses(count, counts["users"], rng, start_id, ctx)
+    if table == "payments":
+        return generate_columnar_payments(count, counts["orders"], rng, start_id, ctx)
+    raise ValueError(f"unknown table: {table}")
+
+
+def generate_columnar_starting_data(total_records, rng=None, ctx=DEFAULT_CONTEXT):
+    rng = rng or np.random.default_rng()
+    counts = split_starting_data(total_records)
+    return {
+        table: RecordBatch(
+            table, generate_columnar_table(table, counts[table], counts, rng, 1, ctx)
+        )
+        for table in STARTING_DATA_INSERT_ORDER
+    }
+
+
+def column_values(name, column):
+    if column.dtype.kind == "S":
+        values = column.astype(str).tolist()
+    elif column.dtype.kind == "M":
+        values = column.astype("datetime64[us]").tolist()
+    else:
+        values = column.tolist()
+    if name in NULLABLE_COLUMNS:
+        values = [value or None for value in values]
+    return values
+
+
+class RecordBatch:
+    __slots__ = ("table", "columns")
+
+    def __init__(self, table, columns):
+        self.table = table
+        self.columns = columns
+
+    def __len__(self):
+        if not self.columns:
+            return 0
+        return len(self.columns["id"])
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def slice(self, start, stop):
+        return RecordBatch(
+            self.table,
+            {name: column[start:stop] for name, column in self.columns.items()},
+        )
+
+    def nested_names(self, field):
+        prefix = f"{field}."
+        return [name for name in self.columns if name.startswith(prefix)]
+
+    def is_pooled(self, field):
+        return (self.table, field) in VALUE_POOLS and field in self.columns
+
+    def field_values(self, field, text_timestamps=False):
+        if self.is_pooled(field):
+            return JSON_POOLS[(self.table, field)][self.columns[field]].tolist()
+        if field in self.columns:
+            values = column_values(field, self.columns[field])
+            if text_timestamps and self.columns[field].dtype.kind == "M":
+                return map(str, values)
+            return values
+
+        names = self.nested_names(field)
+        keys = [name[len(field) + 1 :] for name in names]
+        children = [column_values(name, self.columns[name]) for name in names]
+        return (json.dumps(dict(zip(keys, row))) for row in zip(*children))
+
+    def rows(self, fields, text_timestamps=False):
+        return zip(*(self.field_values(field, text_timestamps) for field in fields))
+
+    def records(self, id_field="id", pools=None):
+        pools = pools or VALUE_POOLS
+        values = {}
+        for name, column in self.columns.items():
+            if self.is_pooled(name):
+                pool = pools[(self.table, name)]
+                values[name] = [pool[code] for code in column.tolist()]
+            else:
+                values[name] = column_values(name, column)
+        for idx in range(len(self)):
+            record = {}
+            for name, column in values.items():
+                if "." in name:
+                    parent, child = name.split(".", 1)
+                    record.setdefault(parent, {})[child] = column[idx]
+                elif name == "id":
+                    record[id_field] = column[idx]
+                else:
+                    record[name] = column[idx]
+            yield record
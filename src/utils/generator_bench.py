@@ -0,0 +1,124 @@
+import multiprocessing
+import resource
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from src.utils.dataset import generate_shard, plan_table_shards
+from src.utils.generator import (
+    STARTING_DATA_INSERT_ORDER,
+    dataset_options,
+    resolve_seed,
+    split_starting_data,
+)
+from src.utils.results import save_result
+
+SHARD_OPERATION = "generate_shard_{mode}_{table}"
+
+SAMPLE_ROWS = 10_000
+
+SPLIT_REPEATS = 1_000
+
+
+def peak_rss_bytes():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def measure_table(
+    mode, table, counts, base_seed, reference_time, distribution, consistent, row_width
+):
+    shard_args = (
+        counts,
+        base_seed,
+        reference_time,
+        distribution,
+        consistent,
+        row_width,
+    )
+    shards = plan_table_shards(table, counts[table], row_width=row_width)
+    baseline = peak_rss_bytes()
+    start = time.perf_counter()
+    for _, shard_index, start_id, count in shards:
+        generate_shard(mode, table, shard_index, start_id, count, *shard_args)
+    elapsed = time.perf_counter() - start
+
+    sample_rows = min(counts[table], SAMPLE_ROWS)
+    tracemalloc.start()
+    sample = generate_shard(mode, table, 0, 1, sample_rows, *shard_args)
+    sample_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del sample
+
+    return elapsed, sample_bytes / sample_rows, peak_rss_bytes() - baseline
+
+
+def measure_split(total_records, weights=None):
+    baseline = peak_rss_bytes()
+    start = time.perf_counter()
+    for _ in range(SPLIT_REPEATS):
+        split_starting_data(total_records, weights)
+    elapsed = (time.perf_counter() - start) / SPLIT_REPEATS
+
+    tracemalloc.start()
+    counts = split_starting_data(total_records, weights)
+    counts_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del counts
+
+    return elapsed, counts_bytes / total_records, peak_rss_bytes() - baseline
+
+
+def run_isolated(func, *args):
+    # spawn, not fork: a forked child starts with the parent's peak RSS
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+        return executor.submit(func, *args).result()
+
+
+def record_measurement(operation, size, rows, measurement, trial):
+    elapsed, bytes_per_row, peak_rss_delta = measurement
+    rows_per_s = rows / elapsed if elapsed > 0 else 0.0
+    save_result(
+        "generator",
+        operation,
+        size,
+        elapsed * 1000,
+        rows,
+        trial=trial,
+        details={
+            "rows_per_s": round(rows_per_s, 1),
+            "bytes_per_row": round(bytes_per_row, 1),
+            "peak_rss_delta_bytes": peak_rss_delta,
+        },
+    )
+    print(
+        f"{operation:<38} {rows:>12,} rows {rows_per_s:>14,.0f} rows/s "
+        f"{bytes_per_row:>10,.1f} B/row "
+        f"{peak_rss_delta / 2**20:>10,.1f} MiB peak RSS growth"
+    )
+
+
+def run_generator_benchmark(size, trial=1, dataset=None):
+    options = dataset_options(dataset)
+    mode = options["generator"]
+    counts = split_starting_data(size, options["weights"])
+    base_seed = resolve_seed(options["seed"])
+    reference_time = options["reference_time"] or datetime.now()
+
+    split = run_isolated(measure_split, size, options["weights"])
+    record_measurement("split_starting_data", size, size, split, trial)
+    for table in STARTING_DATA_INSERT_ORDER:
+        measurement = run_isolated(
+            measure_table,
+            mode,
+            table,
+            counts,
+            base_seed,
+            reference_time,
+            options["distribution"],
+            options["consistent"],
+            options["row_width"],
+        )
+        operation = SHARD_OPERATION.format(mode=mode, table=table)
+        record_measurement(operation, size, counts[table], measurement, trial)
@@ -0,0 +1,101 @@
+import time
+
+from src.utils.export import export_rows
+from src.utils.generator import (
+    APPEND_STREAM,
+    STARTING_DATA_FIELDS,
+    dataset_options,
+    generator_context,
+    iter_append_batches,
+    table_random,
+)
+from src.utils.results import save_result
+
+INGEST_PHASES = ["indexed", "nonindexed"]
+
+KEY_TABLES = ["users", "products"]
+
+DRIFT_WINDOW = 0.1
+
+
+def append_rows(records, table, text_timestamps=False):
+    return export_rows(records, ["id", *STARTING_DATA_FIELDS[table]], text_timestamps)
+
+
+def iter_ingest_batches(dataset, key_ranges, start_ids):
+    options = dataset_options(dataset)
+    rng = table_random(options["seed"], "orders", APPEND_STREAM)
+    return iter_append_batches(
+        key_ranges,
+        start_ids,
+        options["ingest_batch_orders"],
+        options["ingest_batches"],
+        rng,
+        generator_context(options),
+    )
+
+
+def window_rows_per_s(measurements):
+    rows = sum(rows for rows, _ in measurements)
+    elapsed = sum(elapsed for _, elapsed in measurements)
+    return rows / elapsed if elapsed > 0 else 0.0
+
+
+def ingest_drift(measurements):
+    window = max(1, int(len(measurements) * DRIFT_WINDOW))
+    first = window_rows_per_s(measurements[:window])
+    last = window_rows_per_s(measurements[-window:])
+    return {
+        "rows_per_s": round(window_rows_per_s(measurements), 1),
+        "first_rows_per_s": round(first, 1),
+        "last_rows_per_s": round(last, 1),
+        "drift": round(last / first - 1, 4) if first > 0 else 0.0,
+        "batches": len(measurements),
+    }
+
+
+def run_ingest_phase(
+    database, phase, size, trial, dataset, key_ranges, start_ids, insert_batch
+):
+    operation = f"ingest_{phase}"
+    measurements = []
+    appended = 0
+    for index, batch in enumerate(iter_ingest_batches(dataset, key_ranges, start_ids)):
+        rows = sum(len(records) for records in batch.values())
+        start = time.perf_counter()
+        insert_batch(batch)
+        elapsed = time.perf_counter() - start
+        measurements.append((rows, elapsed))
+        appended += rows
+        save_result(
+            database,
+            operation,
+            size,
+            elapsed * 1000,
+            rows,
+            trial=trial,
+            details={
+                "batch": index,
+                "appended_rows": appended,
+                "rows_per_s": round(rows / elapsed, 1) if elapsed > 0 else 0.0,
+            },
+        )
+
+    if not measurements:
+        return None
+    drift = ingest_drift(measurements)
+    total_ms = sum(elapsed for _, elapsed in measurements) * 1000
+    save_result(
+        database,
+        f"{operation}_total",
+        size,
+        total_ms,
+        appended,
+        trial=trial,
+        details=drift,
+    )
+    print(
+        f"{operation}: {appended:,} rows, {drift['rows_per_s']:,.0f} rows/s, "
+        f"drift {drift['drift']:+.1%}"
+    )
+    return drift
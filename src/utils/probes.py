@@ -0,0 +1,70 @@
+from datetime import datetime, timedelta
+
+from src.utils.generator import (
+    DATE_RANGE_DAYS,
+    PROBE_STREAM,
+    PROBE_STRIDE,
+    dataset_options,
+    probe_email,
+    split_starting_data,
+    table_random,
+)
+
+DEFAULT_PROBE_SIZE = 5_000
+
+_catalog = None
+
+
+def build_probe_catalog(total_records, dataset=None):
+    options = dataset_options(dataset)
+    user_count = split_starting_data(total_records, options["weights"])["users"]
+    return {
+        "user_count": user_count,
+        "user_ids": range(1, user_count + 1, PROBE_STRIDE),
+        "hit_ratio": options["probe_hit_ratio"],
+        "reference_time": options["reference_time"] or datetime.now(),
+        "rng": table_random(options["seed"], "users", PROBE_STREAM),
+    }
+
+
+def set_probe_catalog(catalog):
+    global _catalog
+    _catalog = catalog
+
+
+def probe_catalog():
+    global _catalog
+    if _catalog is None:
+        _catalog = build_probe_catalog(DEFAULT_PROBE_SIZE)
+    return _catalog
+
+
+def probe_hit(catalog):
+    return catalog["rng"].random() < catalog["hit_ratio"]
+
+
+def draw_probe_email():
+    catalog = probe_catalog()
+    if probe_hit(catalog):
+        return probe_email(catalog["rng"].choice(catalog["user_ids"]))
+    return f"miss{catalog['rng'].randint(1, catalog['user_count'])}@example.invalid"
+
+
+def draw_probe_id():
+    catalog = probe_catalog()
+    user_id = catalog["rng"].randint(1, catalog["user_count"])
+    if probe_hit(catalog):
+        return user_id
+    return catalog["user_count"] + user_id
+
+
+def draw_probe_date(as_text=False):
+    catalog = probe_catalog()
+    if probe_hit(catalog):
+        days = -catalog["rng"].randint(1, DATE_RANGE_DAYS)
+    else:
+        days = catalog["rng"].randint(1, DATE_RANGE_DAYS)
+    value = catalog["reference_time"] + timedelta(days=days)
+    if as_text:
+        return value.date().isoformat()
+    return value
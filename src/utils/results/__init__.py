@@ -1,5 +1,11 @@
 from src.utils.results.analysis import build_extended_analysis
-from src.utils.results.io import init_results_csv, save_explain_result, save_result
+from src.utils.results.io import (
+    init_results_csv,
+    save_explain_result,
+    save_plan_nodes,
+    save_result,
+    set_result_context,
+)
 from src.utils.results.plots import draw_summary_diagrams
 from src.utils.results.summary import build_summary_csv, init_summary_csv
 
@@ -10,5 +16,7 @@ __all__ = [
     "init_results_csv",
     "init_summary_csv",
     "save_explain_result",
+    "save_plan_nodes",
     "save_result",
+    "set_result_context",
 ]
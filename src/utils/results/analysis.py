@@ -1,10 +1,16 @@
 import csv
 import math
 import os
-from collections import defaultdict
+from collections import Counter, defaultdict
 from datetime import datetime
 
-from src.config.files import ANALYSIS_FILE, RESULTS_CSV_FILE, SUMMARY_CSV_FILE
+from src.config.files import (
+    ANALYSIS_FILE,
+    PLAN_NODES_CSV_FILE,
+    RESULTS_CSV_FILE,
+    SUMMARY_CSV_FILE,
+)
+from src.utils.results.summary import SUMMARY_COLUMNS, SUMMARY_KEY_COLUMNS
 
 MAX_SAMPLES_DEFAULT = 3
 
@@ -20,32 +26,115 @@ def _operation_type(operation):
     return None
 
 
+def _variant_label(statement_mode, shape):
+    parts = [
+        part for part in (statement_mode, shape) if part not in ("", "adhoc", "default")
+    ]
+    return f" [{', '.join(parts)}]" if parts else ""
+
+
+def _plan_label(node):
+    label = node["node_type"]
+    if node["relation"]:
+        label += f" on {node['relation']}"
+    if node["index_name"]:
+        label += f" using {node['index_name']}"
+    return label
+
+
+def _load_plan_runs():
+    if not os.path.exists(PLAN_NODES_CSV_FILE):
+        return {}
+
+    runs = defaultdict(list)
+    with open(PLAN_NODES_CSV_FILE, "r", newline="") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            try:
+                key = (row["database"], row["query"], int(row["size"]))
+                run = (row["timestamp"], int(row["trial"]))
+            except (KeyError, ValueError, TypeError):
+                continue
+            runs[(key, run)].append(row)
+
+    latest_runs = {}
+    for (key, run), nodes in runs.items():
+        if key not in latest_runs or run > latest_runs[key][0]:
+            latest_runs[key] = (run, nodes)
+
+    plan_runs = defaultdict(dict)
+    for (db, query, size), (_, nodes) in latest_runs.items():
+        plan_runs[(db, query)][size] = sorted(
+            nodes, key=lambda node: int(node["node_id"])
+        )
+    return plan_runs
+
+
+def _plan_changes(plan_runs):
+    changes = []
+    for (db, query), sizes in sorted(plan_runs.items()):
+        ordered_sizes = sorted(sizes)
+        for previous_size, size in zip(ordered_sizes, ordered_sizes[1:]):
+            previous = Counter(_plan_label(node) for node in sizes[previous_size])
+            current = Counter(_plan_label(node) for node in sizes[size])
+            if previous == current:
+                continue
+            removed = sorted((previous - current).elements())
+            added = sorted((current - previous).elements())
+            changes.append((db, query, previous_size, size, removed, added))
+    return changes
+
+
+def _under_limit(node, by_id):
+    parent = by_id.get(node["parent_id"])
+    while parent is not None:
+        if parent["node_type"] == "Limit":
+            return True
+        parent = by_id.get(parent["parent_id"])
+    return False
+
+
+def _estimate_errors(plan_runs):
+    errors = []
+    for (db, query), sizes in plan_runs.items():
+        for size, nodes in sizes.items():
+            by_id = {node["node_id"]: node for node in nodes}
+            for node in nodes:
+                if node["actual_loops"] == "0" or _under_limit(node, by_id):
+                    continue
+                try:
+                    estimated = float(node["estimated_rows"])
+                    actual = float(node["actual_rows"])
+                except (KeyError, ValueError):
+                    continue
+                estimated = max(estimated, 1.0)
+                actual = max(actual, 1.0)
+                error = max(estimated, actual) / min(estimated, actual)
+                errors.append(
+                    (error, db, query, size, _plan_label(node), estimated, actual)
+                )
+    errors.sort(key=lambda item: item[0], reverse=True)
+    return errors
+
+
 def build_extended_analysis(max_samples=MAX_SAMPLES_DEFAULT):
     if max_samples < 1:
         max_samples = 1
 
-    if not os.path.exists(SUMMARY_CSV_FILE):
-        return None
+    plan_runs = _load_plan_runs()
 
-    summary_rows = []
-    with open(SUMMARY_CSV_FILE, "r", newline="") as f:
-        reader = csv.reader(f)
-        rows = list(reader)
+    rows = []
+    if os.path.exists(SUMMARY_CSV_FILE):
+        with open(SUMMARY_CSV_FILE, "r", newline="") as f:
+            reader = csv.reader(f)
+            rows = list(reader)
 
-    if not rows:
+    if not rows and not plan_runs:
         return None
 
-    header = [cell.strip() for cell in rows[0]]
-    has_header = header == [
-        "database",
-        "operation",
-        "size",
-        "avg_time_ms",
-        "min_time_ms",
-        "max_time_ms",
-        "samples_count",
-        "generated_at",
-    ]
+    summary_rows = []
+    header = [cell.strip() for cell in rows[0]] if rows else []
+    has_header = header == SUMMARY_COLUMNS
 
     data_rows = rows[1:] if has_header else rows
 
@@ -63,12 +152,14 @@ def build_extended_analysis(max_samples=MAX_SAMPLES_DEFAULT):
                     "min_time_ms": float(row[4]),
                     "max_time_ms": float(row[5]),
                     "samples_count": min(samples_count, max_samples),
+                    "statement_mode": row[8] if len(row) > 8 else "",
+                    "shape": row[9] if len(row) > 9 else "",
                 }
             )
         except (ValueError, TypeError):
             continue
 
-    if not summary_rows:
+    if not summary_rows and not plan_runs:
         return None
 
     raw_grouped = defaultdict(list)
@@ -80,7 +171,12 @@ def build_extended_analysis(max_samples=MAX_SAMPLES_DEFAULT):
                     if row.get("status", "ok") != "ok":
                         continue
                     time_ms = float(row["time_ms"])
-                    key = (row["database"], row["operation"], int(row["size"]))
+                    key = (
+                        row["database"],
+                        row["operation"],
+                        int(row["size"]),
+                        *(row.get(column) or "" for column in SUMMARY_KEY_COLUMNS),
+                    )
                     trial = int(row.get("trial", 0) or 0)
                     timestamp = row.get("timestamp", "")
                 except (KeyError, ValueError, TypeError):
@@ -106,7 +202,8 @@ def build_extended_analysis(max_samples=MAX_SAMPLES_DEFAULT):
 
         db_times[db].append(avg_time)
         operation_times[op][db].append(avg_time)
-        size_trends[(db, op)].append((size, avg_time))
+        variant = _variant_label(row["statement_mode"], row["shape"])
+        size_trends[(db, op + variant)].append((size, avg_time))
         coverage[row["samples_count"]] += 1
 
     db_ranking = []
@@ -147,7 +244,8 @@ def build_extended_analysis(max_samples=MAX_SAMPLES_DEFAULT):
             std_dev = 0.0
 
         cv = (std_dev / mean_value) * 100
-        db, op, size = key
+        db, op, size, statement_mode, shape, _ = key
+        op += _variant_label(statement_mode, shape)
         stability_by_db[db].append(cv)
         unstable_cases.append((cv, db, op, size, len(samples), mean_value))
 
@@ -230,5 +328,32 @@ def build_extended_analysis(max_samples=MAX_SAMPLES_DEFAULT):
                 )
         else:
             f.write("- Not enough size points for scaling analysis\n")
+        f.write("\n")
+
+        f.write("## Plan changes across sizes (EXPLAIN)\n")
+        plan_changes = _plan_changes(plan_runs)
+        if plan_changes:
+            for db, query, previous_size, size, removed, added in plan_changes:
+                f.write(
+                    f"- {db} / {query}: {previous_size}->{size}, "
+                    f"{', '.join(removed) or 'nothing'} -> "
+                    f"{', '.join(added) or 'nothing'}\n"
+                )
+        else:
+            f.write("- No plan changes between sizes\n")
+        f.write("\n")
+
+        f.write("## Row estimate errors (EXPLAIN ANALYZE)\n")
+        estimate_errors = _estimate_errors(plan_runs)
+        if estimate_errors:
+            for error, db, query, size, label, estimated, actual in estimate_errors[
+                :10
+            ]:
+                f.write(
+                    f"- {db} / {query} / size={size}: {label}, "
+                    f"estimated={estimated:.0f}, actual={actual:.0f} ({error:.2f}x)\n"
+                )
+        else:
+            f.write("- No analyzed plans\n")
 
     return ANALYSIS_FILE
@@ -1,10 +1,11 @@
 import csv
+import json
 import os
 from datetime import datetime
 
-from src.config.files import RESULTS_CSV_FILE
+from src.config.files import PLAN_NODES_CSV_FILE, RESULTS_CSV_FILE
 
-CSV_COLUMNS = [
+BASE_COLUMNS = [
     "database",
     "operation",
     "size",
@@ -15,6 +16,52 @@ CSV_COLUMNS = [
     "timestamp",
 ]
 
+CONTEXT_COLUMNS = [
+    "dataset",
+    "distribution",
+    "probe_hit_ratio",
+    "row_width",
+    "avg_row_bytes",
+    "shape",
+    "statement_mode",
+]
+
+DETAIL_COLUMNS = ["details"]
+
+PLAN_NODE_COLUMNS = [
+    "database",
+    "query",
+    "size",
+    "trial",
+    "node_id",
+    "parent_id",
+    "depth",
+    "node_type",
+    "relation",
+    "index_name",
+    "parent_relationship",
+    "estimated_rows",
+    "actual_rows",
+    "actual_loops",
+    "actual_total_time_ms",
+    "shared_hit_blocks",
+    "shared_read_blocks",
+    "temp_written_blocks",
+    "timestamp",
+]
+
+CSV_COLUMNS = BASE_COLUMNS + CONTEXT_COLUMNS + DETAIL_COLUMNS
+
+_result_context = {}
+
+
+def set_result_context(**context):
+    _result_context.update(context)
+
+
+def result_context_values():
+    return [_result_context.get(column, "") for column in CONTEXT_COLUMNS]
+
 
 def init_results_csv():
     os.makedirs(os.path.dirname(RESULTS_CSV_FILE), exist_ok=True)
@@ -22,13 +69,36 @@ def init_results_csv():
         with open(RESULTS_CSV_FILE, "w", newline="") as f:
             writer = csv.writer(f)
             writer.writerow(CSV_COLUMNS)
+        return
+
+    upgrade_results_csv()
+
+
+def upgrade_results_csv():
+    with open(RESULTS_CSV_FILE, newline="") as f:
+        reader = csv.DictReader(f)
+        if reader.fieldnames == CSV_COLUMNS:
+            return
+        rows = list(reader)
 
+    with open(RESULTS_CSV_FILE, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=CSV_COLUMNS, restval="")
+        writer.writeheader()
+        for row in rows:
+            writer.writerow({column: row.get(column, "") for column in CSV_COLUMNS})
 
-def save_result(database, operation, size, time_ms, elements, trial=1, status="ok"):
+
+def save_result(
+    database, operation, size, time_ms, elements, trial=1, status="ok", details=None
+):
     serialized_time = ""
     if time_ms is not None:
         serialized_time = round(time_ms, 2)
 
+    serialized_details = ""
+    if details:
+        serialized_details = json.dumps(details, sort_keys=True)
+
     with open(RESULTS_CSV_FILE, "a", newline="") as f:
         writer = csv.writer(f)
         writer.writerow(
@@ -41,6 +111,8 @@ def save_result(database, operation, size, time_ms, elements, trial=1, status="o
                 trial,
                 status,
                 datetime.now().isoformat(),
+                *result_context_values(),
+                serialized_details,
             ]
         )
 
@@ -65,6 +137,7 @@ def save_explain_result(
                 "trial",
                 "status",
                 "timestamp",
+                *CONTEXT_COLUMNS,
             ]
         )
         writer.writerow(
@@ -76,5 +149,29 @@ def save_explain_result(
                 trial,
                 status,
                 datetime.now().isoformat(),
+                *result_context_values(),
             ]
         )
+
+
+def save_plan_nodes(database, query_name, size, nodes, trial=1):
+    os.makedirs(os.path.dirname(PLAN_NODES_CSV_FILE), exist_ok=True)
+    columns = PLAN_NODE_COLUMNS + CONTEXT_COLUMNS
+    write_header = not os.path.exists(PLAN_NODES_CSV_FILE)
+    timestamp = datetime.now().isoformat()
+    with open(PLAN_NODES_CSV_FILE, "a", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=columns, restval="")
+        if write_header:
+            writer.writeheader()
+        for node in nodes:
+            writer.writerow(
+                {
+                    **node,
+                    "database": database,
+                    "query": query_name,
+                    "size": size,
+                    "trial": trial,
+                    "timestamp": timestamp,
+                    **dict(zip(CONTEXT_COLUMNS, result_context_values())),
+                }
+            )
@@ -8,16 +8,20 @@ import seaborn as sns
 from matplotlib.ticker import FuncFormatter
 
 from src.config.files import SUMMARY_CSV_FILE
+from src.utils.results.summary import SUMMARY_COLUMNS
 
 DB_COLORS = {
     "postgres": "#1f77b4",
     "sqlite": "#0ee3ff",
     "mongo": "#2ca02c",
     "unqlite": "#76D03D",
+    "generator": "#7f7f7f",
 }
 
 INDEX_EXCLUDED_DATABASES = {"unqlite"}
 
+SERIES_COLUMNS = ["statement_mode", "shape", "fetch_mode"]
+
 
 def _operation_type(operation):
     if operation.startswith("index_"):
@@ -30,6 +34,19 @@ def _operation_type(operation):
     return None
 
 
+def _series_variant(context, varying_columns):
+    return ", ".join(
+        context[column]
+        for column in SERIES_COLUMNS
+        if column in varying_columns and context.get(column)
+    )
+
+
+def _series_label(series):
+    database, variant = series
+    return f"{database} [{variant}]" if variant else database
+
+
 def draw_summary_diagrams():
     if not os.path.exists(SUMMARY_CSV_FILE):
         return []
@@ -46,19 +63,11 @@ def draw_summary_diagrams():
         return []
 
     header = [cell.strip() for cell in rows[0]]
-    has_header = header == [
-        "database",
-        "operation",
-        "size",
-        "avg_time_ms",
-        "min_time_ms",
-        "max_time_ms",
-        "samples_count",
-        "generated_at",
-    ]
+    has_header = header == SUMMARY_COLUMNS
 
     data_rows = rows[1:] if has_header else rows
 
+    parsed_rows = []
     for row in data_rows:
         try:
             if len(row) < 4:
@@ -69,14 +78,33 @@ def draw_summary_diagrams():
             avg_time = float(row[3])
         except (ValueError, TypeError):
             continue
-
-        grouped[operation][database].append((size, avg_time))
-        overall_by_db_size[(database, size)].append(avg_time)
+        context = dict(zip(header, row)) if has_header else {}
+        parsed_rows.append((database, operation, size, avg_time, context))
+
+    # one line per database and run variant, so statement modes, shapes,
+    # fetch modes and datasets are never averaged into the same point
+    varying_columns = {
+        column
+        for column in SERIES_COLUMNS
+        if len({context.get(column, "") for *_, context in parsed_rows}) > 1
+    }
+    datasets = defaultdict(set)
+    for database, *_, context in parsed_rows:
+        variant = _series_variant(context, varying_columns)
+        datasets[(database, variant)].add(context.get("dataset", ""))
+    for database, operation, size, avg_time, context in parsed_rows:
+        variant = _series_variant(context, varying_columns)
+        if len(datasets[(database, variant)]) > 1:
+            dataset = f"dataset {context['dataset']}"
+            variant = f"{variant}, {dataset}" if variant else dataset
+        series = (database, variant)
+        grouped[operation][series].append((size, avg_time))
+        overall_by_db_size[(series, size)].append(avg_time)
         if operation.startswith("index_"):
-            index_overall_by_db_size[(database, size)].append(avg_time)
+            index_overall_by_db_size[(series, size)].append(avg_time)
         op_type = _operation_type(operation)
         if op_type:
-            boxplot_rows.append((database, op_type, avg_time, size))
+            boxplot_rows.append((series, op_type, avg_time, size))
 
     if not grouped:
         return []
@@ -104,7 +132,8 @@ def draw_summary_diagrams():
         filtered_boxplot = []
 
         for operation, op_dbs in grouped.items():
-            for database, points in op_dbs.items():
+            for series, points in op_dbs.items():
+                database = series[0]
                 if (
                     operation.startswith("index_")
                     and database in INDEX_EXCLUDED_DATABASES
@@ -114,45 +143,46 @@ def draw_summary_diagrams():
                     continue
                 filtered_points = [(s, t) for s, t in points if s in sizes_subset]
                 if filtered_points:
-                    filtered_grouped[operation][database] = filtered_points
+                    filtered_grouped[operation][series] = filtered_points
 
-        for (database, size), values in overall_by_db_size.items():
-            if subdir == "huge" and database not in huge_dbs:
+        for (series, size), values in overall_by_db_size.items():
+            if subdir == "huge" and series[0] not in huge_dbs:
                 continue
             if size in sizes_subset and values:
-                filtered_overall[database].append((size, sum(values) / len(values)))
+                filtered_overall[series].append((size, sum(values) / len(values)))
 
-        for (database, size), values in index_overall_by_db_size.items():
-            if database in INDEX_EXCLUDED_DATABASES:
+        for (series, size), values in index_overall_by_db_size.items():
+            if series[0] in INDEX_EXCLUDED_DATABASES:
                 continue
-            if subdir == "huge" and database not in huge_dbs:
+            if subdir == "huge" and series[0] not in huge_dbs:
                 continue
             if size in sizes_subset and values:
-                filtered_index_overall[database].append(
-                    (size, sum(values) / len(values))
-                )
+                filtered_index_overall[series].append((size, sum(values) / len(values)))
 
-        for db, op_type, avg_time, size in boxplot_rows:
-            if db in INDEX_EXCLUDED_DATABASES:
+        for series, op_type, avg_time, size in boxplot_rows:
+            if series[0] in INDEX_EXCLUDED_DATABASES:
                 continue
-            if subdir == "huge" and db not in huge_dbs:
+            if subdir == "huge" and series[0] not in huge_dbs:
                 continue
             if size in sizes_subset:
-                filtered_boxplot.append((db, op_type, avg_time))
+                filtered_boxplot.append((series, op_type, avg_time))
 
         for operation in sorted(filtered_grouped.keys()):
             plt.figure(figsize=(10, 6))
 
-            for database in sorted(filtered_grouped[operation].keys()):
-                points = sorted(
-                    filtered_grouped[operation][database], key=lambda x: x[0]
-                )
+            for series in sorted(filtered_grouped[operation].keys()):
+                points = sorted(filtered_grouped[operation][series], key=lambda x: x[0])
                 sizes = [point[0] for point in points]
                 times = [point[1] for point in points]
-                color = DB_COLORS.get(database)
+                color = DB_COLORS.get(series[0])
 
                 plt.plot(
-                    sizes, times, marker="o", linewidth=2, label=database, color=color
+                    sizes,
+                    times,
+                    marker="o",
+                    linewidth=2,
+                    label=_series_label(series),
+                    color=color,
                 )
 
             plt.title(f"Operation: {operation}")
@@ -185,24 +215,24 @@ def draw_summary_diagrams():
             plt.figure(figsize=(10, 6))
             plotted_any = False
 
-            all_databases = sorted(
+            all_series = sorted(
                 set(filtered_grouped[operation].keys())
                 | set(filtered_grouped[indexed_operation].keys())
             )
 
-            for database in all_databases:
-                if database in INDEX_EXCLUDED_DATABASES:
+            for series in all_series:
+                if series[0] in INDEX_EXCLUDED_DATABASES:
                     continue
 
                 nonindexed_points = sorted(
-                    filtered_grouped[operation].get(database, []), key=lambda x: x[0]
+                    filtered_grouped[operation].get(series, []), key=lambda x: x[0]
                 )
                 indexed_points = sorted(
-                    filtered_grouped[indexed_operation].get(database, []),
+                    filtered_grouped[indexed_operation].get(series, []),
                     key=lambda x: x[0],
                 )
 
-                color = DB_COLORS.get(database)
+                color = DB_COLORS.get(series[0])
 
                 if nonindexed_points:
                     sizes = [point[0] for point in nonindexed_points]
@@ -212,7 +242,7 @@ def draw_summary_diagrams():
                         times,
                         marker="o",
                         linewidth=2,
-                        label=f"{database}",
+                        label=_series_label(series),
                         color=color,
                         linestyle="-",
                     )
@@ -226,7 +256,7 @@ def draw_summary_diagrams():
                         times,
                         marker="s",
                         linewidth=2,
-                        label=f"{database} indexed",
+                        label=f"{_series_label(series)} indexed",
                         color=color,
                         linestyle="--",
                     )
@@ -255,13 +285,18 @@ def draw_summary_diagrams():
         if filtered_overall:
             plt.figure(figsize=(10, 6))
 
-            for database in sorted(filtered_overall.keys()):
-                points = sorted(filtered_overall[database], key=lambda x: x[0])
+            for series in sorted(filtered_overall.keys()):
+                points = sorted(filtered_overall[series], key=lambda x: x[0])
                 sizes = [point[0] for point in points]
                 times = [point[1] for point in points]
-                color = DB_COLORS.get(database)
+                color = DB_COLORS.get(series[0])
                 plt.plot(
-                    sizes, times, marker="o", linewidth=2, label=database, color=color
+                    sizes,
+                    times,
+                    marker="o",
+                    linewidth=2,
+                    label=_series_label(series),
+                    color=color,
                 )
 
             plt.title("Average across all operations")
@@ -282,15 +317,20 @@ def draw_summary_diagrams():
         if filtered_index_overall:
             plt.figure(figsize=(10, 6))
 
-            for database in sorted(filtered_index_overall.keys()):
-                if database in INDEX_EXCLUDED_DATABASES:
+            for series in sorted(filtered_index_overall.keys()):
+                if series[0] in INDEX_EXCLUDED_DATABASES:
                     continue
-                points = sorted(filtered_index_overall[database], key=lambda x: x[0])
+                points = sorted(filtered_index_overall[series], key=lambda x: x[0])
                 sizes = [point[0] for point in points]
                 times = [point[1] for point in points]
-                color = DB_COLORS.get(database)
+                color = DB_COLORS.get(series[0])
                 plt.plot(
-                    sizes, times, marker="o", linewidth=2, label=database, color=color
+                    sizes,
+                    times,
+                    marker="o",
+                    linewidth=2,
+                    label=_series_label(series),
+                    color=color,
                 )
 
             plt.title("Average across all index operations")
@@ -311,36 +351,36 @@ def draw_summary_diagrams():
         if filtered_overall or filtered_index_overall:
             plt.figure(figsize=(10, 6))
 
-            for database in sorted(filtered_overall.keys()):
-                if database in INDEX_EXCLUDED_DATABASES:
+            for series in sorted(filtered_overall.keys()):
+                if series[0] in INDEX_EXCLUDED_DATABASES:
                     continue
-                points = sorted(filtered_overall[database], key=lambda x: x[0])
+                points = sorted(filtered_overall[series], key=lambda x: x[0])
                 sizes = [point[0] for point in points]
                 times = [point[1] for point in points]
-                color = DB_COLORS.get(database)
+                color = DB_COLORS.get(series[0])
                 plt.plot(
                     sizes,
                     times,
                     marker="o",
                     linewidth=2,
-                    label=f"{database}",
+                    label=_series_label(series),
                     color=color,
                     linestyle="-",
                 )
 
-            for database in sorted(filtered_index_overall.keys()):
-                if database in INDEX_EXCLUDED_DATABASES:
+            for series in sorted(filtered_index_overall.keys()):
+                if series[0] in INDEX_EXCLUDED_DATABASES:
                     continue
-                points = sorted(filtered_index_overall[database], key=lambda x: x[0])
+                points = sorted(filtered_index_overall[series], key=lambda x: x[0])
                 sizes = [point[0] for point in points]
                 times = [point[1] for point in points]
-                color = DB_COLORS.get(database)
+                color = DB_COLORS.get(series[0])
                 plt.plot(
                     sizes,
                     times,
                     marker="s",
                     linewidth=2,
-                    label=f"{database} (index)",
+                    label=f"{_series_label(series)} (index)",
                     color=color,
                     linestyle="--",
                 )
@@ -363,20 +403,29 @@ def draw_summary_diagrams():
         if filtered_boxplot:
             boxplot_data = pd.DataFrame(
                 [
-                    {"database": db, "operation_type": op_type, "avg_time_ms": avg_time}
-                    for db, op_type, avg_time in filtered_boxplot
+                    {
+                        "database": series[0],
+                        "series": _series_label(series),
+                        "operation_type": op_type,
+                        "avg_time_ms": avg_time,
+                    }
+                    for series, op_type, avg_time in filtered_boxplot
                 ]
             )
+            series_palette = {
+                _series_label(series): DB_COLORS.get(series[0])
+                for series, _, _ in filtered_boxplot
+            }
 
             plt.figure(figsize=(11, 6.5))
             sns.boxplot(
                 data=cast(Any, boxplot_data),
                 x="operation_type",
                 y="avg_time_ms",
-                hue="database",
+                hue="series",
                 order=["insert", "select", "update", "delete"],
-                hue_order=sorted({row[0] for row in filtered_boxplot}),
-                palette=DB_COLORS,
+                hue_order=sorted(series_palette),
+                palette=series_palette,
                 showfliers=False,
             )
             plt.title("Operation Type Distribution by Database")
@@ -401,10 +450,10 @@ def draw_summary_diagrams():
                     data=cast(Any, boxplot_data_no_unqlite),
                     x="operation_type",
                     y="avg_time_ms",
-                    hue="database",
+                    hue="series",
                     order=["insert", "select", "update", "delete"],
-                    hue_order=sorted(set(boxplot_data_no_unqlite["database"])),
-                    palette=DB_COLORS,
+                    hue_order=sorted(set(boxplot_data_no_unqlite["series"])),
+                    palette=series_palette,
                     showfliers=False,
                 )
                 plt.title("Operation Type Distribution by Database (without UnQLite)")
@@ -1,4 +1,5 @@
 import csv
+import json
 import os
 from collections import defaultdict
 from datetime import datetime
@@ -16,8 +17,22 @@ SUMMARY_COLUMNS = [
     "max_time_ms",
     "samples_count",
     "generated_at",
+    "statement_mode",
+    "shape",
+    "dataset",
+    "fetch_mode",
 ]
 
+SUMMARY_KEY_COLUMNS = ["statement_mode", "shape", "dataset"]
+
+
+def _fetch_mode(row):
+    try:
+        details = json.loads(row.get("details") or "{}")
+    except ValueError:
+        return ""
+    return details.get("fetch_mode", "") if isinstance(details, dict) else ""
+
 
 def init_summary_csv():
     os.makedirs(os.path.dirname(SUMMARY_CSV_FILE), exist_ok=True)
@@ -38,7 +53,13 @@ def build_summary_csv():
                 status = row.get("status", "ok")
                 if status != "ok":
                     continue
-                key = (row["database"], row["operation"], int(row["size"]))
+                key = (
+                    row["database"],
+                    row["operation"],
+                    int(row["size"]),
+                    *(row.get(column) or "" for column in SUMMARY_KEY_COLUMNS),
+                    _fetch_mode(row),
+                )
                 grouped[key].append(float(row["time_ms"]))
             except (KeyError, ValueError, TypeError):
                 continue
@@ -48,8 +69,9 @@ def build_summary_csv():
     generated_at = datetime.now().isoformat()
     with open(SUMMARY_CSV_FILE, "a", newline="") as f:
         writer = csv.writer(f)
-        for database, operation, size in sorted(grouped.keys()):
-            times = grouped[(database, operation, size)][-SUMMARY_LAST_SAMPLES:]
+        for key in sorted(grouped.keys()):
+            database, operation, size, *context = key
+            times = grouped[key][-SUMMARY_LAST_SAMPLES:]
             if not times:
                 continue
             avg_time = sum(times) / len(times)
@@ -63,5 +85,6 @@ def build_summary_csv():
                     round(max(times), 2),
                     len(times),
                     generated_at,
+                    *context,
                 ]
             )
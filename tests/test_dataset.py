@@ -0,0 +1,91 @@
+from collections import defaultdict
+from datetime import datetime
+
+import numpy as np
+
+from src.utils.dataset import (
+    SEED_BLOCK_ROWS,
+    SHARD_ROWS,
+    generate_shard,
+    iter_generated_chunks,
+    merge_shards,
+    plan_table_shards,
+)
+from src.utils.generator import (
+    STARTING_DATA_INSERT_ORDER,
+    STARTING_DATA_WEIGHTS,
+    split_starting_data,
+)
+
+REFERENCE_TIME = datetime(2024, 1, 1)
+
+SEED = 11
+
+USER_HEAVY = {
+    table: (0.91 if table == "users" else 0.01) for table in STARTING_DATA_WEIGHTS
+}
+
+
+def collect_tables(chunks):
+    shards = defaultdict(list)
+    for table, _, chunk in chunks:
+        shards[table].append(chunk)
+    return {table: merge_shards("columnar", parts) for table, parts in shards.items()}
+
+
+def assert_same_tables(left, right):
+    assert left.keys() == right.keys()
+    for table in left:
+        assert left[table].columns.keys() == right[table].columns.keys()
+        for name, column in left[table].columns.items():
+            assert np.array_equal(column, right[table][name]), (table, name)
+
+
+def generate_table(table, counts, shard_rows):
+    chunks = [
+        (
+            table,
+            start_id,
+            generate_shard(
+                "columnar",
+                table,
+                shard_index,
+                start_id,
+                count,
+                counts,
+                SEED,
+                REFERENCE_TIME,
+            ),
+        )
+        for _, shard_index, start_id, count in plan_table_shards(
+            table, counts[table], shard_rows
+        )
+    ]
+    return collect_tables(chunks)
+
+
+def test_columnar_output_ignores_shard_size():
+    counts = split_starting_data(5 * SEED_BLOCK_ROWS)
+    for table in STARTING_DATA_INSERT_ORDER:
+        single = generate_table(table, counts, SHARD_ROWS)
+        assert_same_tables(single, generate_table(table, counts, 7_000))
+        assert_same_tables(single, generate_table(table, counts, 1_234))
+
+
+def test_columnar_output_ignores_worker_count():
+    dataset = {
+        "generator": "columnar",
+        "seed": SEED,
+        "cache": False,
+        "weights": USER_HEAVY,
+        "reference_time": REFERENCE_TIME,
+    }
+    total_records = 3 * SHARD_ROWS
+    one_worker = collect_tables(
+        iter_generated_chunks(total_records, {**dataset, "workers": 1})
+    )
+    four_workers = collect_tables(
+        iter_generated_chunks(total_records, {**dataset, "workers": 4})
+    )
+    assert len(one_worker["users"]) > SHARD_ROWS
+    assert_same_tables(one_worker, four_workers)
@@ -0,0 +1,126 @@
+import json
+import struct
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import numpy as np
+
+from src.utils import export
+from src.utils.dataset import generate_shard
+from src.utils.export import (
+    PG_COPY_TYPES,
+    PG_EPOCH,
+    encode_binary_block,
+    encode_pg_binary,
+    export_rows,
+    fixed_matrix,
+    numeric_matrix,
+    with_ids,
+)
+from src.utils.generator import (
+    STARTING_DATA_FIELDS,
+    STARTING_DATA_INSERT_ORDER,
+    split_starting_data,
+)
+
+REFERENCE_TIME = datetime(2024, 1, 1)
+
+TOTAL_RECORDS = 5_000
+
+
+def decode_numeric(data):
+    ndigits, weight, sign, scale = struct.unpack_from("!hhhh", data)
+    digits = struct.unpack_from(f"!{ndigits}H", data, 8)
+    value = sum(
+        Decimal(digit) * Decimal(10_000) ** (weight - idx)
+        for idx, digit in enumerate(digits)
+    )
+    value = value.quantize(Decimal(1).scaleb(-scale))
+    return -value if sign == 0x4000 else value
+
+
+def decode_value(kind, data):
+    if kind == "int4":
+        return struct.unpack("!i", data)[0]
+    if kind == "numeric":
+        return decode_numeric(data)
+    if kind == "timestamp":
+        return PG_EPOCH + timedelta(microseconds=struct.unpack("!q", data)[0])
+    if kind == "jsonb":
+        assert data[:1] == b"\x01"
+        return json.loads(data[1:].decode("utf-8"))
+    return data.decode("utf-8")
+
+
+def decode_rows(data, kinds):
+    rows = []
+    position = 0
+    while position < len(data):
+        (field_count,) = struct.unpack_from("!h", data, position)
+        assert field_count == len(kinds)
+        position += 2
+        row = []
+        for kind in kinds:
+            (length,) = struct.unpack_from("!i", data, position)
+            position += 4
+            if length < 0:
+                row.append(None)
+                continue
+            row.append(decode_value(kind, data[position : position + length]))
+            position += length
+        rows.append(tuple(row))
+    return rows
+
+
+def expected_value(kind, value):
+    if value is None:
+        return None
+    if kind == "numeric":
+        return Decimal(f"{value:.2f}")
+    if kind == "jsonb":
+        return json.loads(value)
+    return value
+
+
+def expected_rows(table, chunk, start_id):
+    kinds = ["int4", *PG_COPY_TYPES[table]]
+    rows = with_ids(export_rows(chunk, STARTING_DATA_FIELDS[table]), start_id)
+    return [
+        tuple(expected_value(kind, value) for kind, value in zip(kinds, row))
+        for row in rows
+    ]
+
+
+def assert_round_trip(mode):
+    counts = split_starting_data(TOTAL_RECORDS)
+    for table in STARTING_DATA_INSERT_ORDER:
+        chunk = generate_shard(
+            mode, table, 0, 1, counts[table], counts, 5, REFERENCE_TIME
+        )
+        kinds = ["int4", *PG_COPY_TYPES[table]]
+        decoded = decode_rows(encode_pg_binary(table, chunk, start_id=1), kinds)
+        assert decoded == expected_rows(table, chunk, 1), table
+
+
+def test_columnar_binary_copy_round_trip(monkeypatch):
+    # small blocks, so a table spans several encode_binary_block calls
+    monkeypatch.setattr(export, "COPY_BLOCK_BYTES", 4096)
+    assert_round_trip("columnar")
+
+
+def test_rows_binary_copy_round_trip():
+    assert_round_trip("rows")
+
+
+def test_encode_binary_block_numeric_and_nulls():
+    prices = [0.0, 0.01, 9.99, 10.0, 12345.67, -5.5, 99999999.99]
+    parents = np.array([0, 1, 0, 70000, 2, 0, 3], dtype=np.int32)
+    parent_matrix, parent_lengths = fixed_matrix(parents, ">i4")
+    parent_lengths[parents == 0] = -1
+    data = encode_binary_block(
+        [numeric_matrix(prices), (parent_matrix, parent_lengths)]
+    )
+    assert decode_rows(data, ["numeric", "int4"]) == [
+        (Decimal(f"{price:.2f}"), int(parent) or None)
+        for price, parent in zip(prices, parents)
+    ]
@@ -0,0 +1,102 @@
+from datetime import datetime
+
+import psycopg2
+import pytest
+
+from src.config.connections import DATABASES
+from src.sql.parallel import merge_table_ranges, table_dependencies
+from src.sql.postgres import PostgresBenchmark
+from src.utils.dataset import SHARD_ROWS, plan_load_ranges
+from src.utils.generator import STARTING_DATA_WEIGHTS
+
+TEST_DATABASE = "benchmark_test"
+
+CATEGORY_HEAVY = {
+    table: (0.91 if table == "categories" else 0.01) for table in STARTING_DATA_WEIGHTS
+}
+
+TOTAL_RECORDS = 3 * SHARD_ROWS
+
+DATASET = {
+    "generator": "columnar",
+    "seed": 7,
+    "cache": False,
+    "workers": 2,
+    "weights": CATEGORY_HEAVY,
+    "load_connections": 4,
+    "reference_time": datetime(2024, 1, 1),
+}
+
+
+class FakeCursor:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def execute(self, query):
+        pass
+
+    def fetchall(self):
+        return self.rows
+
+
+def test_table_dependencies_separates_self_references():
+    cur = FakeCursor(
+        [("categories", "categories"), ("products", "categories")],
+    )
+    dependencies, self_referencing = table_dependencies(cur, ["categories", "products"])
+    assert dependencies == {"categories": set(), "products": {"categories"}}
+    assert self_referencing == {"categories"}
+
+
+def test_self_referencing_table_is_one_range():
+    ranges = plan_load_ranges(TOTAL_RECORDS, DATASET, DATASET["load_connections"])
+    assert len([table for table, _ in ranges if table == "categories"]) > 1
+
+    merged = merge_table_ranges(ranges, {"categories"})
+    categories = [tasks for table, tasks in merged if table == "categories"]
+    assert len(categories) == 1
+    start_ids = [task[3] for task in categories[0]]
+    assert len(start_ids) > 1
+    assert start_ids == sorted(start_ids)
+    assert [table for table, _ in merged if table != "categories"] == [
+        table for table, _ in ranges if table != "categories"
+    ]
+
+
+@pytest.fixture
+def test_database():
+    config = dict(DATABASES["postgres"])
+    try:
+        admin = psycopg2.connect(
+            host=config["host"],
+            port=config["port"],
+            database=config["database"],
+            user=config["user"],
+            password=config["password"],
+        )
+    except psycopg2.OperationalError:
+        pytest.skip("PostgreSQL is not running")
+    admin.autocommit = True
+    with admin.cursor() as cur:
+        cur.execute(f"DROP DATABASE IF EXISTS {TEST_DATABASE}")
+        cur.execute(f"CREATE DATABASE {TEST_DATABASE}")
+    yield {**config, "database": TEST_DATABASE}
+    with admin.cursor() as cur:
+        cur.execute(f"DROP DATABASE IF EXISTS {TEST_DATABASE} WITH (FORCE)")
+    admin.close()
+
+
+def test_parallel_load_multi_shard_categories(test_database):
+    bench = PostgresBenchmark(DATASET)
+    bench.config = test_database
+    bench.connect()
+    try:
+        bench.setup_schema(create_indexes=False)
+        bench.populate_starting_data(TOTAL_RECORDS)
+        with bench.conn.cursor() as cur:
+            cur.execute("SELECT COUNT(*), COUNT(parent_id) FROM categories")
+            count, with_parent = cur.fetchone()
+    finally:
+        bench.close()
+    assert count > 2 * SHARD_ROWS
+    assert with_parent > 0
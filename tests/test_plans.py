@@ -0,0 +1,132 @@
+import sqlite3
+
+from src.sql.plans import parse_pg_plan, parse_sqlite_plan
+
+PG_EXPLAIN_ROWS = [
+    (
+        [
+            {
+                "Plan": {
+                    "Node Type": "Hash Join",
+                    "Join Type": "Inner",
+                    "Plan Rows": 120,
+                    "Actual Rows": 97,
+                    "Actual Loops": 1,
+                    "Actual Total Time": 3.25,
+                    "Shared Hit Blocks": 40,
+                    "Shared Read Blocks": 2,
+                    "Temp Written Blocks": 0,
+                    "Plans": [
+                        {
+                            "Node Type": "Seq Scan",
+                            "Parent Relationship": "Outer",
+                            "Relation Name": "orders",
+                            "Plan Rows": 5000,
+                            "Actual Rows": 5000,
+                            "Actual Loops": 1,
+                            "Actual Total Time": 1.5,
+                            "Shared Hit Blocks": 30,
+                            "Shared Read Blocks": 2,
+                            "Temp Written Blocks": 0,
+                        },
+                        {
+                            "Node Type": "Hash",
+                            "Parent Relationship": "Inner",
+                            "Plan Rows": 10,
+                            "Actual Rows": 12,
+                            "Actual Loops": 1,
+                            "Actual Total Time": 0.4,
+                            "Plans": [
+                                {
+                                    "Node Type": "Index Scan",
+                                    "Parent Relationship": "Outer",
+                                    "Relation Name": "users",
+                                    "Index Name": "idx_users_created_at",
+                                    "Plan Rows": 10,
+                                    "Actual Rows": 12,
+                                    "Actual Loops": 1,
+                                    "Actual Total Time": 0.3,
+                                    "Shared Hit Blocks": 10,
+                                    "Shared Read Blocks": 0,
+                                    "Temp Written Blocks": 0,
+                                }
+                            ],
+                        },
+                    ],
+                }
+            }
+        ],
+    )
+]
+
+
+def test_parse_pg_plan_walks_nodes_in_order():
+    nodes = parse_pg_plan(PG_EXPLAIN_ROWS)
+    assert [
+        (node["node_id"], node["parent_id"], node["depth"], node["node_type"])
+        for node in nodes
+    ] == [
+        (1, 0, 0, "Hash Join"),
+        (2, 1, 1, "Seq Scan"),
+        (3, 1, 1, "Hash"),
+        (4, 3, 2, "Index Scan"),
+    ]
+
+
+def test_parse_pg_plan_reads_estimates_timing_and_buffers():
+    join, seq_scan, hash_node, index_scan = parse_pg_plan(PG_EXPLAIN_ROWS)
+    assert join["estimated_rows"] == 120
+    assert join["actual_rows"] == 97
+    assert join["actual_total_time_ms"] == 3.25
+    assert join["relation"] == ""
+    assert seq_scan["relation"] == "orders"
+    assert seq_scan["parent_relationship"] == "Outer"
+    assert seq_scan["shared_read_blocks"] == 2
+    assert hash_node["shared_hit_blocks"] == ""
+    assert index_scan["relation"] == "users"
+    assert index_scan["index_name"] == "idx_users_created_at"
+    assert index_scan["actual_loops"] == 1
+
+
+def test_parse_sqlite_plan_rows():
+    nodes = parse_sqlite_plan(
+        [
+            (2, 0, 0, "SCAN o"),
+            (7, 0, 0, "SEARCH u USING INTEGER PRIMARY KEY (rowid=?)"),
+            (12, 0, 0, "USE TEMP B-TREE FOR ORDER BY"),
+        ]
+    )
+    assert [(node["node_id"], node["depth"], node["node_type"]) for node in nodes] == [
+        (2, 0, "SCAN"),
+        (7, 0, "SEARCH USING INTEGER PRIMARY KEY"),
+        (12, 0, "USE TEMP B-TREE FOR ORDER BY"),
+    ]
+    assert nodes[0]["relation"] == "o"
+    assert nodes[1]["relation"] == "u"
+    assert nodes[1]["index_name"] == ""
+    assert "relation" not in nodes[2]
+
+
+def test_parse_sqlite_plan_from_explain_query_plan():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE users (id INTEGER PRIMARY KEY, email TEXT)")
+    conn.execute("CREATE INDEX idx_users_email ON users (email)")
+    conn.execute("CREATE TABLE orders (id INTEGER PRIMARY KEY, user_id INTEGER)")
+    rows = conn.execute(
+        "EXPLAIN QUERY PLAN SELECT o.id FROM orders o "
+        "WHERE o.user_id IN (SELECT id FROM users WHERE email = ?)",
+        ("user1@example.com",),
+    ).fetchall()
+    conn.close()
+
+    nodes = parse_sqlite_plan(rows)
+    index_nodes = [node for node in nodes if node.get("index_name")]
+    assert index_nodes
+    assert index_nodes[0]["relation"] == "users"
+    assert index_nodes[0]["index_name"] == "idx_users_email"
+    assert index_nodes[0]["node_type"].startswith("SEARCH USING")
+    assert all(node["depth"] >= 0 for node in nodes)
+    by_id = {node["node_id"]: node for node in nodes}
+    for node in nodes:
+        if node["parent_id"] in by_id:
+            assert node["depth"] == by_id[node["parent_id"]]["depth"] + 1
@@ -0,0 +1,108 @@
+from datetime import datetime
+
+import psycopg2
+import pytest
+
+from src.config.connections import DATABASES
+from src.nosql.unqlite import UnqliteBenchmark
+from src.sql.postgres import PostgresBenchmark
+from src.utils.generator import (
+    PROBE_STRIDE,
+    STARTING_DATA_INSERT_ORDER,
+    probe_email,
+    split_starting_data,
+)
+
+TEST_DATABASE = "benchmark_reconcile_test"
+
+DATASET = {
+    "generator": "columnar",
+    "seed": 3,
+    "cache": False,
+    "reference_time": datetime(2024, 1, 1),
+}
+
+
+def probe_users(users):
+    return {
+        user_id: email for user_id, email in users if (user_id - 1) % PROBE_STRIDE == 0
+    }
+
+
+@pytest.fixture
+def test_database():
+    config = dict(DATABASES["postgres"])
+    try:
+        admin = psycopg2.connect(
+            host=config["host"],
+            port=config["port"],
+            database=config["database"],
+            user=config["user"],
+            password=config["password"],
+        )
+    except psycopg2.OperationalError:
+        pytest.skip("PostgreSQL is not running")
+    admin.autocommit = True
+    with admin.cursor() as cur:
+        cur.execute(f"DROP DATABASE IF EXISTS {TEST_DATABASE}")
+        cur.execute(f"CREATE DATABASE {TEST_DATABASE}")
+    yield {**config, "database": TEST_DATABASE}
+    with admin.cursor() as cur:
+        cur.execute(f"DROP DATABASE IF EXISTS {TEST_DATABASE} WITH (FORCE)")
+    admin.close()
+
+
+def postgres_counts(bench):
+    return {table: bench.get_table_count(table) for table in STARTING_DATA_INSERT_ORDER}
+
+
+def postgres_users(bench):
+    with bench.conn.cursor() as cur:
+        cur.execute("SELECT id, email FROM users ORDER BY id")
+        return cur.fetchall()
+
+
+@pytest.mark.parametrize("target", [6_000, 30_000])
+def test_postgres_reconcile_reaches_target(test_database, target):
+    bench = PostgresBenchmark(DATASET)
+    bench.config = test_database
+    bench.connect()
+    try:
+        bench.setup_schema(create_indexes=False)
+        bench.populate_starting_data(15_000)
+        bench.reconcile_starting_data(target)
+        counts = postgres_counts(bench)
+        users = postgres_users(bench)
+    finally:
+        bench.close()
+
+    assert counts == split_starting_data(target)
+    assert [user_id for user_id, _ in users] == list(range(1, len(users) + 1))
+    probes = probe_users(users)
+    assert probes
+    assert all(email == probe_email(user_id) for user_id, email in probes.items())
+
+
+@pytest.mark.parametrize("target", [600, 2_500])
+def test_unqlite_reconcile_reaches_target(tmp_path, target):
+    bench = UnqliteBenchmark(DATASET)
+    bench.config = {"database": str(tmp_path / "reconcile.unqlite")}
+    bench.connect()
+    try:
+        bench.populate_starting_data(1_500)
+        if target > 1_500:
+            # a gap in the user ids, which the top-up has to fill
+            bench.delete_by_field("users", "id", {2, 5})
+        bench.reconcile_starting_data(target)
+        counts = {
+            table: bench.collection_count(table) for table in STARTING_DATA_INSERT_ORDER
+        }
+        users = [(doc["id"], doc["email"]) for doc in bench._collection_docs("users")]
+    finally:
+        bench.close()
+
+    assert counts == split_starting_data(target)
+    assert sorted(user_id for user_id, _ in users) == list(range(1, len(users) + 1))
+    probes = probe_users(users)
+    assert probes
+    assert all(email == probe_email(user_id) for user_id, email in probes.items())
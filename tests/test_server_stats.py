@@ -0,0 +1,88 @@
+import psycopg2
+import pytest
+
+from src.config.connections import DATABASES
+from src.sql.server_stats import (
+    DATABASE_FIELDS,
+    detect_stats_sources,
+    flush_server_stats,
+    server_stats_baseline,
+    server_stats_delta,
+    snapshot_server_stats,
+)
+
+
+def test_server_stats_delta_subtracts_before_and_baseline():
+    before = {"server_exec_ms": 10.0, "db_blks_hit": 100.0, "wal_bytes": 5000.0}
+    after = {"server_exec_ms": 12.34567, "db_blks_hit": 160.0, "wal_bytes": 9096.0}
+    baseline = {"db_blks_hit": 8.0, "wal_bytes": 96.0}
+    assert server_stats_delta(before, after, baseline) == {
+        "server_exec_ms": 2.346,
+        "db_blks_hit": 52,
+        "wal_bytes": 4000,
+    }
+
+
+def test_server_stats_delta_clamps_at_zero():
+    before = {"db_blks_hit": 100.0, "server_plan_ms": 1.0}
+    after = {"db_blks_hit": 104.0, "server_plan_ms": 1.0}
+    delta = server_stats_delta(before, after, {"db_blks_hit": 10.0})
+    assert delta == {"db_blks_hit": 0, "server_plan_ms": 0.0}
+    assert isinstance(delta["db_blks_hit"], int)
+
+
+def test_server_stats_delta_without_baseline():
+    assert server_stats_delta({"io_reads": 3.0}, {"io_reads": 7.0}) == {"io_reads": 4}
+
+
+def test_server_stats_baseline_takes_minimum_per_field():
+    deltas = [
+        {"db_blks_hit": 12, "wal_bytes": 0},
+        {"db_blks_hit": 9, "wal_bytes": 64},
+        {"db_blks_hit": 11, "wal_bytes": 32},
+    ]
+    assert server_stats_baseline(deltas) == {"db_blks_hit": 9, "wal_bytes": 0}
+
+
+@pytest.fixture
+def connections():
+    config = DATABASES["postgres"]
+    opened = []
+    try:
+        for _ in range(2):
+            conn = psycopg2.connect(
+                host=config["host"],
+                port=config["port"],
+                database=config["database"],
+                user=config["user"],
+                password=config["password"],
+            )
+            conn.autocommit = True
+            opened.append(conn)
+    except psycopg2.OperationalError:
+        pytest.skip("PostgreSQL is not running")
+    yield opened
+    for conn in opened:
+        conn.close()
+
+
+def test_snapshots_capture_writes(connections):
+    bench_conn, stats_conn = connections
+    with stats_conn.cursor() as stats_cur, bench_conn.cursor() as cur:
+        sources = detect_stats_sources(stats_cur)
+        cur.execute("CREATE TEMP TABLE server_stats_probe (id int, payload text)")
+        flush_server_stats(cur, sources)
+        before = snapshot_server_stats(stats_cur, sources)
+        cur.execute(
+            "INSERT INTO server_stats_probe "
+            "SELECT g, repeat('x', 200) FROM generate_series(1, 5000) g"
+        )
+        cur.execute("SELECT count(*) FROM pg_class")
+        flush_server_stats(cur, sources)
+        after = snapshot_server_stats(stats_cur, sources)
+
+    assert set(DATABASE_FIELDS) <= set(before)
+    delta = server_stats_delta(before, after)
+    assert delta.keys() == after.keys()
+    assert all(value >= 0 for value in delta.values())
+    assert delta["db_blks_hit"] + delta["db_blks_read"] > 0